@@ -1,32 +1,160 @@
+import time
+STARTED_AT = time.perf_counter()  # Before the heavy imports, so they show up in the startup timings.
+
 import discord
 import os
+import asyncio
+import logging
 import config
+from typing import Optional
 from discord.ext import commands
+from utils.handle_cache import HandleCache
+from utils.dispatcher import OutboundDispatcher
+from utils.member_names import MEMBER_NAMES_PATH, MemberNameCache
+from utils.command_sync import COMMAND_FINGERPRINTS_PATH, CommandSyncer
+from utils.hot_reload import HotReloader
+from utils.metrics import Metrics
+from utils.rate_limit import RATE_LIMITS_PATH, RateLimiter
+from utils.guild_config import GuildConfigTable
+from utils.member_profiles import MemberProfiles
+from storage.journal import JOURNAL_ARCHIVE_PATH, JOURNAL_SNAPSHOT_PATH, JOURNAL_WAL_PATH, ActionJournal
+from storage.executor import run_blocking
+from storage.partitions import process_path
 from secret import TOKEN, TOKEN_TEST, USE_TEST_BOT
 
-INTENTS = discord.Intents.all()
-COGS = [cog[:-3] for cog in os.listdir("cogs/") if cog.endswith(".py")]
+def enabled_cogs() -> list[str]:
+    available = sorted(cog[:-3] for cog in os.listdir("cogs/") if cog.endswith(".py"))
+    enabled = os.environ.get("JACK_COGS")
+    enabled = [cog.strip() for cog in enabled.split(",") if cog.strip()] if enabled else config.ENABLED_COGS
+    if enabled is None:
+        return available
+    unknown = set(enabled) - set(available)
+    if unknown:
+        logging.warning(f"Ignoring unknown cogs: {', '.join(sorted(unknown))}")
+    return [cog for cog in available if cog in enabled]
+
+COGS = enabled_cogs()
+
+def shard_settings() -> tuple[Optional[int], Optional[list[int]]]:
+    shard_count = os.environ.get("JACK_SHARD_COUNT")
+    shard_ids = os.environ.get("JACK_SHARD_IDS")
+    shard_count = int(shard_count) if shard_count else config.SHARD_COUNT
+    shard_ids = [int(shard_id) for shard_id in shard_ids.split(",") if shard_id.strip()] if shard_ids else config.SHARD_IDS
+    if shard_ids is not None and shard_count is None:
+        raise ValueError("SHARD_IDS needs SHARD_COUNT, every process has to agree on the shard count")
+    return shard_count, shard_ids
+
+SHARD_COUNT, SHARD_IDS = shard_settings()
 
-class JackInTheBox(commands.Bot):
+def metrics_port() -> Optional[int]:
+    # Processes sharing a host each need their own port, so each one's is offset by its lowest shard ID.
+    port = os.environ.get("JACK_METRICS_PORT")
+    if port:
+        return int(port)
+    if config.METRICS_PORT is None or SHARD_IDS is None:
+        return config.METRICS_PORT
+    return config.METRICS_PORT + min(SHARD_IDS)
+
+class JackInTheBox(commands.AutoShardedBot):
     """Jack In The Box."""
     def __init__(self, *, intents: discord.Intents) -> None:
+        metrics = Metrics()
         super().__init__(
+            shard_count=SHARD_COUNT,
+            shard_ids=SHARD_IDS,
             command_prefix=commands.when_mentioned,  # Use mention as command prefix rather than "-", which collides with Friendly Snek's prefix.
             intents=intents,
+            member_cache_flags=config.MEMBER_CACHE_FLAGS,
+            chunk_guilds_at_startup=config.CHUNK_GUILDS_AT_STARTUP,
+            http_trace=metrics.trace_config,  # Every REST request and 429 is counted.
             activity=discord.Activity(
                 type=discord.ActivityType.watching,
                 name="Over Diddy with an MQ-9 Reaper Drone."
             ),
             status="online"
         )
+        self.guild_configs = GuildConfigTable()  # Channel and role IDs for every unit, by guild.
+        self.handles = HandleCache(self)  # Shared channel/role lookups, warmed on ready.
+        self.outbound = OutboundDispatcher()  # Paced, coalescing queue for every DM and channel post.
+        # Files every guild shares are kept per process, no two processes ever write the same one.
+        self.journal = ActionJournal(  # Write-ahead record of every moderation side effect.
+            self.process_path(JOURNAL_WAL_PATH), self.process_path(JOURNAL_SNAPSHOT_PATH), self.process_path(JOURNAL_ARCHIVE_PATH)
+        )
+        self.member_names = MemberNameCache(self, self.process_path(MEMBER_NAMES_PATH))  # Last known names for leaderboards and embeds.
+        self.profiles = MemberProfiles()  # Per-member summaries for /member-profile, filled by the stores.
+        self.reloader = HotReloader(self)  # In-place reloads of cogs and config.py.
+        self.metrics = metrics  # Command latency, REST and gateway metrics for /bot-stats and Prometheus.
+        self.metrics.attach(self)
+        self.rate_limits = RateLimiter(self.process_path(RATE_LIMITS_PATH))  # Sliding-window limits on spammable commands.
+        self.startup_timings: dict[str, float] = {"import": time.perf_counter() - STARTED_AT}
 
     async def setup_hook(self) -> None:
-        for cog in COGS:
-            await bot.load_extension(f"cogs.{cog}")
-        self.tree.copy_global_to(guild=config.GUILD)
-        await self.tree.sync(guild=config.GUILD)
+        started = time.perf_counter()
+        await asyncio.gather(run_blocking(self.journal.load), run_blocking(self.member_names.load), run_blocking(self.rate_limits.load))
+        # Cogs load concurrently, so their store loads overlap. One failing cog does not stop the rest.
+        results = await asyncio.gather(*(self.load_extension(f"cogs.{cog}") for cog in COGS), return_exceptions=True)
+        for cog, result in zip(COGS, results):
+            if isinstance(result, Exception):
+                logging.error(f"Could not load cog {cog}", exc_info=result)
+        self.startup_timings["load"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await self.sync_commands()
+        self.startup_timings["sync"] = time.perf_counter() - started
+
+        self._setup_finished = time.perf_counter()
+        if config.WATCH_FOR_CHANGES:
+            self.reloader.start_watching()
+        await self.metrics.start(config.METRICS_HOST, metrics_port())
+        self.rate_limits.start()
+        asyncio.create_task(self.recover_journal())
+        asyncio.create_task(self.report_startup())
+
+    def owns_guild(self, guild_id: int) -> bool:
+        """Whether one of this process's shards serves the guild."""
+        if self.shard_ids is None:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+
+    @property
+    def owned_guild_ids(self) -> list[int]:
+        """The configured guilds this process serves, the only ones whose stores it opens."""
+        return [guild_id for guild_id in self.guild_configs.guild_ids if self.owns_guild(guild_id)]
+
+    def process_path(self, path: str) -> str:
+        return process_path(SHARD_IDS, path)
+
+    async def sync_commands(self) -> None:
+        """Sync slash commands to every configured guild this process serves, where they changed."""
+        syncer = CommandSyncer(self.tree, self.process_path(COMMAND_FINGERPRINTS_PATH))
+        for guild_id in self.owned_guild_ids:
+            guild = discord.Object(id=guild_id)
+            self.tree.copy_global_to(guild=guild)
+            await syncer.sync(guild)  # One at a time, they share the fingerprint file.
+
+    async def report_startup(self) -> None:
+        await self.wait_until_ready()
+        self.startup_timings["ready"] = time.perf_counter() - self._setup_finished
+        breakdown = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.startup_timings.items())
+        logging.info(f"Started {len(self.cogs)}/{len(COGS)} cogs in {time.perf_counter() - STARTED_AT:.2f}s ({breakdown})")
+
+    async def recover_journal(self) -> None:
+        # Cogs register their recovery handlers when they load, the Discord side needs a ready cache.
+        await self.wait_until_ready()
+        # Entries journaled before the bot served several guilds belong to config.GUILD_ID.
+        await self.journal.recover(lambda entry: self.owns_guild(entry.payload.get("guild_id", config.GUILD_ID)))
+
+    async def close(self) -> None:
+        self.reloader.stop_watching()
+        await self.metrics.stop()
+        # Let queued DMs and log posts go out before disconnecting.
+        await self.outbound.drain()
+        await self.journal.close()
+        await run_blocking(self.member_names.save)
+        await self.rate_limits.stop()
+        await super().close()
 
-bot = JackInTheBox(intents=INTENTS)
+bot = JackInTheBox(intents=config.INTENTS)
 
 if __name__ == "__main__":
     if USE_TEST_BOT:
@@ -0,0 +1,232 @@
+"""Offline benchmark of the cogs against fake_discord.py, run with ``python -m benchmarks.cog_suite``."""
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from benchmarks.fake_discord import FakeAPI, FakeBot, FakeGuild
+import config
+from cogs.ban_manager import BanManager
+from cogs.commend_candidate_tracking import CommendCandidateTracking
+from cogs.member_profile import Profiles
+from cogs.no_show import NoShowTracking
+from utils.guild_config import GuildConfigTable
+
+FIRST_MEMBER_ID = 10 ** 17
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class Suite:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.api = FakeAPI(args.latency, args.jitter, args.seed)
+        self.guild = FakeGuild(self.api, config.GUILD_ID)
+        self.results: list[dict] = []
+
+    # =================
+    # Fixtures. // Jack
+    # =================
+    def build_guild(self) -> None:
+        settings = GuildConfigTable()[config.GUILD_ID]
+        for role_id in settings.ids("_ROLE_ID"):
+            self.guild.add_role(role_id, f"role-{role_id}")
+        for channel_id in settings.ids("_CHANNEL_ID"):
+            self.guild.add_text_channel(channel_id, f"channel-{channel_id}")
+        self.members = [self.guild.add_member(FIRST_MEMBER_ID + i, f"member{i}") for i in range(self.args.members)]
+        self.moderator = self.members[0]
+
+        commendations = self.guild.channels[config.COMMENDATIONS_CHANNEL_ID]
+        commendations.add_history(self.args.history, f"Operation debrief: {config.OPERATION_KEYWORD}.", 3, self.members[1:])
+
+    def seed_no_shows(self) -> None:
+        """Write the no-show log where the single-guild bot kept it, as if built up over six months."""
+        os.makedirs("Data", exist_ok=True)
+        now = datetime.now(timezone.utc)
+        with open("Data/no_show_log.jsonl", "w") as f:
+            for i in range(self.args.no_shows):
+                member = self.rng.choice(self.members[1:])
+                f.write(json.dumps({
+                    "user_id": member.id,
+                    "operation_name": f"Operation {i % 500}",
+                    "date": (now - timedelta(seconds=self.rng.uniform(0, 180 * 86400))).isoformat(),
+                    "zeus": f"Zeus {i % 20}",
+                    "reported_by": self.moderator.id
+                }, separators=(",", ":")) + "\n")
+
+    # ==================
+    # Measuring. // Jack
+    # ==================
+    async def measure(self, name: str, count: int, invoke: Callable[[int], Awaitable[None]]) -> None:
+        """Run ``count`` invocations, at most ``--concurrency`` at a time, and record the numbers."""
+        slots = asyncio.Semaphore(self.args.concurrency)
+        latencies: list[float] = []
+        calls_before = Counter(self.api.calls)
+
+        async def one(i: int) -> None:
+            async with slots:
+                started = time.perf_counter()
+                await invoke(i)
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(count)))
+        wall = time.perf_counter() - started
+
+        calls = Counter(self.api.calls)
+        calls.subtract(calls_before)
+        self.results.append({
+            "scenario": name,
+            "count": count,
+            "wall_s": wall,
+            "per_second": count / wall if wall else float("inf"),
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "api_calls": {kind: n for kind, n in calls.items() if n}
+        })
+
+    async def measure_once(self, name: str, awaitable: Awaitable[None]) -> None:
+        async def invoke(_: int) -> None:
+            await awaitable
+        await self.measure(name, 1, invoke)
+
+    # ==================
+    # Scenarios. // Jack
+    # ==================
+    async def run(self) -> None:
+        self.build_guild()
+        self.seed_no_shows()
+        bot = self.bot = FakeBot(self.api, self.guild)
+        await bot.handles.warm()
+
+        no_show = NoShowTracking(bot)
+        commend = CommendCandidateTracking(bot)
+        ban_manager = BanManager(bot)
+
+        await self.measure_once(f"load no-show log ({self.args.no_shows} records)", no_show.cog_load())
+        await self.measure_once(f"backfill attendance ({self.args.history} messages)", no_show.attendance_ready[config.GUILD_ID].wait())
+        await ban_manager.cog_load()
+        await commend.cog_load()
+        await self.measure_once(f"import commendations ({self.args.history} messages)", commend._import_tasks[config.GUILD_ID])
+
+        burst = self.args.burst
+        targets = self.members[1:]
+
+        # Distinct commenders and targets, so the rate limits stay out of the way
+        async def commend_one(i: int) -> None:
+            commender, person = targets[(2 * i) % len(targets)], targets[(2 * i + 1) % len(targets)]
+            await commend.commend.callback(commend, bot.interaction(commender), person, "Rifleman", "Held the line.")
+        await self.measure("/commend", burst, commend_one)
+
+        # One member spamming, everything past the limit is refused before any API call
+        async def commend_spam_one(i: int) -> None:
+            await commend.commend.callback(commend, bot.interaction(self.moderator), targets[i % len(targets)], "Rifleman", "Spam.")
+        await self.measure("/commend (one member spamming)", burst, commend_spam_one)
+
+        commend_windows = [None] + [type("Choice", (), {"value": days})() for days in (7, 30, 90)]
+
+        async def commend_leaderboard_one(i: int) -> None:
+            await commend.commend_leaderboard.callback(commend, bot.interaction(self.moderator), commend_windows[i % len(commend_windows)], None)
+        await self.measure("/commend-leaderboard", max(burst // 10, 4), commend_leaderboard_one)
+
+        async def no_show_report_one(i: int) -> None:
+            reporter, member = targets[-1 - (2 * i) % len(targets)], targets[-1 - (2 * i + 1) % len(targets)]
+            await no_show.no_show_report.callback(no_show, bot.interaction(reporter), member, "Operation Benchmark", "Zeus 1")
+        await self.measure("/no-show-report", burst, no_show_report_one)
+
+        windows = [None] + [type("Choice", (), {"value": days})() for days in (30, 90)]
+
+        async def leaderboard_one(i: int) -> None:
+            await no_show.no_show_leaderboard.callback(no_show, bot.interaction(self.moderator), windows[i % len(windows)])
+        await self.measure("/no-show-stats", max(burst // 10, 3), leaderboard_one)
+
+        # Typing an operation or Zeus, from an empty box to a prefix matching one name
+        prefixes = ["", "o", "operation", "operation 4", "42", "zeus 1"]
+
+        async def autocomplete_one(i: int) -> None:
+            callback = no_show.operation_autocomplete if i % 2 else no_show.zeus_autocomplete
+            await callback(bot.interaction(self.moderator), prefixes[i % len(prefixes)])
+        await self.measure("operation/zeus autocomplete", burst * 10, autocomplete_one)
+
+        # Every candidate is tracked five times at once, only the first of each should post.
+        candidates = targets[-max(burst // 5, 1):]
+
+        async def track_one(i: int) -> None:
+            await no_show.track_a_candidate.callback(no_show, bot.interaction(self.moderator), candidates[i % len(candidates)], "Operation Benchmark")
+        await self.measure("/track-a-candidate (5 per candidate)", burst, track_one)
+
+        ban_targets = iter(targets[len(targets) // 2:])
+
+        async def ban_one(i: int) -> None:
+            await ban_manager.ban.callback(ban_manager, bot.interaction(self.moderator), next(ban_targets), 7, True, "Benchmark ban.")
+        await self.measure("/ban", min(burst, len(targets) // 2), ban_one)
+
+        profiles = Profiles(bot)
+
+        async def profile_one(i: int) -> None:
+            await profiles.member_profile.callback(profiles, bot.interaction(self.moderator), targets[i % len(targets)])
+        await self.measure("/member-profile", burst, profile_one)
+
+        self.outbound = bot.outbound.stats()
+        # Whatever is still queued would take minutes at Discord's channel rate, so drop it.
+        bot.outbound.discard()
+        await asyncio.sleep(0.1)  # Let journal completions and indexing of what was sent settle.
+        await no_show.cog_unload()
+        await ban_manager.cog_unload()
+        await commend.cog_unload()
+        await bot.journal.close()
+
+    def report(self) -> None:
+        args = self.args
+        print(
+            f"Fake Discord: {args.latency * 1000:.0f}±{args.jitter * 1000:.0f}ms per API call, {args.members} members, "
+            f"burst {args.burst} at concurrency {args.concurrency}"
+        )
+        print(f"{'scenario':<42}{'n':>6}{'wall s':>9}{'per s':>9}{'p50 ms':>9}{'p99 ms':>9}{'API/op':>8}  API calls")
+        for result in self.results:
+            total_calls = sum(result["api_calls"].values())
+            calls = ", ".join(f"{kind} {n}" for kind, n in sorted(result["api_calls"].items()))
+            print(
+                f"{result['scenario']:<42}{result['count']:>6}{result['wall_s']:>9.2f}{result['per_second']:>9.1f}"
+                f"{result['p50_ms']:>9.1f}{result['p99_ms']:>9.1f}{total_calls / result['count']:>8.1f}  {calls}"
+            )
+        print(f"Outbound queue afterwards: {self.outbound}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean simulated latency per API call, in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Standard deviation of the simulated latency.")
+    parser.add_argument("--members", type=int, default=20000)
+    parser.add_argument("--no-shows", type=int, default=100000, help="No-show records seeded before the cogs load.")
+    parser.add_argument("--history", type=int, default=50000, help="Messages in the commendations channel.")
+    parser.add_argument("--burst", type=int, default=500, help="Invocations per command scenario.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Invocations in flight at once.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the cogs' INFO logging.")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix="jack-bench-") as directory:
+        os.chdir(directory)
+        suite = Suite(args)
+        asyncio.run(suite.run())
+    if args.json:
+        print(json.dumps({"results": suite.results, "outbound": suite.outbound}, indent=4))
+    else:
+        suite.report()
+
+
+if __name__ == "__main__":
+    main()
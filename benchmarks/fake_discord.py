@@ -0,0 +1,341 @@
+"""In-process stand-ins for the parts of discord.py the cogs touch, with simulated latency."""
+import re
+import sys
+import types
+import random
+import asyncio
+import itertools
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Iterable, Optional
+import discord
+
+try:
+    import secret  # noqa: F401
+except ImportError:
+    # config.py only needs USE_TEST_BOT from secret.py, no token is used offline.
+    sys.modules["secret"] = types.SimpleNamespace(USE_TEST_BOT=True, TOKEN=None, TOKEN_TEST=None)
+
+from storage.journal import ActionJournal
+from utils.dispatcher import OutboundDispatcher
+from utils.guild_config import GuildConfigTable
+from utils.handle_cache import HandleCache
+from utils.hot_reload import HotReloader
+from utils.member_names import MemberNameCache
+from utils.member_profiles import MemberProfiles
+from utils.metrics import Metrics
+from utils.rate_limit import RateLimiter
+
+HISTORY_PAGE_SIZE = 100  # Messages per history request, as Discord pages them.
+USER_MENTION = re.compile(r"<@!?(\d+)>")
+
+
+class FakeAPI:
+    """Simulated Discord API: a latency per call and a count of calls by kind."""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02, seed: int = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.calls: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+
+    async def call(self, kind: str) -> None:
+        self.calls[kind] += 1
+        if self.latency > 0:
+            await asyncio.sleep(max(0.0, self._random.gauss(self.latency, self.jitter)))
+
+    def snowflake(self, when: Optional[datetime] = None) -> int:
+        """A unique snowflake for ``when`` (default now), so snowflake_time works on it."""
+        return discord.utils.time_snowflake(when or datetime.now(timezone.utc)) + next(self._ids) % 4096
+
+
+class FakeHTTPResponse:
+    def __init__(self, status: int, reason: str) -> None:
+        self.status = status
+        self.reason = reason
+
+
+class FakeAsset:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str) -> None:
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+
+class FakeMessage:
+    def __init__(self, api: FakeAPI, message_id: int, channel: Any, content: Optional[str] = None, embeds: Iterable[discord.Embed] = (), mentions: Iterable[Any] = ()) -> None:
+        self._api = api
+        self.id = message_id
+        self.channel = channel
+        self.content = content or ""
+        self.embeds = list(embeds)
+        self.mentions = list(mentions)
+
+    async def edit(self, **fields: Any) -> "FakeMessage":
+        await self._api.call("message_edit")
+        return self
+
+    async def delete(self, *, delay: Optional[float] = None) -> None:
+        if delay:
+            asyncio.get_running_loop().call_later(delay, lambda: asyncio.ensure_future(self._api.call("message_delete")))
+            return
+        await self._api.call("message_delete")
+
+
+class FakeMember:
+    """Satisfies discord.abc.User, so the outbound dispatcher routes it as a DM."""
+
+    def __init__(self, api: FakeAPI, guild: "FakeGuild", user_id: int, name: str) -> None:
+        self._api = api
+        self.guild = guild
+        self.id = user_id
+        self.name = name
+        self.global_name = name
+        self.display_name = name
+        self.discriminator = "0"
+        self.bot = False
+        self.system = False
+        self.mention = f"<@{user_id}>"
+        self.avatar = None
+        self.display_avatar = FakeAsset(f"https://cdn.example/avatars/{user_id}.png")
+        self.roles: list[FakeRole] = []
+        self.dms_open = True
+
+    def __str__(self) -> str:
+        return self.name
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        await self._api.call("dm")
+        if not self.dms_open:
+            raise discord.Forbidden(FakeHTTPResponse(403, "Forbidden"), "Cannot send messages to this user")
+        return FakeMessage(self._api, self._api.snowflake(), None, content, kwargs.get("embeds") or ())
+
+
+class FakeTextChannel:
+    def __init__(self, api: FakeAPI, guild: "FakeGuild", channel_id: int, name: str) -> None:
+        self._api = api
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.mention = f"<#{channel_id}>"
+        self.messages: list[FakeMessage] = []  # Oldest first.
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None, embeds: Optional[list[discord.Embed]] = None, **kwargs: Any) -> FakeMessage:
+        await self._api.call("channel_send")
+        mentions = [self.guild.get_member(int(user_id)) for user_id in USER_MENTION.findall(content or "")]
+        message = FakeMessage(self._api, self._api.snowflake(), self, content, (embeds or []) + ([embed] if embed else []), filter(None, mentions))
+        self.messages.append(message)
+        return message
+
+    async def history(
+        self,
+        *,
+        limit: Optional[int] = 100,
+        before: Optional[discord.abc.Snowflake] = None,
+        after: Optional[discord.abc.Snowflake] = None,
+        oldest_first: Optional[bool] = None
+    ) -> AsyncIterator[FakeMessage]:
+        """Yield messages the way TextChannel.history does, one simulated request per page."""
+        messages = [
+            message for message in self.messages
+            if (after is None or message.id > after.id) and (before is None or message.id < before.id)
+        ]
+        if not (oldest_first or (oldest_first is None and after is not None)):
+            messages.reverse()
+        if limit is not None:
+            messages = messages[:limit]
+        for start in range(0, len(messages), HISTORY_PAGE_SIZE):
+            await self._api.call("history_page")
+            for message in messages[start:start + HISTORY_PAGE_SIZE]:
+                yield message
+
+    def add_history(self, count: int, content: str, mentions_per_message: int, members: list[FakeMember], days: int = 365) -> None:
+        """Fill the channel with ``count`` messages spread over the last ``days`` days, without API calls."""
+        start = datetime.now(timezone.utc) - timedelta(days=days)
+        step = timedelta(days=days) / max(count, 1)
+        rng = random.Random(count)
+        for i in range(count):
+            mentions = rng.sample(members, min(mentions_per_message, len(members)))
+            self.messages.append(FakeMessage(self._api, self._api.snowflake(start + step * i), self, content, (), mentions))
+
+
+class FakeGuild:
+    def __init__(self, api: FakeAPI, guild_id: int) -> None:
+        self._api = api
+        self.id = guild_id
+        self.name = "Synthetic Guild"
+        self._members: dict[int, FakeMember] = {}
+        self._roles: dict[int, FakeRole] = {}
+        self.channels: dict[int, FakeTextChannel] = {}
+        self.bans: dict[int, str] = {}
+
+    @property
+    def members(self) -> list[FakeMember]:
+        return list(self._members.values())
+
+    def add_member(self, user_id: int, name: str) -> FakeMember:
+        member = self._members[user_id] = FakeMember(self._api, self, user_id, name)
+        return member
+
+    def add_role(self, role_id: int, name: str) -> FakeRole:
+        role = self._roles[role_id] = FakeRole(role_id, name)
+        return role
+
+    def add_text_channel(self, channel_id: int, name: str) -> FakeTextChannel:
+        channel = self.channels[channel_id] = FakeTextChannel(self._api, self, channel_id, name)
+        return channel
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+    def get_member_named(self, name: str) -> Optional[FakeMember]:
+        return next((member for member in self._members.values() if name in (member.name, member.display_name)), None)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self._roles.get(role_id)
+
+    async def fetch_roles(self) -> list[FakeRole]:
+        await self._api.call("fetch_roles")
+        return list(self._roles.values())
+
+    async def query_members(self, query: Optional[str] = None, *, limit: int = 5, user_ids: Optional[list[int]] = None, cache: bool = True, **kwargs: Any) -> list[FakeMember]:
+        await self._api.call("query_members")
+        if user_ids is not None:
+            return [self._members[user_id] for user_id in user_ids if user_id in self._members][:limit]
+        return [member for member in self._members.values() if member.name.lower().startswith((query or "").lower())][:limit]
+
+    async def ban(self, user: discord.abc.Snowflake, *, reason: Optional[str] = None, **kwargs: Any) -> None:
+        await self._api.call("ban")
+        self.bans[user.id] = reason
+
+    async def unban(self, user: discord.abc.Snowflake, *, reason: Optional[str] = None) -> None:
+        await self._api.call("unban")
+        if self.bans.pop(user.id, None) is None:
+            raise discord.NotFound(FakeHTTPResponse(404, "Not Found"), "Unknown Ban")
+
+
+class FakeInteractionResponse:
+    def __init__(self, api: FakeAPI) -> None:
+        self._api = api
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self) -> None:
+        if self._done:
+            raise discord.InteractionResponded(None)
+        await self._api.call("interaction_response")
+        self._done = True
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        await self._respond()
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        await self._respond()
+
+    async def send_modal(self, modal: discord.ui.Modal) -> None:
+        await self._respond()
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        await self._respond()
+
+
+class FakeFollowup:
+    def __init__(self, api: FakeAPI) -> None:
+        self._api = api
+        self.sent: list[FakeMessage] = []
+
+    async def send(self, content: Optional[str] = None, *, wait: bool = False, **kwargs: Any) -> FakeMessage:
+        await self._api.call("followup")
+        message = FakeMessage(self._api, self._api.snowflake(), None, content, kwargs.get("embeds") or ([kwargs["embed"]] if kwargs.get("embed") else ()))
+        self.sent.append(message)
+        return message
+
+
+class FakeInteraction:
+    def __init__(self, api: FakeAPI, client: "FakeBot", guild: FakeGuild, user: FakeMember) -> None:
+        self._api = api
+        self.id = api.snowflake()
+        self.created_at = discord.utils.snowflake_time(self.id)
+        self.client = client
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.command = None
+        self.extras: dict[Any, Any] = {}
+        self.response = FakeInteractionResponse(api)
+        self.followup = FakeFollowup(api)
+
+    async def edit_original_response(self, **kwargs: Any) -> FakeMessage:
+        await self._api.call("interaction_edit")
+        return FakeMessage(self._api, self.id, None, kwargs.get("content"))
+
+
+class FakeBot:
+    """The attributes of JackInTheBox the cogs use, backed by the real shared services."""
+
+    def __init__(self, api: FakeAPI, guild: FakeGuild) -> None:
+        self.api = api
+        self.guild = guild
+        self.latency = api.latency
+        self.guild_configs = GuildConfigTable()
+        self.handles = HandleCache(self)
+        self.outbound = OutboundDispatcher()
+        self.journal = ActionJournal()
+        self.member_names = MemberNameCache(self)
+        self.profiles = MemberProfiles()
+        self.reloader = HotReloader(self)
+        self.metrics = Metrics()
+        self.metrics.bot = self
+        self.rate_limits = RateLimiter()
+
+    def add_listener(self, func: Any, name: Optional[str] = None) -> None:
+        pass
+
+    def get_cog(self, name: str) -> Any:
+        return None
+
+    def add_dynamic_items(self, *items: Any) -> None:
+        pass
+
+    def remove_dynamic_items(self, *items: Any) -> None:
+        pass
+
+    async def wait_until_ready(self) -> None:
+        pass
+
+    def is_ready(self) -> bool:
+        return True
+
+    def owns_guild(self, guild_id: int) -> bool:
+        return True
+
+    @property
+    def owned_guild_ids(self) -> list[int]:
+        return self.guild_configs.guild_ids
+
+    def process_path(self, path: str) -> str:
+        return path
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self.guild if guild_id == self.guild.id else None
+
+    def get_channel(self, channel_id: int) -> Optional[FakeTextChannel]:
+        return self.guild.channels.get(channel_id)
+
+    async def fetch_channel(self, channel_id: int) -> FakeTextChannel:
+        await self.api.call("fetch_channel")
+        channel = self.guild.channels.get(channel_id)
+        if channel is None:
+            raise discord.NotFound(FakeHTTPResponse(404, "Not Found"), "Unknown Channel")
+        return channel
+
+    def interaction(self, user: FakeMember) -> FakeInteraction:
+        return FakeInteraction(self.api, self, self.guild, user)
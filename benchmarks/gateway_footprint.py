@@ -0,0 +1,182 @@
+"""Memory and time-to-ready of the gateway intent policy, run with ``python -m benchmarks.gateway_footprint``."""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import discord
+from discord.state import ChunkRequest
+
+GUILD_ID = 1000
+BOT_ID = 1
+CHUNK_SIZE = 1000  # Members per GUILD_MEMBERS_CHUNK, as Discord sends them.
+
+
+def rss_kib() -> int:
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def user_payload(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"member{user_id}",
+        "global_name": f"Member {user_id}",
+        "discriminator": "0",
+        "avatar": f"{user_id:032x}",
+        "bot": False
+    }
+
+
+def member_payload(user_id: int) -> dict:
+    return {
+        "user": user_payload(user_id),
+        "nick": None,
+        "roles": [str(GUILD_ID + 1 + user_id % 50)],
+        "joined_at": "2023-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0
+    }
+
+
+def presence_payload(user_id: int) -> dict:
+    return {
+        "user": {"id": str(user_id)},
+        "guild_id": str(GUILD_ID),
+        "status": "online",
+        "client_status": {"desktop": "online"},
+        "activities": [{"name": "Arma 3", "type": 0, "created_at": 0}]
+    }
+
+
+def guild_payload(member_count: int) -> dict:
+    return {
+        "id": str(GUILD_ID),
+        "name": "Synthetic Guild",
+        "owner_id": str(BOT_ID),
+        "large": True,
+        "member_count": member_count + 1,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "roles": [
+            {"id": str(GUILD_ID + i), "name": f"Role {i}", "permissions": "0", "position": i, "color": 0, "hoist": False, "managed": False, "mentionable": False, "flags": 0}
+            for i in range(51)
+        ],
+        "channels": [
+            {"id": str(GUILD_ID + 100 + i), "type": 0, "name": f"channel-{i}", "position": i, "permission_overwrites": []}
+            for i in range(100)
+        ],
+        "members": [member_payload(BOT_ID)],
+        "presences": [],
+        "voice_states": [],
+        "threads": []
+    }
+
+
+def feed_chunks(state, guild: discord.Guild, user_ids: list[int], loop, with_presences: bool) -> None:
+    """Deliver GUILD_MEMBERS_CHUNK events for ``user_ids`` the way a chunk or query_members request does."""
+    request = ChunkRequest(guild.id, 0, loop, state._get_guild, cache=True)
+    state._chunk_requests[request.nonce] = request
+    chunk_count = max(1, -(-len(user_ids) // CHUNK_SIZE))
+    for index in range(chunk_count):
+        batch = user_ids[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+        state.parse_guild_members_chunk({
+            "guild_id": str(GUILD_ID),
+            "members": [member_payload(user_id) for user_id in batch],
+            "presences": [presence_payload(user_id) for user_id in batch] if with_presences else [],
+            "chunk_index": index,
+            "chunk_count": chunk_count,
+            "nonce": request.nonce
+        })
+
+
+def run_policy(policy: str, members: int, touched: int, presence_updates: int) -> dict:
+    import asyncio
+    if policy == "all":
+        intents = discord.Intents.all()
+        options = {"member_cache_flags": discord.MemberCacheFlags.from_intents(intents), "chunk_guilds_at_startup": True}
+    else:
+        import benchmarks.fake_discord  # noqa: F401  Stands in for secret.py, which config imports.
+        import config
+        intents = config.INTENTS
+        options = {"member_cache_flags": config.MEMBER_CACHE_FLAGS, "chunk_guilds_at_startup": config.CHUNK_GUILDS_AT_STARTUP}
+
+    loop = asyncio.new_event_loop()
+    client = discord.Client(intents=intents, **options)
+    state = client._connection
+    state.loop = loop
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_ID))
+    user_ids = list(range(BOT_ID + 1, BOT_ID + 1 + members))
+    baseline = rss_kib()
+
+    # Ready: the guild arrives, then the member list if the policy chunks it.
+    started = time.perf_counter()
+    guild = state._get_create_guild(guild_payload(members))
+    if state._guild_needs_chunking(guild):
+        feed_chunks(state, guild, user_ids, loop, intents.presences)
+    ready_seconds = time.perf_counter() - started
+    ready_kib = rss_kib() - baseline
+
+    # Steady state: a burst of presence updates (only sent with the presences intent), and the
+    # members commands actually touch, fetched on demand when they are not cached yet.
+    started = time.perf_counter()
+    if intents.presences:
+        for i in range(presence_updates):
+            state.parse_presence_update(presence_payload(user_ids[i % members]))
+    on_demand = [user_id for user_id in user_ids[:touched] if guild.get_member(user_id) is None]
+    if on_demand:
+        feed_chunks(state, guild, on_demand, loop, False)
+    steady_seconds = time.perf_counter() - started
+
+    loop.close()
+    return {
+        "policy": policy,
+        "intents": intents.value,
+        "cached_members": len(guild.members),
+        "ready_ms": round(ready_seconds * 1000, 1),
+        "ready_rss_kib": ready_kib,
+        "steady_ms": round(steady_seconds * 1000, 1),
+        "total_rss_kib": rss_kib() - baseline
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=20000, help="Members in the synthetic guild.")
+    parser.add_argument("--touched", type=int, default=500, help="Members commands look up after ready.")
+    parser.add_argument("--presence-updates", type=int, default=5000, help="Presence updates received after ready.")
+    parser.add_argument("--policy", choices=("all", "configured"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.policy:
+        print(json.dumps(run_policy(args.policy, args.members, args.touched, args.presence_updates)))
+        return
+
+    results = []
+    for policy in ("all", "configured"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.gateway_footprint", "--policy", policy,
+             "--members", str(args.members), "--touched", str(args.touched), "--presence-updates", str(args.presence_updates)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"Synthetic guild: {args.members} members, {args.touched} looked up after ready, {args.presence_updates} presence updates")
+    print(f"{'policy':<12}{'intents':>10}{'cached':>10}{'ready ms':>10}{'ready RSS':>12}{'steady ms':>11}{'total RSS':>12}")
+    for result in results:
+        print(
+            f"{result['policy']:<12}{result['intents']:>10}{result['cached_members']:>10}{result['ready_ms']:>10}"
+            f"{result['ready_rss_kib'] / 1024:>9.1f} MiB{result['steady_ms']:>11}{result['total_rss_kib'] / 1024:>9.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
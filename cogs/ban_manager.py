@@ -1,84 +1,239 @@
+import asyncio
 import logging
 import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta, timezone
-import config  # Import your configuration module
+from utils.command_runner import CommandRun
+from storage.ban_ledger import BAN_LEDGER_PATH, BanLedger
+from storage.partitions import GuildPartitions, guild_path
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 
 APPEAL_INSTRUCTIONS = "If your ban is appealable, contact the Director or Deputy Director via Direct Message."
+UNBAN_BATCH_SIZE = 10  # Unbans sent to Discord at once.
+UNBAN_RETRY_DELAY = timedelta(minutes=5)
+MAX_EXPIRY_SLEEP = 3600  # Seconds. Re-check the schedule at least hourly in case the clock jumps.
+BAN_STEPS = ("dm", "ban", "ledger", "log")  # Journaled side effects of a ban, in order.
 
 class BanManager(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
+        self.ban_ledgers = GuildPartitions(lambda guild_id: BanLedger(guild_path(guild_id, BAN_LEDGER_PATH), bot.profiles), adopt=(BAN_LEDGER_PATH,))
+        self._expiry_wakeup = asyncio.Event()
+        self._expiry_task = None
+        self._lifting: set[tuple[int, int]] = set()  # Bans being lifted by the expiry engine right now.
+
+    async def cog_load(self) -> None:
+        carried = self.bot.reloader.take_over(self)
+        if carried:
+            self.ban_ledgers, self._lifting = carried["ban_ledgers"], carried["lifting"]
+        await self.ban_ledgers.load(self.bot.owned_guild_ids)
+        self.bot.journal.register("ban", self.carry_out_ban)
+        self._expiry_task = asyncio.create_task(self.run_ban_expiries())
+
+    async def cog_unload(self) -> None:
+        if self._expiry_task:
+            self._expiry_task.cancel()
+        if not self.bot.reloader.carry_over(self, ban_ledgers=self.ban_ledgers, lifting=self._lifting):
+            await self.ban_ledgers.close()
 
     @app_commands.command(name="ban", description="Ban a member with reason, duration, and appeal status.")
     @app_commands.default_permissions(ban_members=True)
     async def ban(self, interaction: discord.Interaction, member: discord.Member, duration: int, appealable: bool, reason: str):
-        try:
-            if duration <= 0:
-                await interaction.response.send_message("Duration must be at least 1 day.", ephemeral=True)
-                return
-
-            if len(reason.strip()) == 0:
-                await interaction.response.send_message("You must provide a reason for the ban.", ephemeral=True)
-                return
-
-            # Calculate unban date
-            unban_date = datetime.now(timezone.utc) + timedelta(days=duration)
-            appeal_status = "Yes" if appealable else "No"
-
-            # Create Embed
-            embed = discord.Embed(
-                title="You Have Been Banned from Sigma Security Group",
-                color=discord.Color.red()
-            )
-            embed.add_field(name="Reason", value=reason, inline=False)
-            embed.add_field(name="Duration", value=f"{duration} days", inline=False)
-            embed.add_field(name="Appeal Status", value=appeal_status, inline=False)
-            embed.add_field(name="How to Appeal", value=APPEAL_INSTRUCTIONS, inline=False)
-            embed.set_footer(text=f"Your ban was made by {interaction.user.display_name}")
+        # Validate before acknowledging so mistakes get an instant ephemeral answer
+        if duration <= 0:
+            await interaction.response.send_message("Duration must be at least 1 day.", ephemeral=True)
+            return
 
-            # Try to DM the user
-            try:
-                await member.send(embed=embed)
-                logging.info(f"Ban notification sent to {member}")
-            except discord.Forbidden:
-                logging.warning(f"Failed to DM {member}")
-                await interaction.followup.send(f"Could not DM {member.mention} about the ban.", ephemeral=True)
+        if len(reason.strip()) == 0:
+            await interaction.response.send_message("You must provide a reason for the ban.", ephemeral=True)
+            return
+
+        async with CommandRun(interaction, "ban", error_message="An unexpected error occurred while processing the ban.") as run:
+            # Journal the ban before touching Discord, so a crash part way through is finished on restart
+            entry = await run.step("journal", self.bot.journal.begin("ban", {
+                "guild_id": interaction.guild.id,
+                "user_id": member.id,
+                "user_name": str(member),
+                "moderator_id": interaction.user.id,
+                "moderator_name": interaction.user.display_name,
+                "reason": reason,
+                "duration": duration,
+                "appealable": appealable
+            }, BAN_STEPS))
+            dm_sent, logged = await self.bot.journal.attempt(entry, self.carry_out_ban(entry, run))
 
-            # Ban the user
-            await member.ban(reason=reason)
-            logging.info(f"{member} banned successfully")
+            await run.send(f"{member.mention} has been banned for {duration} days. Reason: {reason}")
+            if not dm_sent:
+                await run.send(f"Could not DM {member.mention} about the ban.", ephemeral=True)
+            if not logged:
+                await run.send("Logging channel not found. Please check the configuration.", ephemeral=True)
 
-            # Confirmation message
-            await interaction.response.send_message(f"{member.mention} has been banned for {duration} days. Reason: {reason}")
+    async def carry_out_ban(self, entry, run: CommandRun = None) -> tuple[bool, bool]:
+        """Perform the pending steps of a journaled ban and return whether the DM and the log landed."""
+        ban = entry.payload
+        guild = self.bot.get_guild(ban["guild_id"])
+        ban_ledger = await self.ban_ledgers.open(ban["guild_id"])
+        step = run.step if run else (lambda name, awaitable: awaitable)
+        appeal_status = "Yes" if ban["appealable"] else "No"
+        dm_sent = logged = True
 
-            # Logging to a channel
-            logging_channel = self.bot.get_channel(config.REPORT_LOG_CHANNEL_ID)
+        # Try to DM the user. This has to land before the ban, as we share no server afterwards.
+        if "dm" in entry.pending:
+            member = await self.bot.handles.member(guild, ban["user_id"]) if "ban" in entry.pending else None
+            if member:
+                embed = discord.Embed(
+                    title="You Have Been Banned from Sigma Security Group",
+                    color=discord.Color.red()
+                )
+                embed.add_field(name="Reason", value=ban["reason"], inline=False)
+                embed.add_field(name="Duration", value=f"{ban['duration']} days", inline=False)
+                embed.add_field(name="Appeal Status", value=appeal_status, inline=False)
+                embed.add_field(name="How to Appeal", value=APPEAL_INSTRUCTIONS, inline=False)
+                embed.set_footer(text=f"Your ban was made by {ban['moderator_name']}")
+                try:
+                    await step("dm", self.bot.outbound.send(member, embed=embed))
+                    logging.info(f"Ban notification sent to {member}")
+                except discord.Forbidden:
+                    logging.warning(f"Failed to DM {member}")
+                    dm_sent = False
+            else:
+                dm_sent = False
+            await self.bot.journal.complete(entry, "dm")
+
+        # Ban the user
+        if "ban" in entry.pending:
+            await step("ban", guild.ban(discord.Object(id=ban["user_id"]), reason=ban["reason"]))
+            logging.info(f"{ban['user_name']} banned successfully")
+            await self.bot.journal.complete(entry, "ban")
+
+        # Record the ban so it is lifted automatically once the duration has elapsed, once per action
+        if "ledger" in entry.pending:
+            await step("ledger", ban_ledger.record_ban(
+                ban["guild_id"], ban["user_id"], ban["moderator_id"], ban["reason"], ban["duration"], ban["appealable"], entry.action_id
+            ))
+            self._expiry_wakeup.set()
+            await self.bot.journal.complete(entry, "ledger")
+
+        # Queue the channel log, the journal marks it done once it has actually been sent
+        if "log" in entry.pending:
+            logging_channel = await self.report_log_channel(ban["guild_id"])
             if logging_channel:
+                ledger_entry = ban_ledger.active(ban["guild_id"], ban["user_id"])
+                unban_date = datetime.fromisoformat(ledger_entry["unban_at"]) if ledger_entry else datetime.now(timezone.utc) + timedelta(days=ban["duration"])
                 log_embed = discord.Embed(
                     title="Member Banned",
                     color=discord.Color.orange()
                 )
-                log_embed.add_field(name="Member", value=f"{member} ({member.id})", inline=False)
-                log_embed.add_field(name="Moderator", value=f"{interaction.user.display_name} ({interaction.user.id})", inline=False)
-                log_embed.add_field(name="Reason", value=reason, inline=False)
-                log_embed.add_field(name="Duration", value=f"{duration} days", inline=False)
+                log_embed.add_field(name="Member", value=f"{ban['user_name']} ({ban['user_id']})", inline=False)
+                log_embed.add_field(name="Moderator", value=f"{ban['moderator_name']} ({ban['moderator_id']})", inline=False)
+                log_embed.add_field(name="Reason", value=ban["reason"], inline=False)
+                log_embed.add_field(name="Duration", value=f"{ban['duration']} days", inline=False)
                 log_embed.add_field(name="Appealable", value=appeal_status, inline=False)
                 log_embed.set_footer(text=f"Unban Date: {unban_date.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-                await logging_channel.send(embed=log_embed)
+                self.bot.journal.track(entry, "log", self.bot.outbound.enqueue(logging_channel, embed=log_embed))
             else:
                 logging.warning("Logging channel not found. Ban details will not be logged.")
-                await interaction.followup.send("Logging channel not found. Please check the configuration.", ephemeral=True)
+                await self.bot.journal.complete(entry, "log")
+                logged = False
+
+        return dm_sent, logged
+
+    # ==========================
+    # Ban Expiry Engine. // Jack
+    # ==========================
+    async def run_ban_expiries(self) -> None:
+        """Sleep until the next ban is due, lift everything that is due, repeat."""
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                self._expiry_wakeup.clear()
+                now = datetime.now(timezone.utc)
+                next_expiry = min(filter(None, (ledger.next_expiry() for _, ledger in self.ban_ledgers.items())), default=None)
+
+                if next_expiry is None or next_expiry > now:
+                    timeout = MAX_EXPIRY_SLEEP if next_expiry is None else min((next_expiry - now).total_seconds(), MAX_EXPIRY_SLEEP)
+                    try:
+                        await asyncio.wait_for(self._expiry_wakeup.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self.lift_bans([ban for _, ledger in self.ban_ledgers.items() for ban in ledger.due(now)])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception(f"Error in ban expiry engine: {e}")
+                await asyncio.sleep(UNBAN_RETRY_DELAY.total_seconds())
+
+    async def lift_bans(self, bans: list[dict]) -> None:
+        for i in range(0, len(bans), UNBAN_BATCH_SIZE):
+            batch = bans[i:i + UNBAN_BATCH_SIZE]
+            # due() already took these off the schedule, so any that fail unexpectedly are put back on it
+            results = await asyncio.gather(*(self.lift_ban(ban) for ban in batch), return_exceptions=True)
+            for ban, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logging.error(f"Could not lift ban of {ban['user_id']}, retrying later", exc_info=result)
+                    await self.ban_ledgers[ban["guild_id"]].postpone(ban["guild_id"], ban["user_id"], UNBAN_RETRY_DELAY)
+            lifted = [ban for ban, result in zip(batch, results) if result is True]
+            by_guild = {}
+            for ban in lifted:
+                by_guild.setdefault(ban["guild_id"], []).append(ban)
+            for guild_id, guild_bans in by_guild.items():
+                await self.ban_ledgers[guild_id].record_unbans(((ban["guild_id"], ban["user_id"]) for ban in guild_bans), "Ban duration elapsed")
+            self._lifting.difference_update((ban["guild_id"], ban["user_id"]) for ban in batch)
+            for guild_id, guild_bans in by_guild.items():
+                await self.log_expired_bans(guild_id, guild_bans)
+
+    async def lift_ban(self, ban: dict) -> bool:
+        """Unban one member. Failed attempts are rescheduled and return False."""
+        guild = self.bot.get_guild(ban["guild_id"])
+        self._lifting.add((ban["guild_id"], ban["user_id"]))
+        try:
+            if guild is None:
+                raise LookupError(f"guild {ban['guild_id']} is not available")
+            await guild.unban(discord.Object(id=ban["user_id"]), reason="Ban duration elapsed")
+            logging.info(f"Lifted expired ban of {ban['user_id']}")
+        except discord.NotFound:
+            logging.info(f"Ban of {ban['user_id']} was already lifted")
+        except (discord.HTTPException, LookupError) as e:
+            logging.warning(f"Could not lift ban of {ban['user_id']}, retrying later: {e}")
+            await self.ban_ledgers[ban["guild_id"]].postpone(ban["guild_id"], ban["user_id"], UNBAN_RETRY_DELAY)
+            return False
+        return True
+
+    async def report_log_channel(self, guild_id: int):
+        settings = self.bot.guild_configs.get(guild_id)
+        return settings and await self.bot.handles.channel(settings.REPORT_LOG_CHANNEL_ID)
+
+    async def log_expired_bans(self, guild_id: int, bans: list[dict]) -> None:
+        logging_channel = await self.report_log_channel(guild_id)
+        if not logging_channel:
+            logging.warning(f"Logging channel not found in guild {guild_id}. Expired bans will not be logged.")
+            return
+
+        log_embed = discord.Embed(
+            title="Ban Expired" if len(bans) == 1 else "Bans Expired",
+            color=discord.Color.green()
+        )
+        for ban in bans:  # At most UNBAN_BATCH_SIZE, which keeps the embed inside its size limit.
+            log_embed.add_field(
+                name=f"Member {ban['user_id']}",
+                value=f"<@{ban['user_id']}> was banned for {ban['duration']} days on {datetime.fromisoformat(ban['banned_at']).strftime('%Y-%m-%d %H:%M:%S UTC')}. Reason: {ban['reason']}"[:500],
+                inline=False
+            )
+        self.bot.outbound.enqueue(logging_channel, embed=log_embed)
 
-        except Exception as e:
-            logging.exception(f"Error in ban command: {e}")
-            if not interaction.response.is_done():
-                await interaction.response.send_message("An unexpected error occurred while processing the ban.", ephemeral=True)
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild: discord.Guild, user: discord.User) -> None:
+        # Bans lifted by hand no longer need to expire
+        ban_ledger = self.ban_ledgers.get(guild.id)
+        if ban_ledger is None or (guild.id, user.id) in self._lifting:
+            return
+        await ban_ledger.record_unbans(((guild.id, user.id),), "Unbanned manually")
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(BanManager(bot))
@@ -1,3 +1,4 @@
+import re
 import json
 import random
 import logging
@@ -8,34 +9,140 @@ import asyncio
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta, timezone
+from storage.commendation_store import COMMENDATION_LOG_PATH, COMMENDATION_WINDOWS, CommendationStore
+from storage.partitions import GuildPartitions, guild_path
+from utils.command_runner import CommandRun
+from utils.pagination import PaginatorView
 
 
 # Logging setup. // Jack
 logging.basicConfig(level=logging.INFO)
 CURRENT_TIME = datetime.now(timezone.utc)
+COMMENDATION_TITLE = "Commendation Received!"
+LEADERBOARD_PAGE_SIZE = 10
+IMPORT_BATCH_SIZE = 100  # Commendations read back from the channel per ledger write.
+USER_MENTION = re.compile(r"<@!?(\d+)>")
 
 class CommendCandidateTracking(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
+        self.commendation_stores = GuildPartitions(
+            lambda guild_id: CommendationStore(guild_path(guild_id, COMMENDATION_LOG_PATH), bot.profiles.book(guild_id)),
+            adopt=(COMMENDATION_LOG_PATH,)
+        )
+        self._import_tasks: dict[int, asyncio.Task] = {}  # By guild ID.
+
+    async def cog_load(self) -> None:
+        self.bot.rate_limits.add_rule("commend_by", *config.COMMEND_LIMIT_PER_COMMENDER)
+        self.bot.rate_limits.add_rule("commend_of", *config.COMMEND_LIMIT_PER_TARGET)
+        carried = self.bot.reloader.take_over(self)
+        if carried:
+            self.commendation_stores = carried["commendation_stores"]
+        await self.commendation_stores.load(self.bot.owned_guild_ids)
+        # Anything posted from here on is recorded by /commend itself
+        before = discord.utils.time_snowflake(datetime.now(timezone.utc))
+        for guild_id, store in self.commendation_stores.items():
+            if not store.imported:
+                self._import_tasks[guild_id] = asyncio.create_task(self.import_history(guild_id, before))
+
+    async def cog_unload(self) -> None:
+        for task in self._import_tasks.values():
+            task.cancel()
+        if not self.bot.reloader.carry_over(self, commendation_stores=self.commendation_stores):
+            await self.commendation_stores.close()
+
+    # ===================================
+    # Commendation Ledger Import. // Jack
+    # ===================================
+    @staticmethod
+    def parse_commendation(message: discord.Message) -> dict:
+        """Read a commendation back from the embed /commend posted, or None for any other message."""
+        for embed in message.embeds:
+            if embed.title != COMMENDATION_TITLE:
+                continue
+            fields = {field.name: field.value for field in embed.fields}
+            person, commender = USER_MENTION.search(fields.get("Commended", "")), USER_MENTION.search(fields.get("By", ""))
+            if person and commender:
+                return {
+                    "message_id": message.id,
+                    "person_id": int(person.group(1)),
+                    "commender_id": int(commender.group(1)),
+                    "role": fields.get("Role", ""),
+                    "reason": fields.get("Reason", ""),
+                    "at": discord.utils.snowflake_time(message.id).isoformat()
+                }
+        return None
+
+    async def import_history(self, guild_id: int, before: int) -> None:
+        """Import a guild's commendations posted before the ledger existed, once."""
+        try:
+            await self.bot.wait_until_ready()
+            if self.bot.get_guild(guild_id) is None:
+                return  # Served by another process's shards.
+            channel_commendations = await self.bot.handles.channel(self.bot.guild_configs[guild_id].COMMENDATIONS_CHANNEL_ID)
+            if not channel_commendations:
+                logging.warning(f"Commendations channel not found in guild {guild_id}. Earlier commendations will not be imported.")
+                return
+
+            # The cut-off is fixed by the first attempt, so a resumed import never reaches commendations /commend recorded
+            store = self.commendation_stores[guild_id]
+            before = await store.start_import(before)
+            logging.info(f"Importing earlier commendations from the commendations channel of guild {guild_id}.")
+
+            batch = []
+            async for message in channel_commendations.history(limit=None, before=discord.Object(id=before), oldest_first=True):
+                commendation = self.parse_commendation(message)
+                if commendation:
+                    batch.append(commendation)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await store.import_many(batch)
+                    batch.clear()
+            await store.import_many(batch)
+            await store.mark_imported()
+            logging.info(f"Earlier commendations of guild {guild_id} imported.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.exception(f"Error while importing earlier commendations of guild {guild_id}: {e}")
 
     # =============================
     # Commendation Command. // Jack
     # =============================
     @discord.app_commands.command(name="commend", description="Commend a person")
-    @discord.app_commands.guilds(config.GUILD_ID)
+    @discord.app_commands.guilds(*config.GUILDS)
     async def commend(self, interaction: discord.Interaction, person: discord.Member, role: str, reason: str) -> None:
-        try:
-            if person.id == interaction.user.id:
-                await interaction.response.send_message(
-                    "You cheeky bugger! You cannot commend yourself.", ephemeral=True
-                )
-                return
+        if person.id == interaction.user.id:
+            await interaction.response.send_message(
+                "You cheeky bugger! You cannot commend yourself.", ephemeral=True
+            )
+            return
 
+        # Checked before the rate limit and the ledger, so a missing channel costs nothing
+        guild_id = interaction.guild.id
+        channel_commendations = await self.bot.handles.channel(self.bot.guild_configs[guild_id].COMMENDATIONS_CHANNEL_ID)
+        if not channel_commendations:
+            await interaction.response.send_message("Commendations channel not found.", ephemeral=True)
+            return
+
+        # Counted before anything is posted, so spam never reaches the channel or the API
+        limited = self.bot.rate_limits.hit(("commend_by", f"{guild_id}:{interaction.user.id}"), ("commend_of", f"{guild_id}:{person.id}"))
+        if limited:
+            rule, retry_after = limited
+            retry_at = discord.utils.format_dt(datetime.now(timezone.utc) + timedelta(seconds=retry_after), "R")
+            message = (
+                f"You have used all your commendations for now. You can commend again {retry_at}."
+                if rule == "commend_by" else
+                f"{person.display_name} has received the most commendations allowed for now. Try again {retry_at}."
+            )
+            await interaction.response.send_message(message, ephemeral=True)
+            return
+
+        async with CommandRun(interaction, "commend", ephemeral=True, error_message="An unexpected error occurred while processing your commendation.") as run:
             logging.info(f"Commend command invoked by {interaction.user.mention} for {person.mention} with role '{role}' and reason '{reason}'")
 
-            guild = self.bot.get_guild(config.GUILD_ID)
-            channel_commendations = await guild.fetch_channel(config.COMMENDATIONS_CHANNEL_ID)
+            store = await self.commendation_stores.open(guild_id)
+            await run.step("ledger", store.add(person.id, interaction.user.id, role, reason))
 
             # Commented out performance bonus logic
             # with open("Data/performance_bonus.json") as f:
@@ -62,10 +169,6 @@ class CommendCandidateTracking(commands.Cog):
             # with open("Data/performance_bonus.json", "w") as f:
             #     json.dump(performance_data, f, indent=4)
 
-            await channel_commendations.send(
-                f"{person.mention} has been commended by {interaction.user.mention}!"
-            )
-
             embed = discord.Embed(
                 title="Commendation Received!",
                 color=discord.Color.green()
@@ -81,19 +184,89 @@ class CommendCandidateTracking(commands.Cog):
             # )
             embed.set_footer(text="Great work deserves recognition!")
 
-            await channel_commendations.send(embed=embed)
+            # Announcement and embed go out as one queued message
+            self.bot.outbound.enqueue(
+                channel_commendations,
+                f"{person.mention} has been commended by {interaction.user.mention}!",
+                embed=embed
+            )
 
-            await interaction.response.send_message(
+            confirmation = await run.send(
                 f"Thank you for commending! It has been submitted successfully in {channel_commendations.mention}.",
-                ephemeral=True,
-                delete_after=10.0
-            )
-        except Exception as e:
-            logging.exception(f"Error in commend command: {e}")
-            await interaction.response.send_message(
-                "An unexpected error occurred while processing your commendation.",
                 ephemeral=True
             )
+            await confirmation.delete(delay=10.0)
+
+    # ====================================
+    # Commendation Stats Commands. // Jack
+    # ====================================
+    @discord.app_commands.command(name="commend-stats", description="Commendations a member has received and given.")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @discord.app_commands.describe(member="The member to look up. Defaults to you.")
+    async def commend_stats(self, interaction: discord.Interaction, member: discord.Member = None) -> None:
+        member = member or interaction.user
+        store = await self.commendation_stores.open(interaction.guild.id)
+        received = store.leaderboard()
+
+        embed = discord.Embed(title=f"Commendations for {member.display_name}", color=discord.Color.green())
+        rank = received.rank(member.id)
+        embed.add_field(
+            name="Received",
+            value=f"{received.get(member.id)} all time" + (f" (#{rank} of {len(received)})" if rank else ""),
+            inline=False
+        )
+        embed.add_field(
+            name="Recently",
+            value="\n".join(f"Last {days} days: {store.leaderboard(days).get(member.id)}" for days in COMMENDATION_WINDOWS),
+            inline=False
+        )
+        given_rank = store.given_rank(member.id)
+        embed.add_field(name="Given", value=f"{store.given(member.id)}" + (f" (#{given_rank})" if given_rank else ""), inline=False)
+        roles = store.roles_of(member.id)
+        if roles:
+            embed.add_field(name="Top Roles", value="\n".join(f"{name[:80]}: {count}" for name, count in roles), inline=False)
+        if not store.imported:
+            embed.set_footer(text="Earlier commendations are still being imported.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @discord.app_commands.command(name="commend-leaderboard", description="Most commended members.")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @discord.app_commands.describe(window="Only count commendations from this period.", role="Only count commendations in this role.")
+    @discord.app_commands.choices(window=[app_commands.Choice(name="All time", value=0)] + [
+        app_commands.Choice(name=f"Last {days} days", value=days) for days in COMMENDATION_WINDOWS
+    ])
+    async def commend_leaderboard(self, interaction: discord.Interaction, window: app_commands.Choice[int] = None, role: str = None) -> None:
+        async with CommandRun(interaction, "commend-leaderboard", error_message="An error occurred while generating the commendation leaderboard.") as run:
+            days = window.value if window and window.value else None
+            store = await self.commendation_stores.open(interaction.guild.id)
+            leaderboard = store.leaderboard(days, role)
+            if not len(leaderboard):
+                await run.send("No commendations found.", ephemeral=True)
+                return
+
+            guild = interaction.guild
+            title = "Commendation Leaderboard" + (f" for {role[:80]}" if role else "") + (f" (Last {days} Days)" if days else "")
+
+            async def render(page: int) -> discord.Embed:
+                offset = page * LEADERBOARD_PAGE_SIZE
+                entries = leaderboard.page(offset, LEADERBOARD_PAGE_SIZE)
+                names = await self.bot.member_names.resolve(guild, [user_id for user_id, _ in entries])
+                lines = [
+                    f"**{i}.** {names[user_id].name if user_id in names else f'Unknown User ({user_id})'}: {count}"
+                    for i, (user_id, count) in enumerate(entries, start=offset + 1)
+                ]
+                return discord.Embed(title=title, description="\n".join(lines), color=discord.Color.green())
+
+            page_count = -(-len(leaderboard) // LEADERBOARD_PAGE_SIZE)
+            view = PaginatorView(interaction.user.id, page_count, render)
+            view.message = await run.send(embed=await view.first_page(), view=view if page_count > 1 else discord.utils.MISSING)
+
+    @commend_leaderboard.autocomplete("role")
+    async def commend_role_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        current = current.lower()
+        store = self.commendation_stores.get(interaction.guild_id)
+        names = [name for name in store.role_names() if current in name.lower()] if store else []
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names[:25]]
 
     # ===================================
     # Commented out Performance Bonus Commands // Jack
@@ -0,0 +1,72 @@
+#=================
+# Imports. // Jack
+#=================
+import discord
+import config
+from datetime import datetime, timezone
+from discord.ext import commands
+from discord import app_commands
+from utils.guild_config import has_any_guild_role
+
+#===================
+# Cog Setup. // Jack
+#===================
+class Profiles(commands.Cog):
+    """Read-only summary of a member, served from the profiles the stores keep in memory."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        super().__init__()
+        self.bot = bot
+
+    #========================
+    # Member Profile. // Jack
+    #========================
+    @app_commands.command(name="member-profile", description="A member's attendance, no-shows, commendations and bans at a glance")
+    @app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role("UNIT_STAFF_ROLE_ID", "CURATOR_ROLE_ID", "ADVISOR_ROLE_ID")
+    @app_commands.describe(member="The member to look up, also works for members who have left or are banned.")
+    async def member_profile(self, interaction: discord.Interaction, member: discord.User) -> None:
+        profile = self.bot.profiles.get(interaction.guild.id, member.id)
+        if profile is None:
+            await interaction.response.send_message(f"Nothing has been recorded for {member.mention} yet.", ephemeral=True)
+            return
+
+        settings = self.bot.guild_configs[interaction.guild.id]
+        embed = discord.Embed(title=f"Member Profile: {member.display_name}", color=discord.Color.blurple())
+        embed.set_thumbnail(url=member.display_avatar.url)
+
+        operations = f"{profile.operations} attended"
+        if profile.operations < settings.TOTAL_OPERATIONS:
+            operations += f", {settings.TOTAL_OPERATIONS - profile.operations} left to Sigma Associate"
+        if profile.last_operation_id:
+            operations += f"\nLast {discord.utils.format_dt(discord.utils.snowflake_time(profile.last_operation_id), 'R')}"
+        embed.add_field(name="Operations", value=operations, inline=False)
+
+        no_shows = f"{profile.no_shows} reported"
+        if profile.last_no_show:
+            no_shows += f"\nLast: **{profile.last_no_show[:100]}** {self.relative(profile.last_no_show_at)}"
+        embed.add_field(name="No-Shows", value=no_shows, inline=False)
+
+        commendations = f"{profile.commendations} received, {profile.commendations_given} given"
+        if profile.last_commended_at:
+            commendations += f"\nLast commended {self.relative(profile.last_commended_at)}"
+        embed.add_field(name="Commendations", value=commendations, inline=False)
+
+        bans = f"{profile.bans} timed bans"
+        if profile.active_ban:
+            ban = profile.active_ban
+            unban_at = discord.utils.format_dt(datetime.fromisoformat(ban["unban_at"]), "R")
+            bans += f"\n**Banned**, lifted {unban_at}. Reason: {ban['reason']}"
+        embed.add_field(name="Bans", value=bans[:1024], inline=False)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @staticmethod
+    def relative(timestamp: float) -> str:
+        return discord.utils.format_dt(datetime.fromtimestamp(timestamp, timezone.utc), "R")
+
+#=================
+# Cog End. // Jack
+#=================
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Profiles(bot))
@@ -1,34 +1,196 @@
-import json
-import os
+import re
+import asyncio
 import logging
+import weakref
 import discord
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 from discord.ext import commands
 from discord import app_commands
+from discord.ui import Modal, TextInput
 import config
+from storage.no_show_store import LEGACY_NO_SHOW_PATH, NO_SHOW_LOG_PATH, NoShowStore
+from storage.attendance_store import ATTENDANCE_LOG_PATH, AttendanceStore
+from storage.tracking_keys import TRACKING_KEY_LOG_PATH, TrackingKeyStore
+from storage.partitions import GuildPartitions, guild_path
+from utils.autocomplete import PrefixIndex, suggest
+from utils.command_runner import CommandRun
+from utils.guild_config import has_any_guild_role
+from utils.pagination import PaginatorView
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 
+NO_SHOW_ALERT_THRESHOLD = 3
+NO_SHOW_STEPS = ("store", "dms", "staff_post")  # Journaled side effects of a no-show report, in order.
+EMBED_FIELD_LIMIT = 1024
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_RECORDS_SHOWN = 3  # Most recent records listed per member, keeps a page under the embed size limit.
+MEMBER_REFERENCE = re.compile(r"^(?:<@!?)?(\d{15,20})>?$")
+
+
+def chunk_lines(lines: list[str], limit: int = EMBED_FIELD_LIMIT) -> list[str]:
+    """Join lines into as few blocks as possible that each fit in one embed field."""
+    chunks, current = [], ""
+    for line in lines:
+        line = line[:limit]
+        if current and len(current) + 1 + len(line) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 class NoShowTracking(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
+        # One store of each kind per guild, under Data/guilds/<guild_id>/.
+        self.no_show_stores = GuildPartitions(
+            lambda guild_id: NoShowStore(guild_path(guild_id, NO_SHOW_LOG_PATH), guild_path(guild_id, LEGACY_NO_SHOW_PATH), bot.profiles.book(guild_id)),
+            adopt=(NO_SHOW_LOG_PATH, LEGACY_NO_SHOW_PATH)
+        )
+        self.attendance_stores = GuildPartitions(
+            lambda guild_id: AttendanceStore(guild_path(guild_id, ATTENDANCE_LOG_PATH), bot.profiles.book(guild_id)),
+            adopt=(ATTENDANCE_LOG_PATH,)
+        )
+        self.tracking_keys = GuildPartitions(lambda guild_id: TrackingKeyStore(guild_path(guild_id, TRACKING_KEY_LOG_PATH)), adopt=(TRACKING_KEY_LOG_PATH,))
+        self.attendance_ready: dict[int, asyncio.Event] = {}  # By guild ID, set once that guild's index is synced.
+        self._attendance_sync_task = None
+        # One lock per candidate being tracked, by (guild ID, member ID), dropped once nobody holds or waits on it.
+        self._tracking_locks: weakref.WeakValueDictionary[tuple[int, int], asyncio.Lock] = weakref.WeakValueDictionary()
+        self._unindexed_posts: dict[tuple[int, int], dict[asyncio.Future, asyncio.Task]] = {}  # Candidate to queued progress posts and their indexing tasks.
+
+    async def cog_load(self) -> None:
+        self.bot.rate_limits.add_rule("no_show_report_by", *config.NO_SHOW_REPORT_LIMIT_PER_REPORTER)
+        self.bot.rate_limits.add_rule("no_show_report_of", *config.NO_SHOW_REPORT_LIMIT_PER_TARGET)
+        carried = self.bot.reloader.take_over(self)
+        if carried:
+            self.no_show_stores = carried["no_show_stores"]
+            self.attendance_stores = carried["attendance_stores"]
+            self.attendance_ready = carried["attendance_ready"]
+            self.tracking_keys = carried["tracking_keys"]
+            self._tracking_locks = carried["tracking_locks"]
+            self._unindexed_posts = carried["unindexed_posts"]
+        # Replay each guild's logs (and migrate the old JSON file) without blocking the gateway.
+        # After a reload only guilds newly added to the config have anything to load.
+        guild_ids = self.bot.owned_guild_ids
+        await asyncio.gather(
+            self.no_show_stores.load(guild_ids),
+            self.attendance_stores.load(guild_ids),
+            self.tracking_keys.load(guild_ids)
+        )
+        for guild_id in guild_ids:
+            self.attendance_ready.setdefault(guild_id, asyncio.Event())
+        self.bot.journal.register("no_show", self.carry_out_no_show)
+        self._attendance_sync_task = asyncio.create_task(self.sync_attendance())
+
+    async def cog_unload(self) -> None:
+        if self._attendance_sync_task:
+            self._attendance_sync_task.cancel()
+        if not self.bot.reloader.carry_over(
+            self,
+            no_show_stores=self.no_show_stores,
+            attendance_stores=self.attendance_stores,
+            attendance_ready=self.attendance_ready,
+            tracking_keys=self.tracking_keys,
+            tracking_locks=self._tracking_locks,
+            unindexed_posts=self._unindexed_posts
+        ):
+            await self.no_show_stores.close()
+            await self.attendance_stores.close()
+            await self.tracking_keys.close()
+
+    # ================================
+    # Attendance Index Upkeep. // Jack
+    # ================================
+    @staticmethod
+    def credited_member_ids(message: discord.Message, operation_keyword: str) -> list[int]:
+        """Members a commendations channel message credits with attending an operation."""
+        if operation_keyword.lower() not in message.content.lower():
+            return []
+        return [user.id for user in message.mentions]
+
+    def commendations_index(self, guild_id: Optional[int], channel_id: int) -> tuple[Optional[AttendanceStore], str]:
+        """The attendance index a message belongs to and its guild's operation keyword, if posted in a commendations channel."""
+        settings = self.bot.guild_configs.get(guild_id)
+        if settings is None or channel_id != settings.COMMENDATIONS_CHANNEL_ID:
+            return None, ""
+        return self.attendance_stores.get(guild_id), settings.OPERATION_KEYWORD
+
+    async def sync_attendance(self) -> None:
+        """Sync the attendance index of every configured guild this process serves, side by side."""
+        await self.bot.wait_until_ready()
+        await asyncio.gather(*(
+            self.sync_guild_attendance(settings.guild_id)
+            for settings in self.bot.guild_configs if self.bot.get_guild(settings.guild_id) is not None
+        ))
+
+    async def sync_guild_attendance(self, guild_id: int) -> None:
+        """Backfill a guild's attendance index from full channel history once, then catch up on restarts."""
+        ready = self.attendance_ready.setdefault(guild_id, asyncio.Event())
+        try:
+            settings = self.bot.guild_configs[guild_id]
+            channel_commendations = await self.bot.handles.channel(settings.COMMENDATIONS_CHANNEL_ID)
+            if not channel_commendations:
+                logging.warning(f"Commendations channel not found in guild {guild_id}. Attendance index will not be synced.")
+                return
 
-    def ensure_json_file_exists(self, file_path: str) -> None:
-        """Ensure the JSON file exists and initialize it if it doesn't."""
-        if not os.path.exists(file_path):
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)  # Create directory if necessary
-            with open(file_path, "w") as f:
-                json.dump({}, f, indent=4)  # Initialize with an empty dictionary
+            store = await self.attendance_stores.open(guild_id)
+            after = discord.Object(id=store.cursor) if store.backfilled and store.cursor else None
+            logging.info(f"Catching up attendance index of guild {guild_id}." if after else f"Backfilling attendance index of guild {guild_id} from full channel history.")
+
+            newest_message_id = store.cursor or 0
+            batch = []
+            async for message in channel_commendations.history(limit=None, after=after, oldest_first=True):
+                newest_message_id = max(newest_message_id, message.id)
+                batch.append((message.id, self.credited_member_ids(message, settings.OPERATION_KEYWORD)))
+                if len(batch) >= 100:
+                    await store.record_many(batch)
+                    batch.clear()
+            await store.record_many(batch)
+            await store.mark_backfilled(newest_message_id)
+            logging.info(f"Attendance index of guild {guild_id} is up to date.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.exception(f"Error while syncing attendance index of guild {guild_id}: {e}")
+        finally:
+            ready.set()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        store, operation_keyword = self.commendations_index(message.guild and message.guild.id, message.channel.id)
+        if store:
+            await store.record(message.id, self.credited_member_ids(message, operation_keyword))
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        store, operation_keyword = self.commendations_index(payload.guild_id, payload.channel_id)
+        if store and "content" in payload.data:
+            await store.record(payload.message_id, self.credited_member_ids(payload.message, operation_keyword))
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        store, _ = self.commendations_index(payload.guild_id, payload.channel_id)
+        if store:
+            await store.remove_many((payload.message_id,))
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        store, _ = self.commendations_index(payload.guild_id, payload.channel_id)
+        if store:
+            await store.remove_many(payload.message_ids)
 
     @discord.app_commands.command(name="no-show-report", description="Report a member for missing a scheduled operation.")
-    @discord.app_commands.guilds(config.GUILD_ID)
-    @discord.app_commands.checks.has_any_role(
-        config.UNIT_STAFF_ROLE_ID,
-        config.CURATOR_ROLE_ID,
-        config.ADVISOR_ROLE_ID
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role(
+        "UNIT_STAFF_ROLE_ID",
+        "CURATOR_ROLE_ID",
+        "ADVISOR_ROLE_ID"
     )
     async def no_show_report(
         self,
@@ -38,235 +200,463 @@ class NoShowTracking(commands.Cog):
         zeus: str
     ) -> None:
         """Report a no-show for a specific operation."""
-        try:
-            await interaction.response.defer(ephemeral=True)  # Acknowledge the interaction early
-
-            # Ensure JSON file exists
-            no_show_file_path = "Data/no_show_data.json"
-            self.ensure_json_file_exists(no_show_file_path)
-
-            # Load no-show data from JSON
-            with open(no_show_file_path, "r") as f:
-                no_show_data = json.load(f)
-
-            user_id = str(member.id)
-            current_time = datetime.now(timezone.utc).isoformat()
-
-            # If the user has no previous record, initialize their data
-            if user_id not in no_show_data:
-                no_show_data[user_id] = {
-                    "count": 0,
-                    "records": []  # Initialize an empty list for operation records
-                }
-
-            # Increment the no-show count and log operation details
-            no_show_data[user_id]["count"] += 1
-            no_show_data[user_id]["records"].append({
-                "operation_name": operation_name,
-                "date": current_time,
-                "zeus": zeus
-            })
-
-            # Save updated no-show data back to the JSON file
-            with open(no_show_file_path, "w") as f:
-                json.dump(no_show_data, f, indent=4)
-
-            # Notify the user via DM
-            try:
-                await member.send(
-                    embed=discord.Embed(
-                        title="No-Show Report",
-                        description=(
-                            f"You have been marked as a no-show for the operation **{operation_name}** "
-                            f"organized by **{zeus}**. Staff has been notified."
-                        ),
-                        color=discord.Color.red()
-                    ).set_footer(text="Please ensure you attend scheduled operations to avoid further actions.")
-                )
-            except discord.Forbidden:
-                logging.warning(f"Could not DM {member.display_name}. User has DMs disabled.")
+        guild_id = interaction.guild.id
+        limited = self.bot.rate_limits.hit(("no_show_report_by", f"{guild_id}:{interaction.user.id}"), ("no_show_report_of", f"{guild_id}:{member.id}"))
+        if limited:
+            rule, retry_after = limited
+            retry_at = discord.utils.format_dt(datetime.now(timezone.utc) + timedelta(seconds=retry_after), "R")
+            message = (
+                f"You have filed the most no-show reports allowed for now. You can report again {retry_at}."
+                if rule == "no_show_report_by" else
+                f"{member.display_name} has already been reported the most times allowed for now. Try again {retry_at}."
+            )
+            await interaction.response.send_message(message, ephemeral=True)
+            return
+
+        async with CommandRun(interaction, "no-show-report", ephemeral=True, error_message="An error occurred while processing the no-show report. Please try again later.") as run:
+            staff_channel_found = await self.report_no_shows(run, interaction, [member.id], operation_name, zeus)
 
-            # Notify staff in the configured channel
-            staff_advisor_channel = self.bot.get_channel(config.STAFF_ADVISOR_CHANNEL_ID)
-            if not staff_advisor_channel:
-                await interaction.followup.send(
+            if not staff_channel_found:
+                await run.send(
                     "Could not find the staff advisor channel. Please check the configuration.",
                     ephemeral=True
                 )
                 return
 
+            # Acknowledge success
+            await run.send(
+                f"Successfully reported {member.mention} as a no-show for **{operation_name}**.",
+                ephemeral=True
+            )
+
+    # ====================================
+    # Journaled No-Show Reporting. // Jack
+    # ====================================
+    async def report_no_shows(self, run: CommandRun, interaction: discord.Interaction, user_ids: list[int], operation_name: str, zeus: str) -> bool:
+        """Journal and carry out a no-show report for one or more members of the same operation."""
+        entry = await run.step("journal", self.bot.journal.begin("no_show", {
+            "guild_id": interaction.guild.id,
+            "user_ids": user_ids,
+            "operation_name": operation_name,
+            "zeus": zeus,
+            "reported_by": interaction.user.id
+        }, NO_SHOW_STEPS))
+        return await self.bot.journal.attempt(entry, self.carry_out_no_show(entry, run))
+
+    async def carry_out_no_show(self, entry, run: CommandRun = None) -> bool:
+        """Perform the pending steps of a journaled no-show report and return whether the staff channel was found."""
+        report = entry.payload
+        guild = self.bot.get_guild(report["guild_id"])
+        store = await self.no_show_stores.open(report["guild_id"])
+        step = run.step if run else (lambda name, awaitable: awaitable)
+        user_ids = report["user_ids"]
+        staff_channel_found = True
+
+        # Every record in one write, tagged with the action so a redo after a crash is a no-op
+        if "store" in entry.pending:
+            no_show_counts = await step("store", store.add_many(
+                user_ids, report["operation_name"], report["zeus"], report["reported_by"], entry.action_id
+            ))
+            await self.bot.journal.complete(entry, "store")
+        else:
+            no_show_counts = {user_id: store.count(user_id) for user_id in user_ids}
+
+        # DMs are queued, the dispatcher sends a few at a time
+        if "dms" in entry.pending:
+            members = await self.bot.handles.members(guild, user_ids)
+            deliveries = [
+                self.notify_no_show(member, report["operation_name"], report["zeus"])
+                for member in members.values()
+            ]
+            self.bot.journal.track(entry, "dms", asyncio.gather(*deliveries, return_exceptions=True))
+
+        # Queue the post to staff in the configured channel
+        if "staff_post" in entry.pending:
+            settings = self.bot.guild_configs.get(report["guild_id"])
+            staff_advisor_channel = settings and await self.bot.handles.channel(settings.STAFF_ADVISOR_CHANNEL_ID)
+            if staff_advisor_channel:
+                content, embeds = await self.no_show_staff_message(guild, report, no_show_counts)
+                self.bot.journal.track(entry, "staff_post", self.bot.outbound.enqueue(staff_advisor_channel, content, embeds=embeds))
+            else:
+                await self.bot.journal.complete(entry, "staff_post")
+                staff_channel_found = False
+
+        return staff_channel_found
+
+    async def no_show_staff_message(self, guild: discord.Guild, report: dict, no_show_counts: dict[int, int]):
+        """Build the staff advisor post for a report: one embed, plus an alert for anyone at the threshold."""
+        user_ids = report["user_ids"]
+        if len(user_ids) == 1:
             # Embed for tracking purposes
             embed = discord.Embed(
                 title="No-Show Report",
-                description=f"{member.mention} has been reported as a no-show.",
+                description=f"<@{user_ids[0]}> has been reported as a no-show.",
                 color=discord.Color.orange()
             )
-            embed.add_field(name="Operation Name", value=operation_name, inline=False)
-            embed.add_field(name="Zeus", value=zeus, inline=False)
-            embed.add_field(name="Reported By", value=interaction.user.mention, inline=False)
-            embed.add_field(name="No-Show Count", value=no_show_data[user_id]["count"], inline=False)
-            embed.set_footer(text="Staff may take further action as necessary.")
-            await staff_advisor_channel.send(embed=embed)
-
-            # Notify if 3 no-shows are reached
-            if no_show_data[user_id]["count"] >= 3:
-                staff_role = interaction.guild.get_role(config.UNIT_STAFF_ROLE_ID)
-                alert_embed = discord.Embed(
-                    title="Repeated No-Show Alert",
-                    description=(
-                        f"{member.mention} has missed **3 scheduled operations**. "
-                        f"This requires immediate attention."
-                    ),
-                    color=discord.Color.red()
-                )
-                alert_embed.set_footer(text="Please take the necessary actions to address this.")
-                await staff_advisor_channel.send(content=staff_role.mention, embed=alert_embed)
-
-            # Acknowledge success
-            await interaction.followup.send(
-                f"Successfully reported {member.mention} as a no-show for **{operation_name}**.",
-                ephemeral=True
+            embed.add_field(name="Operation Name", value=report["operation_name"], inline=False)
+            embed.add_field(name="Zeus", value=report["zeus"], inline=False)
+            embed.add_field(name="Reported By", value=f"<@{report['reported_by']}>", inline=False)
+            embed.add_field(name="No-Show Count", value=no_show_counts[user_ids[0]], inline=False)
+        else:
+            # One aggregated embed for the whole roster
+            embed = discord.Embed(
+                title="No-Show Report",
+                description=f"{len(user_ids)} members have been reported as no-shows.",
+                color=discord.Color.orange()
             )
-
-        except Exception as e:
-            logging.exception(f"Error in no_show_report command: {e}")
-            await interaction.followup.send(
-                "An error occurred while processing the no-show report. Please try again later.",
-                ephemeral=True
+            embed.add_field(name="Operation Name", value=report["operation_name"], inline=False)
+            embed.add_field(name="Zeus", value=report["zeus"], inline=False)
+            embed.add_field(name="Reported By", value=f"<@{report['reported_by']}>", inline=False)
+            member_lines = [f"<@{user_id}> (No-Show Count: {no_show_counts[user_id]})" for user_id in user_ids]
+            for i, chunk in enumerate(chunk_lines(member_lines)[:5]):  # Stay well inside the 6000 character embed limit
+                embed.add_field(name="Members" if i == 0 else "Members (cont.)", value=chunk, inline=False)
+        embed.set_footer(text="Staff may take further action as necessary.")
+        embeds = [embed]
+        content = None
+
+        # Attach an alert and ping staff if 3 no-shows are reached
+        repeated = [user_id for user_id in user_ids if no_show_counts[user_id] >= NO_SHOW_ALERT_THRESHOLD]
+        if repeated:
+            embeds.append(self.repeated_no_show_embed(repeated))
+            content = await self.staff_ping(guild)
+        return content, embeds
+
+    # ===============================
+    # Bulk No-Show Reporting. // Jack
+    # ===============================
+    def notify_no_show(self, member: discord.Member, operation_name: str, zeus: str) -> asyncio.Future:
+        """Queue a DM telling a member about their no-show. Members with DMs closed are only logged."""
+        return self.bot.outbound.enqueue(
+            member,
+            embed=discord.Embed(
+                title="No-Show Report",
+                description=(
+                    f"You have been marked as a no-show for the operation **{operation_name}** "
+                    f"organized by **{zeus}**. Staff has been notified."
+                ),
+                color=discord.Color.red()
+            ).set_footer(text="Please ensure you attend scheduled operations to avoid further actions.")
+        )
+
+    @staticmethod
+    def repeated_no_show_embed(user_ids: list[int]) -> discord.Embed:
+        if len(user_ids) == 1:
+            description = (
+                f"<@{user_ids[0]}> has missed **{NO_SHOW_ALERT_THRESHOLD} scheduled operations**. "
+                f"This requires immediate attention."
             )
+        else:
+            description = (
+                f"The following members have missed **{NO_SHOW_ALERT_THRESHOLD} or more scheduled operations**. "
+                f"This requires immediate attention.\n" + "\n".join(f"<@{user_id}>" for user_id in user_ids)
+            )[:4096]
+        alert_embed = discord.Embed(
+            title="Repeated No-Show Alert",
+            description=description,
+            color=discord.Color.red()
+        )
+        alert_embed.set_footer(text="Please take the necessary actions to address this.")
+        return alert_embed
+
+    async def staff_ping(self, guild: discord.Guild):
+        settings = self.bot.guild_configs.get(guild.id if guild else None)
+        staff_role = settings and await self.bot.handles.role(settings.UNIT_STAFF_ROLE_ID, guild)
+        return staff_role.mention if staff_role else None
+
+    async def parse_roster(self, guild: discord.Guild, roster: str) -> tuple[list[discord.Member], list[str]]:
+        """Resolve a pasted roster of mentions, IDs or names into members, plus the entries not found."""
+        entries = [entry.strip().lstrip("@") for entry in re.split(r"[\n,]", roster)]
+        entries = [entry for entry in entries if entry]
+        references = {entry: MEMBER_REFERENCE.match(entry) for entry in entries}
+        by_id = await self.bot.handles.members(guild, [int(reference.group(1)) for reference in references.values() if reference])
+
+        members, unresolved = {}, []
+        for entry in entries:
+            reference = references[entry]
+            if reference:
+                member = by_id.get(int(reference.group(1)))
+            else:
+                member = guild.get_member_named(entry)
+                if member is None:
+                    await self.search_members(guild, entry)
+                    member = guild.get_member_named(entry)
+            if member is None:
+                unresolved.append(entry)
+            else:
+                members[member.id] = member
+        return list(members.values()), unresolved
+
+    @staticmethod
+    async def search_members(guild: discord.Guild, name: str) -> None:
+        """Pull members whose name starts with ``name`` into the member cache."""
+        try:
+            await guild.query_members(query=name.partition("#")[0], limit=10)
+        except (discord.HTTPException, discord.ClientException, asyncio.TimeoutError) as e:
+            logging.warning(f"Could not search for member {name!r}: {e}")
+
+    class NoShowRosterModal(Modal):
+        def __init__(self, cog: "NoShowTracking", operation_name: str, zeus: str):
+            super().__init__(title="Bulk No-Show Report")
+            self.cog = cog
+            self.operation_name = operation_name
+            self.zeus = zeus
+
+            self.roster = TextInput(
+                label="Absent Members",
+                style=discord.TextStyle.paragraph,
+                placeholder="One member per line: @mention, user ID or server name.",
+                max_length=4000,
+                required=True
+            )
+            self.add_item(self.roster)
 
-    @discord.app_commands.command(name="no-show-stats", description="Display a leaderboard of no-show reports.")
-    @discord.app_commands.guilds(config.GUILD_ID)
-    @discord.app_commands.checks.has_any_role(
-        config.UNIT_STAFF_ROLE_ID,
-        config.CURATOR_ROLE_ID,
-        config.ZEUS_ROLE_ID,
-        config.ZEUSINTRAINING_ROLE_ID
+        async def on_submit(self, interaction: discord.Interaction):
+            await self.cog.submit_bulk_no_show_report(interaction, self.operation_name, self.zeus, self.roster.value)
+
+    @discord.app_commands.command(name="no-show-bulk-report", description="Report every member who missed the same operation at once.")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role(
+        "UNIT_STAFF_ROLE_ID",
+        "CURATOR_ROLE_ID",
+        "ADVISOR_ROLE_ID"
     )
-    async def no_show_leaderboard(self, interaction: discord.Interaction) -> None:
-        """Display stats for no-shows, including operations and dates."""
-        try:
-            await interaction.response.defer(ephemeral=False)  # Acknowledge the interaction
+    async def no_show_bulk_report(self, interaction: discord.Interaction, operation_name: str, zeus: str) -> None:
+        """Open a roster form for reporting several no-shows from one operation."""
+        await interaction.response.send_modal(NoShowTracking.NoShowRosterModal(self, operation_name, zeus))
+
+    async def submit_bulk_no_show_report(self, interaction: discord.Interaction, operation_name: str, zeus: str, roster: str) -> None:
+        async with CommandRun(interaction, "no-show-bulk-report", ephemeral=True, error_message="An error occurred while processing the no-show reports. Please try again later.") as run:
+            members, unresolved = await self.parse_roster(interaction.guild, roster)
+            if not members:
+                await run.send("None of the roster entries matched a member of this server.", ephemeral=True)
+                return
 
-            # Load no-show data from JSON
-            no_show_file_path = "Data/no_show_data.json"
-            self.ensure_json_file_exists(no_show_file_path)
+            staff_channel_found = await self.report_no_shows(run, interaction, [member.id for member in members], operation_name, zeus)
 
-            with open(no_show_file_path, "r") as f:
-                no_show_data = json.load(f)
+            summary = f"Successfully reported {len(members)} members as no-shows for **{operation_name}**."
+            if unresolved:
+                summary += "\nCould not find: " + ", ".join(unresolved)
+            if not staff_channel_found:
+                summary += "\nCould not find the staff advisor channel. Please check the configuration."
+            await run.send(summary[:2000], ephemeral=True)
+
+    @discord.app_commands.command(name="no-show-stats", description="Display a leaderboard of no-show reports.")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role(
+        "UNIT_STAFF_ROLE_ID",
+        "CURATOR_ROLE_ID",
+        "ZEUS_ROLE_ID",
+        "ZEUSINTRAINING_ROLE_ID"
+    )
+    @discord.app_commands.describe(window="Only count no-shows from this period.")
+    @discord.app_commands.choices(window=[
+        app_commands.Choice(name="All time", value=0),
+        app_commands.Choice(name="Last 30 days", value=30),
+        app_commands.Choice(name="Last 90 days", value=90)
+    ])
+    async def no_show_leaderboard(self, interaction: discord.Interaction, window: app_commands.Choice[int] = None) -> None:
+        """Display stats for no-shows, including operations and dates."""
+        async with CommandRun(interaction, "no-show-stats", error_message="An error occurred while generating the no-show stats. Please try again later.") as run:
+            days = window.value if window and window.value else None
+            store = await self.no_show_stores.open(interaction.guild.id)
+            leaderboard = store.leaderboard(days)
 
             # Check if there are any records
-            if not no_show_data:
-                await interaction.followup.send("No no-show records found.", ephemeral=True)
+            if not len(leaderboard):
+                await run.send("No no-show records found.", ephemeral=True)
                 return
 
-            # Build the embed for the leaderboard
-            embed = discord.Embed(
-                title="No-Show Leaderboard",
-                description="List of members with their no-show records (sorted by highest count):",
-                color=discord.Color.orange()
-            )
-
             guild = interaction.guild
-            sorted_no_shows = sorted(no_show_data.items(), key=lambda x: x[1]["count"], reverse=True)
-
-            for i, (user_id, data) in enumerate(sorted_no_shows[:10]):  # Limit to top 10
-                member = guild.get_member(int(user_id))
-                member_name = member.display_name if member else f"Unknown User ({user_id})"
-
-                # Ensure "records" exists in the user's data
-                records = data.get("records", [])
-                formatted_records = "\n".join(
-                    f"**{record['operation_name']}** on {datetime.fromisoformat(record['date']).strftime('%Y-%m-%d %H:%M:%S UTC')}"
-                    for record in records
-                ) if records else "No specific records found."
-
-                embed.add_field(
-                    name=f"{i + 1}. {member_name}",
-                    value=f"No-Show Count: {data['count']}\n\n{formatted_records}",
-                    inline=False
+            period = f" (Last {days} Days)" if days else ""
+
+            async def render(page: int) -> discord.Embed:
+                # Build the embed for one page of the leaderboard
+                embed = discord.Embed(
+                    title=f"No-Show Leaderboard{period}",
+                    description="List of members with their no-show records (sorted by highest count):",
+                    color=discord.Color.orange()
                 )
 
-            await interaction.followup.send(embed=embed)
-
-        except Exception as e:
-            logging.exception(f"Error in no_show_stats command: {e}")
-            await interaction.followup.send(
-                "An error occurred while generating the no-show stats. Please try again later.",
-                ephemeral=True
-            )
+                offset = page * LEADERBOARD_PAGE_SIZE
+                entries = leaderboard.page(offset, LEADERBOARD_PAGE_SIZE)
+                # Names for the whole page in at most one lookup
+                names = await self.bot.member_names.resolve(guild, [user_id for user_id, _ in entries])
+                for i, (user_id, count) in enumerate(entries, start=offset):
+                    member_name = names[user_id].name if user_id in names else f"Unknown User ({user_id})"
+
+                    records = store.records(user_id, days)
+                    shown = records[-LEADERBOARD_RECORDS_SHOWN:]
+                    formatted_records = "\n".join(
+                        f"**{record['operation_name'][:80]}** on {datetime.fromisoformat(record['date']).strftime('%Y-%m-%d %H:%M:%S UTC')}"
+                        for record in reversed(shown)
+                    ) if records else "No specific records found."
+                    if len(records) > len(shown):
+                        formatted_records += f"\n...and {len(records) - len(shown)} earlier."
+
+                    embed.add_field(
+                        name=f"{i + 1}. {member_name}",
+                        value=f"No-Show Count: {count}\n\n{formatted_records}"[:EMBED_FIELD_LIMIT],
+                        inline=False
+                    )
+                return embed
+
+            page_count = -(-len(leaderboard) // LEADERBOARD_PAGE_SIZE)
+            view = PaginatorView(interaction.user.id, page_count, render)
+            view.message = await run.send(embed=await view.first_page(), view=view if page_count > 1 else discord.utils.MISSING)
 
     # ===================================
     # Candidate Tracking Command. // Jack
     # ===================================
     @discord.app_commands.command(name="track-a-candidate", description="Track a candidate's progress through operations.")
-    @discord.app_commands.guilds(config.GUILD_ID)
-    @discord.app_commands.checks.has_any_role(config.UNIT_STAFF_ROLE_ID, config.CURATOR_ROLE_ID, config.ZEUS_ROLE_ID, config.ZEUSINTRAINING_ROLE_ID)
-    async def track_a_candidate(self, interaction: discord.Interaction, member: discord.Member) -> None:
-        await interaction.response.send_message(f"Tracking progress for {member.display_name}", ephemeral=True)
-
-        channel_commendations = self.bot.get_channel(config.COMMENDATIONS_CHANNEL_ID)
-        if not channel_commendations:
-            await interaction.followup.send("Commendations channel not found.", ephemeral=True)
-            return
-
-        operation_count = 1
-        most_recent_message_time = None
-
-        async for message in channel_commendations.history(limit=500):
-            if config.OPERATION_KEYWORD.lower() in message.content.lower() and member in message.mentions:
-                operation_count += 1
-                if most_recent_message_time is None or message.created_at > most_recent_message_time:
-                    most_recent_message_time = message.created_at
-
-        current_time = datetime.now(timezone.utc)
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role("UNIT_STAFF_ROLE_ID", "CURATOR_ROLE_ID", "ZEUS_ROLE_ID", "ZEUSINTRAINING_ROLE_ID")
+    @discord.app_commands.describe(operation_name="The operation they attended. Leave empty to allow one tracking per day.")
+    async def track_a_candidate(self, interaction: discord.Interaction, member: discord.Member, operation_name: str = None) -> None:
+        async with CommandRun(interaction, "track-a-candidate", ephemeral=True) as run:
+            guild = interaction.guild
+            settings = self.bot.guild_configs[guild.id]
+            channel_commendations = await self.bot.handles.channel(settings.COMMENDATIONS_CHANNEL_ID)
+            if not channel_commendations:
+                await run.send("Commendations channel not found.", ephemeral=True)
+                return
 
-        if most_recent_message_time and current_time - most_recent_message_time < timedelta(seconds=1):
-            await interaction.followup.send("Error code CCT-0004: Member has already been tracked for this operation. Please try again later.", ephemeral=True)
-            logging.debug("Skip tracking due to recent message.")
-            return
+            ready = self.attendance_ready.get(guild.id)
+            if ready is None or not ready.is_set():
+                await run.send("Error code CCT-0005: The attendance index is still being built. Please try again shortly.", ephemeral=True)
+                return
 
-        if operation_count >= config.TOTAL_OPERATIONS:
-            guild = interaction.guild
-            unit_staff_role = guild.get_role(config.UNIT_STAFF_ROLE_ID)
+            candidate = (guild.id, member.id)
+            tracking_keys = await self.tracking_keys.open(guild.id)
+            # Trackings of the same candidate queue up behind each other, different candidates run in parallel
+            async with self.tracking_lock(candidate):
+                # Claimed before counting, so concurrent or repeated trackings of one operation post once
+                key = self.tracking_key(member.id, operation_name)
+                if not await tracking_keys.claim(key):
+                    await run.send("Error code CCT-0004: Member has already been tracked for this operation.", ephemeral=True)
+                    return
+
+                try:
+                    # Count this operation plus every one already recorded, including progress posts still queued
+                    operation_count = self.tracked_operation_count(candidate) + 1
+                    text_message, embed = await self.candidate_progress_message(guild, member, operation_count)
+                except Exception:
+                    await tracking_keys.release(key)
+                    raise
+
+                # Progress text and embed go out as one queued message, counted as pending until it is indexed
+                post = self.bot.outbound.enqueue(channel_commendations, text_message, embed=embed)
+                self._unindexed_posts.setdefault(candidate, {})[post] = asyncio.create_task(self.index_progress_post(candidate, key, post))
+
+            await run.send(f"Tracked progress for {member.display_name}.", ephemeral=True)
+
+    def tracking_lock(self, candidate: tuple[int, int]) -> asyncio.Lock:
+        lock = self._tracking_locks.get(candidate)
+        if lock is None:
+            lock = self._tracking_locks[candidate] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def tracking_key(member_id: int, operation_name: str = None) -> str:
+        """Idempotency key for tracking one candidate at one operation, (member, operation, date)."""
+        operation = " ".join((operation_name or "").lower().split())
+        return f"{member_id}:{operation}:{datetime.now(timezone.utc).date().isoformat()}"
+
+    def tracked_operation_count(self, candidate: tuple[int, int]) -> int:
+        """Attendance messages indexed for a candidate plus progress posts of theirs not indexed yet."""
+        guild_id, member_id = candidate
+        store = self.attendance_stores[guild_id]
+        unindexed = 0
+        for post in self._unindexed_posts.get(candidate, ()):
+            if not post.done():
+                unindexed += 1
+            elif not post.cancelled() and post.exception() is None and not store.credits(member_id, post.result().id):
+                unindexed += 1  # Sent, but neither its gateway echo nor index_progress_post has indexed it yet.
+        return store.count(member_id) + unindexed
+
+    async def index_progress_post(self, candidate: tuple[int, int], key: str, post: asyncio.Future) -> None:
+        """Index a progress post once it is sent, without waiting for its gateway echo."""
+        guild_id, _ = candidate
+        try:
+            message = await post
+        except Exception:
+            # Never posted, so it should neither count nor block tracking again. The dispatcher logs why.
+            await self.tracking_keys[guild_id].release(key)
+        else:
+            await self.attendance_stores[guild_id].record(message.id, self.credited_member_ids(message, self.bot.guild_configs[guild_id].OPERATION_KEYWORD))
+        finally:
+            posts = self._unindexed_posts.get(candidate, {})
+            posts.pop(post, None)
+            if not posts:
+                self._unindexed_posts.pop(candidate, None)
+
+    async def candidate_progress_message(self, guild: discord.Guild, member: discord.Member, operation_count: int) -> tuple[str, discord.Embed]:
+        settings = self.bot.guild_configs[guild.id]
+        total_operations = settings.TOTAL_OPERATIONS
+        if operation_count >= total_operations:
+            unit_staff_role = await self.bot.handles.role(settings.UNIT_STAFF_ROLE_ID, guild)
 
             text_message = (
                 f"{member.mention}, after demonstrating valour and dedication across {operation_count} successful deployments, "
                 f"you’ve proven yourself an asset to this unit.\n\nWelcome to Sigma. Your journey has just begun.\n\n"
                 f"{member.mention}, it is now time for your assessment with {unit_staff_role.mention}."
             )
-            await channel_commendations.send(text_message)
 
             embed = discord.Embed(
                 title="Candidate Progress Update",
                 color=discord.Color.green()
             )
             embed.add_field(name="Candidate", value=member.mention, inline=False)
-            embed.add_field(name="Progress", value=f"{operation_count}/{config.TOTAL_OPERATIONS} operations completed.", inline=False)
+            embed.add_field(name="Progress", value=f"{operation_count}/{total_operations} operations completed.", inline=False)
             embed.add_field(name="Status", value="**Promoted to Sigma Associate**", inline=False)
             embed.set_footer(text="Congratulations on your outstanding achievement!")
 
-            await channel_commendations.send(embed=embed)
-
         else:
-            remaining_ops = config.TOTAL_OPERATIONS - operation_count
+            remaining_ops = total_operations - operation_count
 
             text_message = (
-                f"{member.mention} has attended an operation and is on their way to becoming a Sigma Associate. "
+                # Built from the guild's keyword, this post is what credits the attendance
+                f"{member.mention} {settings.OPERATION_KEYWORD} and is on their way to becoming a Sigma Associate. "
                 f"They have {remaining_ops} operations left."
             )
-            await channel_commendations.send(text_message)
 
             embed = discord.Embed(
                 title="Candidate Progress Update",
                 color=discord.Color.blue()
             )
             embed.add_field(name="Candidate", value=member.mention, inline=False)
-            embed.add_field(name="Progress", value=f"{operation_count}/{config.TOTAL_OPERATIONS} operations completed.", inline=False)
+            embed.add_field(name="Progress", value=f"{operation_count}/{total_operations} operations completed.", inline=False)
             embed.add_field(name="Remaining Operations", value=f"{remaining_ops} left.", inline=False)
             embed.set_footer(text="Keep up the great work!")
 
-            await channel_commendations.send(embed=embed)
+        return text_message, embed
+
+    # ========================================
+    # Operation and Zeus Autocomplete. // Jack
+    # ========================================
+    def name_indexes(self, guild_id: int, kind: str) -> list[PrefixIndex]:
+        """The guild's ``operations`` or ``zeuses`` indexes, from the no-show records and the ZiT feedback archive."""
+        indexes = []
+        store = self.no_show_stores.get(guild_id)
+        if store:
+            indexes.append(getattr(store, kind))
+        feedback = self.bot.get_cog("FeedbackCommands")
+        archive = feedback.archives.get(guild_id) if feedback else None
+        if archive:
+            indexes.append(getattr(archive, kind))
+        return indexes
+
+    @no_show_report.autocomplete("operation_name")
+    @no_show_bulk_report.autocomplete("operation_name")
+    @track_a_candidate.autocomplete("operation_name")
+    async def operation_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        names = suggest(current, *self.name_indexes(interaction.guild_id, "operations"))
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names]
+
+    @no_show_report.autocomplete("zeus")
+    @no_show_bulk_report.autocomplete("zeus")
+    async def zeus_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        names = suggest(current, *self.name_indexes(interaction.guild_id, "zeuses"))
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names]
 
 # Cog setup function
 async def setup(bot: commands.Bot) -> None:
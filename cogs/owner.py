@@ -0,0 +1,120 @@
+#=================
+# Imports. // Jack
+#=================
+import discord
+import config
+from discord.ext import commands
+from discord import app_commands
+from utils.command_runner import CommandRun
+
+RELOAD_ALL = "all"
+RELOAD_CONFIG = "config"
+
+
+async def is_owner(interaction: discord.Interaction) -> bool:
+    return await interaction.client.is_owner(interaction.user)
+
+#===================
+# Cog Setup. // Jack
+#===================
+class Owner(commands.Cog):
+    """Bot maintenance commands, usable only by the application owner."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        super().__init__()
+        self.bot = bot
+
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        if isinstance(error, app_commands.CheckFailure) and not interaction.response.is_done():
+            await interaction.response.send_message("Only the bot owner can use this command.", ephemeral=True)
+            return
+        raise error
+
+    #====================
+    # Hot Reload. // Jack
+    #====================
+    @app_commands.command(name="reload", description="Reload a cog, every cog, or config.py without restarting")
+    @app_commands.guilds(config.GUILD_ID)
+    @app_commands.check(is_owner)
+    @app_commands.describe(target="A cog name, \"all\" for every cog, or \"config\" for config.py and every cog.")
+    async def reload(self, interaction: discord.Interaction, target: str = RELOAD_ALL) -> None:
+        async with CommandRun(interaction, "reload", ephemeral=True, error_message="An unexpected error occurred while reloading.") as run:
+            reloader = self.bot.reloader
+            if target == RELOAD_CONFIG:
+                results = await run.step("reload", reloader.reload(reload_config=True))
+            elif target == RELOAD_ALL:
+                results = await run.step("reload", reloader.reload(reloader.cog_extensions(self.bot)))
+            else:
+                results = await run.step("reload", reloader.reload([f"cogs.{target}"]))
+
+            lines = [
+                f"✅ `{name}`" if error is None else f"❌ `{name}`: {error}"
+                for name, error in results.items()
+            ]
+            await run.send(
+                f"Reloaded in {run.timings['reload'] * 1000:.0f} ms.\n" + "\n".join(lines),
+                ephemeral=True
+            )
+
+    @reload.autocomplete("target")
+    async def reload_target_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        names = [RELOAD_ALL, RELOAD_CONFIG] + [extension.split(".", 1)[1] for extension in self.bot.reloader.cog_extensions(self.bot)]
+        return [app_commands.Choice(name=name, value=name) for name in names if current.lower() in name.lower()][:25]
+
+    #===================
+    # Bot Stats. // Jack
+    #===================
+    @app_commands.command(name="bot-stats", description="Command latency, REST usage and gateway health")
+    @app_commands.guilds(config.GUILD_ID)
+    @app_commands.check(is_owner)
+    async def show_bot_stats(self, interaction: discord.Interaction) -> None:
+        metrics = self.bot.metrics
+        embed = discord.Embed(title="Bot Stats", color=discord.Color.blurple())
+
+        def ms(value) -> str:
+            return "-" if value is None else f"≤{value:g}ms" if value != float("inf") else ">30s"
+
+        lines = []
+        for name, stats in metrics.slowest_commands():
+            line = (
+                f"`/{name}` ×{stats.latency.count}: p50 {ms(stats.latency.quantile(0.5))}, "
+                f"p95 {ms(stats.latency.quantile(0.95))}, {stats.rest_calls / stats.latency.count:.1f} REST/call"
+            )
+            if stats.errors:
+                line += f", {stats.errors} errors"
+            slowest = metrics.slowest_step(name)
+            if slowest:
+                line += f", slowest step `{slowest[0]}` ({slowest[1].mean():.0f}ms avg)"
+            lines.append(line)
+        embed.add_field(name="Commands (slowest p95 first)", value="\n".join(lines)[:1024] or "No commands run yet.", inline=False)
+
+        busiest = "\n".join(f"{method} `{route}`: {count}" for (method, route), count in metrics.rest_requests.most_common(5))
+        embed.add_field(
+            name="REST",
+            value=f"{sum(metrics.rest_requests.values())} requests, {metrics.rate_limited} rate limited (429)\n{busiest}"[:1024],
+            inline=False
+        )
+
+        gateway = metrics.gateway_latency
+        embed.add_field(
+            name="Gateway",
+            value=(
+                f"Now {self.bot.latency * 1000:.0f}ms, p50 {ms(gateway.quantile(0.5))}, p95 {ms(gateway.quantile(0.95))}\n"
+                f"Shards {', '.join(str(shard_id) for shard_id in sorted(self.bot.shards))} of {self.bot.shard_count}, "
+                f"{len(self.bot.guilds)} guilds"
+            ),
+            inline=False
+        )
+        outbound = self.bot.outbound.stats()
+        embed.add_field(
+            name="Outbound Queue",
+            value=", ".join(f"{key}: {value}" for key, value in outbound.items())[:1024],
+            inline=False
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+#=================
+# Cog End. // Jack
+#=================
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Owner(bot))
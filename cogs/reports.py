@@ -0,0 +1,178 @@
+#=================
+# Imports. // Jack
+#=================
+import discord
+import config
+from datetime import datetime, timedelta, timezone
+from discord.ext import commands
+from discord import app_commands
+from discord.ui import Modal, TextInput
+from utils.command_runner import CommandRun
+from utils.pagination import PaginatorView
+from storage.report_store import LEGACY_REPORTS_DIR, REPORT_LOG_PATH, ReportStore
+from storage.partitions import GuildPartitions, guild_path
+from utils.guild_config import has_any_guild_role
+
+REPORTS_PAGE_SIZE = 5
+
+#===================
+# Cog Setup. // Jack
+#===================
+class Reports(commands.Cog):
+    def __init__(self, bot: commands.Bot) -> None:
+        super().__init__()
+        self.bot = bot
+        self.report_stores = GuildPartitions(
+            lambda guild_id: ReportStore(guild_path(guild_id, REPORT_LOG_PATH), guild_path(guild_id, LEGACY_REPORTS_DIR)),
+            adopt=(REPORT_LOG_PATH, LEGACY_REPORTS_DIR)
+        )
+
+    async def cog_load(self) -> None:
+        carried = self.bot.reloader.take_over(self)
+        if carried:
+            self.report_stores = carried["report_stores"]
+        # Index each guild's report file (and migrate the old Reports/*.json files) without blocking the gateway.
+        await self.report_stores.load(self.bot.owned_guild_ids)
+
+    async def cog_unload(self) -> None:
+        if not self.bot.reloader.carry_over(self, report_stores=self.report_stores):
+            await self.report_stores.close()
+
+    #========================
+    # Filing Reports. // Jack
+    #========================
+    class ReportModal(Modal):
+        def __init__(self, cog: "Reports", target: discord.Member = None):
+            super().__init__(title="File a Report")
+            self.cog = cog
+            self.target = target
+
+            self.summary = TextInput(
+                label="Summary",
+                style=discord.TextStyle.short,
+                placeholder="What happened, in one line",
+                max_length=200,
+                required=True
+            )
+            self.findings = TextInput(
+                label="Findings",
+                style=discord.TextStyle.paragraph,
+                placeholder="Details, evidence links and anything staff should know",
+                max_length=1024,
+                required=True
+            )
+            self.add_item(self.summary)
+            self.add_item(self.findings)
+
+        async def on_submit(self, interaction: discord.Interaction):
+            await self.cog.file_report(interaction, self.target, self.summary.value, self.findings.value)
+
+    @discord.app_commands.command(name="report", description="File a report for unit staff")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @discord.app_commands.describe(target="The member this report is about, if any.")
+    async def report(self, interaction: discord.Interaction, target: discord.Member = None):
+        await interaction.response.send_modal(Reports.ReportModal(self, target))
+
+    async def file_report(self, interaction: discord.Interaction, target: discord.Member, summary: str, findings: str) -> None:
+        async with CommandRun(interaction, "report", ephemeral=True, error_message="An unexpected error occurred while filing your report.") as run:
+            store = await self.report_stores.open(interaction.guild.id)
+            report = await run.step("store", store.add(
+                interaction.id,
+                interaction.user.id,
+                interaction.user.name,
+                target.id if target else None,
+                summary,
+                [{"name": "Findings", "value": findings}]
+            ))
+
+            report_log_channel = await self.bot.handles.channel(self.bot.guild_configs[interaction.guild.id].REPORT_LOG_CHANNEL_ID)
+            if report_log_channel:
+                embed = self.report_embed(report)
+                self.bot.outbound.enqueue(report_log_channel, embed=embed)
+
+            await run.send(f"Thank you, your report has been filed as **#{report['id']}**.", ephemeral=True)
+
+    @staticmethod
+    def report_embed(report: dict) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"Report #{report['id']}",
+            description=report["summary"],
+            color=discord.Color.dark_red(),
+            timestamp=datetime.fromtimestamp(report["created_at"], timezone.utc)
+        )
+        embed.add_field(name="Author", value=f"<@{report['author_id']}>", inline=True)
+        if report.get("target_id"):
+            embed.add_field(name="About", value=f"<@{report['target_id']}>", inline=True)
+        for field in report["fields"]:
+            embed.add_field(name=field["name"], value=field["value"][:1024], inline=False)
+        return embed
+
+    #=========================
+    # Finding Reports. // Jack
+    #=========================
+    async def send_report_pages(self, run: CommandRun, store: ReportStore, title: str, offsets: list[int]) -> None:
+        if not offsets:
+            await run.send("No reports found.", ephemeral=True)
+            return
+
+        async def render(page: int) -> discord.Embed:
+            # Only the reports on this page are read from disk
+            reports = await store.read(offsets[page * REPORTS_PAGE_SIZE:(page + 1) * REPORTS_PAGE_SIZE])
+            embed = discord.Embed(
+                title=title,
+                description=f"{len(offsets)} reports, newest first.",
+                color=discord.Color.dark_red()
+            )
+            for report in reports:
+                created_at = discord.utils.format_dt(datetime.fromtimestamp(report["created_at"], timezone.utc), style="d")
+                about = f" about <@{report['target_id']}>" if report.get("target_id") else ""
+                details = "\n".join(f"**{field['name']}:** {field['value'][:300]}" for field in report["fields"])
+                embed.add_field(
+                    name=f"#{report['id']}: {report['summary'][:200]}",
+                    value=f"By <@{report['author_id']}>{about} on {created_at}\n{details}"[:1024],
+                    inline=False
+                )
+            return embed
+
+        page_count = -(-len(offsets) // REPORTS_PAGE_SIZE)
+        view = PaginatorView(run.interaction.user.id, page_count, render)
+        view.message = await run.send(embed=await view.first_page(), view=view if page_count > 1 else discord.utils.MISSING, ephemeral=True)
+
+    @discord.app_commands.command(name="report-search", description="Search reports by author, target and time range")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role("UNIT_STAFF_ROLE_ID", "CURATOR_ROLE_ID", "ADVISOR_ROLE_ID")
+    @discord.app_commands.describe(
+        author="Only reports filed by this member.",
+        target="Only reports about this member.",
+        days="Only reports from the last this many days."
+    )
+    async def report_search(
+        self,
+        interaction: discord.Interaction,
+        author: discord.User = None,
+        target: discord.User = None,
+        days: app_commands.Range[int, 1, 3650] = None
+    ):
+        async with CommandRun(interaction, "report-search", ephemeral=True, error_message="An unexpected error occurred while searching reports.") as run:
+            since = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp() if days else None
+            store = await self.report_stores.open(interaction.guild.id)
+            offsets = store.search(
+                author_id=author.id if author else None,
+                target_id=target.id if target else None,
+                since=since
+            )
+            await self.send_report_pages(run, store, "Report Search", offsets)
+
+    @discord.app_commands.command(name="report-list", description="List the most recent reports")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role("UNIT_STAFF_ROLE_ID", "CURATOR_ROLE_ID", "ADVISOR_ROLE_ID")
+    async def report_list(self, interaction: discord.Interaction):
+        async with CommandRun(interaction, "report-list", ephemeral=True, error_message="An unexpected error occurred while listing reports.") as run:
+            store = await self.report_stores.open(interaction.guild.id)
+            await self.send_report_pages(run, store, "Reports", store.search())
+
+#=================
+# Cog End. // Jack
+#=================
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Reports(bot))
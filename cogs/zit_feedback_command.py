@@ -1,13 +1,28 @@
 #=================
 # Imports. // Jack
 #=================
+import re
+import asyncio
 import discord
 import config
 import secret
 import logging
+from datetime import datetime
 from discord.ext import commands
 from discord import app_commands
-from discord.ui import Modal, TextInput, Select, View
+from discord.ui import Modal, TextInput, Select, View, DynamicItem
+from utils.command_runner import CommandRun
+from storage.draft_store import DRAFT_LOG_PATH, DraftStore
+from storage.feedback_store import FEEDBACK_LOG_PATH, FeedbackArchive
+from storage.partitions import GuildPartitions, guild_path
+from utils.guild_config import has_any_guild_role
+from storage.executor import run_blocking
+from utils.pagination import PaginatorView
+
+FEEDBACK_TITLE = "**Zeus in Training Feedback Submission**"
+FEEDBACK_DESCRIPTION = re.compile(r"Feedback for <@!?(\d+)> submitted by <@!?(\d+)>")
+HISTORY_PAGE_SIZE = 5
+FEEDBACK_STEPS = ("post", "archive")  # Journaled side effects of a finished submission.
 
 #===================
 # Cog Setup. // Jack
@@ -16,11 +31,39 @@ class FeedbackCommands(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
+        self.drafts = DraftStore(bot.process_path(DRAFT_LOG_PATH))  # Drafts are short-lived and keyed by interaction ID, so one store serves every guild.
+        self.archives = GuildPartitions(lambda guild_id: FeedbackArchive(guild_path(guild_id, FEEDBACK_LOG_PATH)), adopt=(FEEDBACK_LOG_PATH,))
+        self._import_tasks: dict[int, asyncio.Task] = {}  # By guild ID.
+
+    async def cog_load(self) -> None:
+        carried = self.bot.reloader.take_over(self)
+        if carried:
+            self.drafts, self.archives = carried["drafts"], carried["archives"]
+        else:
+            await run_blocking(self.drafts.load)
+        await self.archives.load(self.bot.owned_guild_ids)
+        # Submissions from here on are archived live, the cut-off is kept from the first load so a resumed import ends at the same post
+        before = discord.utils.time_snowflake(discord.utils.utcnow())
+        for guild_id, archive in self.archives.items():
+            if not archive.imported:
+                cutoff = await archive.start_import(before)
+                self._import_tasks[guild_id] = asyncio.create_task(self.import_feedback_history(guild_id, cutoff))
+        self.bot.journal.register("zit_feedback", self.carry_out_feedback)
+        # One registration serves the recommendation dropdown of every pending draft, including after a restart
+        self.bot.add_dynamic_items(FeedbackCommands.RecommendationSelect)
+
+    async def cog_unload(self) -> None:
+        for task in self._import_tasks.values():
+            task.cancel()
+        self.bot.remove_dynamic_items(FeedbackCommands.RecommendationSelect)
+        if not self.bot.reloader.carry_over(self, drafts=self.drafts, archives=self.archives):
+            await self.drafts.close()
+            await self.archives.close()
 
     # Step 1: Command for ZiT Feedback
     @discord.app_commands.command(name="zit-feedback", description="Submit feedback for a Zeus in Training")
-    @discord.app_commands.guilds(config.GUILD_ID)
-    @discord.app_commands.checks.has_any_role(config.CURATOR_ROLE_ID, config.ZEUS_ROLE_ID)
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role("CURATOR_ROLE_ID", "ZEUS_ROLE_ID")
     async def zit_feedback(self, interaction: discord.Interaction, person: discord.Member):
         try:
             # Log the feedback target selection
@@ -66,70 +109,234 @@ class FeedbackCommands(commands.Cog):
             self.add_item(self.improvement_points)
 
         async def on_submit(self, interaction: discord.Interaction):
-            # Create the initial embed based on modal input
-            embed = discord.Embed(
-                title="**Zeus in Training Feedback Submission**",
-                description=f"Feedback for {self.person.mention} submitted by {interaction.user.mention}",
-                color=discord.Color.purple()
+            # Park the modal input as a draft keyed by this submission, the dropdown carries the key
+            cog = self.bot.get_cog("FeedbackCommands")
+            await cog.drafts.put(
+                interaction.id,
+                interaction.user.id,
+                self.person.id,
+                self.operation_name.value,
+                self.positive_points.value,
+                self.improvement_points.value
             )
-            embed.add_field(name="Operation Name & Date", value=self.operation_name.value, inline=False)
-            embed.add_field(name="Things Done Well", value=self.positive_points.value, inline=False)
-            embed.add_field(name="Points for Improvement", value=self.improvement_points.value, inline=False)
 
             # Present the dropdown for recommendation
-            view = FeedbackCommands.RecommendationSelectView(self.bot, self.person, embed)
+            view = View(timeout=None)
+            view.add_item(FeedbackCommands.RecommendationSelect(interaction.id))
             await interaction.response.send_message(
                 content="Please select your recommendation for this Zeus in Training at this stage. Please reference the #zeus-guidelines",
                 view=view,
                 ephemeral=True
             )
 
-    # Step 3: Recommendation Dropdown View
-    class RecommendationSelectView(View):
-        def __init__(self, bot: commands.Bot, person: discord.Member, embed: discord.Embed):
-            super().__init__()
-            self.bot = bot
-            self.person = person
-            self.embed = embed
-
-            # Dropdown for Yes/No recommendation
-            self.recommendation_select = Select(
-                placeholder="Would you recommend the ZiT for full Zeus tags?",
-                options=[
-                    discord.SelectOption(label="Yes", description="Recommend for full Zeus tags"),
-                    discord.SelectOption(label="No", description="Do not recommend for full Zeus tags"),
-                ]
+    # Step 3: Recommendation Dropdown
+    class RecommendationSelect(DynamicItem[Select], template=r"zit-feedback:recommend:(?P<draft_id>\d+)"):
+        """Yes/No dropdown whose custom_id carries the draft ID, so it keeps working after a restart."""
+        def __init__(self, draft_id: int):
+            super().__init__(
+                Select(
+                    custom_id=f"zit-feedback:recommend:{draft_id}",
+                    placeholder="Would you recommend the ZiT for full Zeus tags?",
+                    options=[
+                        discord.SelectOption(label="Yes", description="Recommend for full Zeus tags"),
+                        discord.SelectOption(label="No", description="Do not recommend for full Zeus tags"),
+                    ]
+                )
             )
-            self.recommendation_select.callback = self.recommendation_select_callback
-            self.add_item(self.recommendation_select)
+            self.draft_id = draft_id
 
-        async def recommendation_select_callback(self, interaction: discord.Interaction):
-            # Add the recommendation to the embed
-            recommendation = self.recommendation_select.values[0]
-            self.embed.add_field(
-                name="Recommendation for Full Zeus Tags",
-                value=f"**{recommendation}**",
-                inline=False
+        @classmethod
+        async def from_custom_id(cls, interaction: discord.Interaction, item: Select, match):
+            return cls(int(match["draft_id"]))
+
+        async def callback(self, interaction: discord.Interaction):
+            cog = interaction.client.get_cog("FeedbackCommands")
+            await cog.finalize_feedback(interaction, self.draft_id, self.item.values[0])
+
+    # Step 4: Post the finished feedback
+    async def finalize_feedback(self, interaction: discord.Interaction, draft_id: int, recommendation: str) -> None:
+        draft = self.drafts.get(draft_id)
+        if draft is None or draft.author_id != interaction.user.id:
+            await interaction.response.edit_message(
+                content="This feedback draft has expired. Please submit it again with /zit-feedback.",
+                view=None
             )
+            return
+
+        target = self.bot.member_names.get(draft.target_id, interaction.guild)
 
-            # Fetch feedback channel
-            feedback_channel = await self.bot.fetch_channel(config.ZEUS_FEEDBACK_CHANNEL_ID)
+        # Acknowledge the selection first, the channel post happens after
+        async with CommandRun(interaction, "zit-feedback", ephemeral=True, thinking=False, error_message="An unexpected error occurred while processing your feedback."):
+            entry = await self.bot.journal.begin("zit_feedback", {
+                "id": draft_id,
+                "guild_id": interaction.guild.id,
+                "target_id": draft.target_id,
+                "author_id": draft.author_id,
+                "author_name": interaction.user.display_name,
+                "target_name": target.name if target else None,
+                "operation": draft.operation,
+                "positives": draft.positives,
+                "improvements": draft.improvements,
+                "recommendation": recommendation,
+                "date": discord.utils.utcnow().isoformat()
+            }, FEEDBACK_STEPS)
+            posted = await self.bot.journal.attempt(entry, self.carry_out_feedback(entry))
 
-            # Send the feedback embed to the channel
-            await feedback_channel.send(
+            # Acknowledge to the user
+            await interaction.edit_original_response(
                 content=(
-                    f"<@&{config.CURATOR_ROLE_ID}>, this feedback is awaiting your review.\n"
-                    f"{interaction.user.mention} has provided feedback for {self.person.mention}"
+                    "Thank you for the feedback! Your recommendation has been recorded."
+                    if posted else
+                    "Your recommendation has been recorded, but the feedback channel was not found. Please check the configuration."
                 ),
-                embed=self.embed
+                view=None
             )
 
-            # Acknowledge to the user
-            await interaction.response.edit_message(
-                content="Thank you for the feedback! Your recommendation has been recorded.",
-                view=None
+    async def carry_out_feedback(self, entry) -> bool:
+        """Post and archive a journaled submission, skipping whichever of the two already happened, and return whether the feedback channel was found."""
+        submission = entry.payload
+        guild_id = submission.get("guild_id", config.GUILD_ID)  # Entries journaled before the bot served several guilds.
+        settings = self.bot.guild_configs[guild_id]
+        channel_found = True
+        if "post" in entry.pending:
+            # Rebuild the embed from the submission and add the recommendation
+            embed = discord.Embed(
+                title="**Zeus in Training Feedback Submission**",
+                description=f"Feedback for <@{submission['target_id']}> submitted by <@{submission['author_id']}>",
+                color=discord.Color.purple()
+            )
+            embed.add_field(name="Operation Name & Date", value=submission["operation"], inline=False)
+            embed.add_field(name="Things Done Well", value=submission["positives"], inline=False)
+            embed.add_field(name="Points for Improvement", value=submission["improvements"], inline=False)
+            embed.add_field(
+                name="Recommendation for Full Zeus Tags",
+                value=f"**{submission['recommendation']}**",
+                inline=False
+            )
+
+            # Look up feedback channel
+            feedback_channel = await self.bot.handles.channel(settings.ZEUS_FEEDBACK_CHANNEL_ID)
+
+            # Queue the feedback embed for the channel
+            if feedback_channel:
+                self.bot.journal.track(entry, "post", self.bot.outbound.enqueue(
+                    feedback_channel,
+                    content=(
+                        f"<@&{settings.CURATOR_ROLE_ID}>, this feedback is awaiting your review.\n"
+                        f"<@{submission['author_id']}> has provided feedback for <@{submission['target_id']}>"
+                    ),
+                    embed=embed
+                ))
+            else:
+                logging.warning(f"Feedback channel not found in guild {guild_id}. ZiT feedback will only be archived.")
+                await self.bot.journal.complete(entry, "post")
+                channel_found = False
+
+        if "archive" in entry.pending:
+            archive = await self.archives.open(guild_id)
+            await archive.add(submission)
+            await self.drafts.drop(submission["id"])
+            await self.bot.journal.complete(entry, "archive")
+
+        return channel_found
+
+    #==========================
+    # Feedback History. // Jack
+    #==========================
+    async def import_feedback_history(self, guild_id: int, before: int) -> None:
+        """One-time backfill of a guild's archive from its feedback channel's existing posts."""
+        try:
+            await self.bot.wait_until_ready()
+            if self.bot.get_guild(guild_id) is None:
+                return  # Served by another process's shards.
+            feedback_channel = await self.bot.handles.channel(self.bot.guild_configs[guild_id].ZEUS_FEEDBACK_CHANNEL_ID)
+            if not feedback_channel:
+                logging.warning(f"Feedback channel not found in guild {guild_id}. ZiT feedback history will not be imported.")
+                return
+
+            submissions = []
+            async for message in feedback_channel.history(limit=None, before=discord.Object(id=before)):
+                submission = self.parse_feedback_message(message)
+                if submission:
+                    submissions.append(submission)
+
+            archive = self.archives[guild_id]
+            await archive.add_many(submissions)
+            await archive.mark_imported()
+            logging.info(f"Imported {len(submissions)} ZiT feedback submissions from the channel history of guild {guild_id}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.exception(f"Error while importing ZiT feedback history of guild {guild_id}: {e}")
+
+    def parse_feedback_message(self, message: discord.Message):
+        """Turn one of our feedback posts back into an archive record, or None."""
+        if message.author.id != self.bot.user.id or not message.embeds:
+            return None
+        embed = message.embeds[0]
+        match = FEEDBACK_DESCRIPTION.search(embed.description or "")
+        if embed.title != FEEDBACK_TITLE or not match:
+            return None
+
+        fields = {field.name: field.value for field in embed.fields}
+        names = {user.id: user.display_name for user in message.mentions}
+        target_id, author_id = int(match.group(1)), int(match.group(2))
+        return {
+            "id": message.id,
+            "target_id": target_id,
+            "author_id": author_id,
+            "author_name": names.get(author_id),
+            "target_name": names.get(target_id),
+            "operation": fields.get("Operation Name & Date", ""),
+            "positives": fields.get("Things Done Well", ""),
+            "improvements": fields.get("Points for Improvement", ""),
+            "recommendation": fields.get("Recommendation for Full Zeus Tags", "").strip("*") or "None",
+            "date": message.created_at.isoformat()
+        }
+
+    @discord.app_commands.command(name="zit-history", description="Show all feedback submitted for a Zeus in Training")
+    @discord.app_commands.guilds(*config.GUILDS)
+    @has_any_guild_role("UNIT_STAFF_ROLE_ID", "CURATOR_ROLE_ID")
+    async def zit_history(self, interaction: discord.Interaction, person: discord.Member):
+        async with CommandRun(interaction, "zit-history", ephemeral=True, error_message="An unexpected error occurred while loading the feedback history.") as run:
+            archive = await self.archives.open(interaction.guild.id)
+            submissions = archive.for_target(person.id)
+            if not submissions:
+                await run.send(f"No feedback has been recorded for {person.mention} yet.", ephemeral=True)
+                return
+
+            tally = archive.tally(person.id)
+            authors = len({submission["author_id"] for submission in submissions})
+            summary = (
+                f"**{len(submissions)}** submissions from **{authors}** reviewers.\n"
+                f"Recommended for full Zeus tags: **Yes {tally.get('Yes', 0)}** / **No {tally.get('No', 0)}**"
             )
 
+            def render(page: int) -> discord.Embed:
+                embed = discord.Embed(
+                    title=f"ZiT Feedback History: {person.display_name}",
+                    description=summary,
+                    color=discord.Color.purple()
+                )
+                # Newest first
+                start = len(submissions) - page * HISTORY_PAGE_SIZE
+                for submission in reversed(submissions[max(start - HISTORY_PAGE_SIZE, 0):start]):
+                    date = discord.utils.format_dt(datetime.fromisoformat(submission["date"]), style="d")
+                    embed.add_field(
+                        name=f"{submission['operation'][:200]} ({submission['recommendation']})",
+                        value=(
+                            f"By <@{submission['author_id']}> on {date}\n"
+                            f"**Done well:** {submission['positives'][:300]}\n"
+                            f"**To improve:** {submission['improvements'][:300]}"
+                        )[:1024],
+                        inline=False
+                    )
+                return embed
+
+            page_count = -(-len(submissions) // HISTORY_PAGE_SIZE)
+            view = PaginatorView(interaction.user.id, page_count, render)
+            view.message = await run.send(embed=await view.first_page(), view=view if page_count > 1 else discord.utils.MISSING, ephemeral=True)
+
 #=================
 # Cog End. // Jack
 #=================
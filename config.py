@@ -40,4 +40,71 @@ STRATEGIST_ROLE_ID = 864443819571019776 if USE_TEST_BOT else 1237920780927631420
 # Information for commend_candidate_tracking.py. // Jack
 #=======================================================
 OPERATION_KEYWORD = "has attended an operation"
-TOTAL_OPERATIONS = 3
\ No newline at end of file
+TOTAL_OPERATIONS = 3
+
+#==============
+# Cogs. // Jack
+#==============
+# File names in cogs/ to load, None loads all of them. Override per environment with a
+# comma separated JACK_COGS environment variable, e.g. JACK_COGS=no_show,reports.
+ENABLED_COGS = None
+# Reload cogs and config.py in place when their files change.
+WATCH_FOR_CHANGES = True
+
+#=================
+# Gateway. // Jack
+#=================
+# Only what the cogs use: guild/channel/role events, member events and lookups, ban events
+# for the ban ledger, and message content for attendance in the commendations channel.
+# Slash commands need no intent. No presences or typing events.
+INTENTS = discord.Intents(
+    guilds=True,
+    members=True,
+    moderation=True,
+    guild_messages=True,
+    message_content=True
+)
+# Keep members the bot has seen or fetched, plus anyone who joins while it runs. The member
+# list is not downloaded at startup, members are fetched on demand (see HandleCache.members).
+MEMBER_CACHE_FLAGS = discord.MemberCacheFlags(voice=False, joined=True)
+CHUNK_GUILDS_AT_STARTUP = False
+
+#=================
+# Metrics. // Jack
+#=================
+# Prometheus text endpoint at http://METRICS_HOST:METRICS_PORT/metrics, None disables it.
+# With SHARD_IDS set each process adds its lowest shard ID to the port, or set JACK_METRICS_PORT.
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9108
+
+#=====================
+# Rate Limits. // Jack
+#=====================
+# (uses, seconds) allowed in any sliding window of that many seconds.
+COMMEND_LIMIT_PER_COMMENDER = (5, 3600)
+COMMEND_LIMIT_PER_TARGET = (3, 86400)
+NO_SHOW_REPORT_LIMIT_PER_REPORTER = (30, 3600)
+NO_SHOW_REPORT_LIMIT_PER_TARGET = (3, 86400)
+
+#================
+# Guilds. // Jack
+#================
+# Every unit the bot serves, keyed by guild ID. An entry only lists the settings that differ
+# from the IDs at the top of this file (any *_CHANNEL_ID or *_ROLE_ID, OPERATION_KEYWORD and
+# TOTAL_OPERATIONS), e.g. {123: {"COMMENDATIONS_CHANNEL_ID": 456, "UNIT_STAFF_ROLE_ID": 789}}.
+# Slash commands are registered in every guild listed, and each guild's data is stored
+# separately under Data/guilds/<guild_id>/.
+GUILDS = {
+    GUILD_ID: {},
+}
+
+#==================
+# Sharding. // Jack
+#==================
+# None lets Discord choose the shard count and runs every shard in this process. To spread
+# shards over several processes, give each one the same SHARD_COUNT and its own SHARD_IDS,
+# or set JACK_SHARD_COUNT and JACK_SHARD_IDS (e.g. JACK_SHARD_IDS=0,1) per process. Each process
+# only loads the guilds its shards serve, and keeps its journal, drafts, name cache, rate limits
+# and command fingerprints under Data/shards/<shard ids>/, so processes never share a file.
+SHARD_COUNT = None
+SHARD_IDS = None
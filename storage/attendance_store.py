@@ -0,0 +1,104 @@
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+import discord
+from storage.event_log import EventLog
+from storage.executor import LogWriter
+from utils.member_profiles import ProfileBook
+
+ATTENDANCE_LOG_PATH = "Data/attendance_log.jsonl"
+
+
+class AttendanceStore:
+    """Operation attendance per member, indexed by the commendations channel message that credits it."""
+
+    def __init__(self, path: str = ATTENDANCE_LOG_PATH, profiles: Optional[ProfileBook] = None) -> None:
+        self._log = EventLog(path)
+        self._profiles = profiles
+        self._writer = LogWriter(self._log, self._apply)
+        self._messages: dict[int, tuple[int, ...]] = {}
+        self._by_member: dict[int, set[int]] = {}
+        self.backfilled = False
+        self.cursor: Optional[int] = None  # Newest channel message ID that has been indexed.
+
+    # ================
+    # Startup. // Jack
+    # ================
+    def load(self) -> None:
+        """Rebuild the index from the log. Blocking."""
+        for event in self._log.replay():
+            self._apply(event)
+        logging.info(f"Loaded {len(self._messages)} attendance messages for {len(self._by_member)} members")
+
+    def _apply(self, event: dict) -> None:
+        message_id = event["message_id"]
+        if event["type"] == "cursor":
+            self.backfilled = True
+        else:
+            self._unlink(message_id)
+            if event["type"] == "set" and event["member_ids"]:
+                self._messages[message_id] = tuple(event["member_ids"])
+                for member_id in event["member_ids"]:
+                    message_ids = self._by_member.setdefault(member_id, set())
+                    message_ids.add(message_id)
+                    if self._profiles is not None:
+                        self._profiles.attendance(member_id, message_ids, message_id)
+
+        if self.cursor is None or message_id > self.cursor:
+            self.cursor = message_id
+
+    def _unlink(self, message_id: int) -> None:
+        for member_id in self._messages.pop(message_id, ()):
+            message_ids = self._by_member.get(member_id)
+            if message_ids is not None:
+                message_ids.discard(message_id)
+                if self._profiles is not None:
+                    self._profiles.attendance(member_id, message_ids, message_id)
+                if not message_ids:
+                    del self._by_member[member_id]
+
+    # ===============
+    # Writes. // Jack
+    # ===============
+    async def record_many(self, entries: Iterable[tuple[int, Iterable[int]]]) -> None:
+        """Upsert several (message_id, member_ids) pairs with one fsync, dropping messages that credit nobody."""
+        events = []
+        for message_id, member_ids in entries:
+            member_ids = sorted(set(member_ids))
+            if member_ids == sorted(self._messages.get(message_id, ())):
+                continue
+            events.append({"type": "set", "message_id": message_id, "member_ids": member_ids})
+        await self._write(events)
+
+    async def record(self, message_id: int, member_ids: Iterable[int]) -> None:
+        await self.record_many(((message_id, member_ids),))
+
+    async def remove_many(self, message_ids: Iterable[int]) -> None:
+        await self._write([
+            {"type": "delete", "message_id": message_id}
+            for message_id in message_ids if message_id in self._messages
+        ])
+
+    async def mark_backfilled(self, cursor: int) -> None:
+        """Remember that history up to ``cursor`` has been scanned."""
+        await self._write([{"type": "cursor", "message_id": cursor}])
+
+    async def _write(self, events: list[dict]) -> None:
+        await self._writer.write(events)
+
+    # ==============
+    # Reads. // Jack
+    # ==============
+    def count(self, member_id: int) -> int:
+        return len(self._by_member.get(member_id, ()))
+
+    def credits(self, member_id: int, message_id: int) -> bool:
+        """Whether the indexed message ``message_id`` counts as attendance for the member."""
+        return member_id in self._messages.get(message_id, ())
+
+    def latest(self, member_id: int) -> Optional[datetime]:
+        message_ids = self._by_member.get(member_id)
+        return discord.utils.snowflake_time(max(message_ids)) if message_ids else None
+
+    async def close(self) -> None:
+        await self._writer.close()
@@ -0,0 +1,119 @@
+import heapq
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from storage.event_log import EventLog
+from storage.executor import LogWriter
+from utils.member_profiles import MemberProfiles
+
+BAN_LEDGER_PATH = "Data/ban_ledger.jsonl"
+
+
+class BanLedger:
+    """Timed bans and their expiries, the next one due kept at the front of a min-heap."""
+
+    def __init__(self, path: str = BAN_LEDGER_PATH, profiles: Optional[MemberProfiles] = None) -> None:
+        self._log = EventLog(path)
+        self._writer = LogWriter(self._log, self._apply)
+        self._profiles = profiles
+        self._active: dict[tuple[int, int], dict] = {}
+        self._ban_counts: Counter[tuple[int, int]] = Counter()  # Bans ever recorded per (guild_id, user_id).
+        self._expiries: list[tuple[datetime, int, int]] = []
+        self._actions: dict[int, dict] = {}  # Journal action to the ban it recorded, a redone step writes nothing.
+
+    def load(self) -> None:
+        """Rebuild the active bans from the ledger. Blocking."""
+        for event in self._log.replay():
+            self._apply(event)
+        logging.info(f"Loaded {len(self._active)} active timed bans")
+
+    def _apply(self, event: dict) -> None:
+        key = (event["guild_id"], event["user_id"])
+        if event["type"] == "ban":
+            previous = self._active.get(key)
+            if previous is None or previous["banned_at"] != event["banned_at"]:  # Not just a postponed expiry.
+                self._ban_counts[key] += 1
+            self._active[key] = event
+            if "action_id" in event:
+                self._actions[event["action_id"]] = event
+            heapq.heappush(self._expiries, (datetime.fromisoformat(event["unban_at"]), *key))
+        elif event["type"] == "unban":
+            self._active.pop(key, None)
+        if self._profiles is not None:
+            self._profiles.book(event["guild_id"]).ban(event["user_id"], self._ban_counts[key], self._active.get(key))
+
+    # ===============
+    # Writes. // Jack
+    # ===============
+    async def record_ban(
+        self, guild_id: int, user_id: int, moderator_id: int, reason: str, duration: int, appealable: bool, action_id: Optional[int] = None
+    ) -> dict:
+        """Record a ban lasting ``duration`` days, once per journal ``action_id``, and return the ledger entry."""
+        if action_id in self._actions:
+            return self._actions[action_id]
+        banned_at = datetime.now(timezone.utc)
+        event = {
+            "type": "ban",
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "moderator_id": moderator_id,
+            "reason": reason,
+            "duration": duration,
+            "appealable": appealable,
+            "banned_at": banned_at.isoformat(),
+            "unban_at": (banned_at + timedelta(days=duration)).isoformat()
+        }
+        if action_id is not None:
+            event["action_id"] = action_id
+        await self._write([event])
+        return event
+
+    async def record_unbans(self, keys: Iterable[tuple[int, int]], reason: str) -> None:
+        """Mark several (guild_id, user_id) bans as lifted in one write."""
+        at = datetime.now(timezone.utc).isoformat()
+        await self._write([
+            {"type": "unban", "guild_id": guild_id, "user_id": user_id, "reason": reason, "at": at}
+            for guild_id, user_id in keys if (guild_id, user_id) in self._active
+        ])
+
+    async def postpone(self, guild_id: int, user_id: int, delay: timedelta) -> None:
+        """Push an active ban's expiry back, used when an unban attempt fails."""
+        ban = self._active.get((guild_id, user_id))
+        if ban is not None:
+            retry_at = datetime.now(timezone.utc) + delay
+            await self._write([dict(ban, unban_at=retry_at.isoformat())])
+
+    async def _write(self, events: list[dict]) -> None:
+        await self._writer.write(events)
+
+    # ==============
+    # Reads. // Jack
+    # ==============
+    def _drop_stale(self) -> None:
+        while self._expiries:
+            unban_at, guild_id, user_id = self._expiries[0]
+            ban = self._active.get((guild_id, user_id))
+            if ban is not None and datetime.fromisoformat(ban["unban_at"]) == unban_at:
+                return
+            heapq.heappop(self._expiries)
+
+    def next_expiry(self) -> Optional[datetime]:
+        self._drop_stale()
+        return self._expiries[0][0] if self._expiries else None
+
+    def due(self, now: datetime) -> list[dict]:
+        """Pop every active ban whose expiry is at or before ``now``."""
+        due = []
+        self._drop_stale()
+        while self._expiries and self._expiries[0][0] <= now:
+            _, guild_id, user_id = heapq.heappop(self._expiries)
+            due.append(self._active[(guild_id, user_id)])
+            self._drop_stale()
+        return due
+
+    def active(self, guild_id: int, user_id: int) -> Optional[dict]:
+        return self._active.get((guild_id, user_id))
+
+    async def close(self) -> None:
+        await self._writer.close()
@@ -0,0 +1,150 @@
+import time
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from storage.event_log import EventLog
+from storage.executor import LogWriter
+from utils.member_profiles import ProfileBook
+from utils.rankings import RankedCounter, RollingWindow
+
+COMMENDATION_LOG_PATH = "Data/commendations.jsonl"
+COMMENDATION_WINDOWS = (7, 30, 90)  # Days.
+
+
+def role_key(role: str) -> str:
+    """Roles are free text, so "Rifleman" and " rifleman" count as the same role."""
+    return " ".join(role.lower().split())
+
+
+class Rankings:
+    """All-time and rolling-window rankings of commendations received, kept side by side."""
+    __slots__ = ("all_time", "windows")
+
+    def __init__(self) -> None:
+        self.all_time = RankedCounter()
+        self.windows = {days: RollingWindow(days * 86400) for days in COMMENDATION_WINDOWS}
+
+    def add(self, person_id: int, timestamp: float, now: float) -> None:
+        self.all_time.adjust(person_id, 1)
+        for window in self.windows.values():
+            window.add(person_id, timestamp, now)
+
+    def get(self, days: Optional[int] = None) -> RankedCounter:
+        if days is None:
+            return self.all_time
+        window = self.windows[days]
+        window.expire(time.time())
+        return window
+
+
+class CommendationStore:
+    """Every commendation, with the counts and rankings /commend-stats and /commend-leaderboard read."""
+
+    def __init__(self, path: str = COMMENDATION_LOG_PATH, profiles: Optional[ProfileBook] = None) -> None:
+        self._log = EventLog(path)
+        self._profiles = profiles
+        self._writer = LogWriter(self._log, self._apply)
+        self._received = Rankings()
+        self._by_role: dict[str, Rankings] = {}
+        self._role_names: dict[str, str] = {}  # Role key to the spelling it was first given with.
+        self._role_totals: Counter[str] = Counter()
+        self._given = RankedCounter()
+        self._member_roles: dict[int, Counter[str]] = {}
+        self._imported: set[int] = set()  # Channel messages already imported, so an interrupted import can resume.
+        self.import_before: Optional[int] = None  # Channel messages older than this predate the ledger.
+        self.imported = False
+
+    # ================
+    # Startup. // Jack
+    # ================
+    def load(self) -> None:
+        """Rebuild the aggregates from the log. Blocking."""
+        for event in self._log.replay():
+            self._apply(event)
+        logging.info(f"Loaded {len(self._received.all_time)} commended members across {len(self._role_names)} roles")
+
+    def _apply(self, event: dict) -> None:
+        if event["type"] == "import_before":
+            self.import_before = event["message_id"]
+            return
+        if event["type"] == "imported":
+            self.imported = True
+            self._imported.clear()
+            return
+
+        if "message_id" in event:
+            if event["message_id"] in self._imported:
+                return
+            self._imported.add(event["message_id"])
+
+        person_id, key = event["person_id"], role_key(event["role"])
+        timestamp, now = datetime.fromisoformat(event["at"]).timestamp(), time.time()
+        self._role_names.setdefault(key, event["role"].strip())
+        self._received.add(person_id, timestamp, now)
+        self._by_role.setdefault(key, Rankings()).add(person_id, timestamp, now)
+        self._member_roles.setdefault(person_id, Counter())[key] += 1
+        self._role_totals[key] += 1
+        self._given.adjust(event["commender_id"], 1)
+        if self._profiles is not None:
+            self._profiles.commendation(
+                person_id, self._received.all_time.get(person_id), event["commender_id"], self._given.get(event["commender_id"]), timestamp
+            )
+
+    # ===============
+    # Writes. // Jack
+    # ===============
+    async def add(self, person_id: int, commender_id: int, role: str, reason: str) -> int:
+        """Record a commendation and return how many the member has now received."""
+        await self._writer.write(({
+            "type": "commendation",
+            "person_id": person_id,
+            "commender_id": commender_id,
+            "role": role,
+            "reason": reason,
+            "at": datetime.now(timezone.utc).isoformat()
+        },))
+        return self._received.all_time.get(person_id)
+
+    async def start_import(self, before: int) -> int:
+        """Fix the message the channel import reads back from, once, and return it."""
+        if self.import_before is None:
+            await self._writer.write(({"type": "import_before", "message_id": before},))
+        return self.import_before
+
+    async def import_many(self, commendations: Iterable[dict]) -> None:
+        """Record commendations read back from the channel, skipping messages already imported."""
+        await self._writer.write([
+            {"type": "commendation", **commendation}
+            for commendation in commendations if commendation["message_id"] not in self._imported
+        ])
+
+    async def mark_imported(self) -> None:
+        await self._writer.write(({"type": "imported"},))
+
+    # ==============
+    # Reads. // Jack
+    # ==============
+    def leaderboard(self, days: Optional[int] = None, role: Optional[str] = None) -> RankedCounter:
+        """Ranked counts received, for all time or one of COMMENDATION_WINDOWS, optionally for one role."""
+        if role is None:
+            return self._received.get(days)
+        rankings = self._by_role.get(role_key(role))
+        return rankings.get(days) if rankings else RankedCounter()
+
+    def given(self, member_id: int) -> int:
+        return self._given.get(member_id)
+
+    def given_rank(self, member_id: int) -> Optional[int]:
+        return self._given.rank(member_id)
+
+    def roles_of(self, member_id: int, limit: int = 5) -> list[tuple[str, int]]:
+        """The roles a member has been commended in most, with counts."""
+        return [(self._role_names[key], count) for key, count in self._member_roles.get(member_id, Counter()).most_common(limit)]
+
+    def role_names(self) -> list[str]:
+        """Every role commended so far, most commended first."""
+        return [self._role_names[key] for key, _ in self._role_totals.most_common()]
+
+    async def close(self) -> None:
+        await self._writer.close()
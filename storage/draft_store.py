@@ -0,0 +1,105 @@
+import time
+import logging
+from typing import Optional
+from storage.event_log import EventLog
+from storage.executor import LogWriter, run_blocking
+
+DRAFT_LOG_PATH = "Data/zit_drafts.jsonl"
+DRAFT_TTL = 24 * 3600  # Seconds a feedback draft waits for its recommendation.
+
+
+class Draft:
+    __slots__ = ("author_id", "target_id", "created_at", "operation", "positives", "improvements")
+
+    def __init__(self, author_id: int, target_id: int, created_at: float, operation: str, positives: str, improvements: str) -> None:
+        self.author_id = author_id
+        self.target_id = target_id
+        self.created_at = created_at
+        self.operation = operation
+        self.positives = positives
+        self.improvements = improvements
+
+    def to_event(self, draft_id: int) -> dict:
+        return {
+            "type": "put",
+            "draft_id": draft_id,
+            "author_id": self.author_id,
+            "target_id": self.target_id,
+            "created_at": self.created_at,
+            "operation": self.operation,
+            "positives": self.positives,
+            "improvements": self.improvements
+        }
+
+
+class DraftStore:
+    """ZiT feedback drafts waiting for a recommendation, keyed by the modal submission's ID."""
+
+    def __init__(self, path: str = DRAFT_LOG_PATH, ttl: float = DRAFT_TTL) -> None:
+        self._log = EventLog(path)
+        self._writer = LogWriter(self._log, self._apply)
+        self.ttl = ttl
+        self._drafts: dict[int, Draft] = {}  # Insertion order is creation order, oldest first.
+        self._log_length = 0
+
+    def load(self) -> None:
+        """Rebuild the pending drafts and compact the log. Blocking."""
+        for event in self._log.replay():
+            self._apply(event)
+        self._evict(time.time())
+        self._log.rewrite(self._live_events())
+        self._log_length = len(self._drafts)
+        logging.info(f"Loaded {len(self._drafts)} pending ZiT feedback drafts")
+
+    def _apply(self, event: dict) -> None:
+        if event["type"] == "put":
+            self._drafts[event["draft_id"]] = Draft(
+                event["author_id"], event["target_id"], event["created_at"],
+                event["operation"], event["positives"], event["improvements"]
+            )
+        else:
+            self._drafts.pop(event["draft_id"], None)
+        self._log_length += 1
+
+    def _live_events(self) -> list[dict]:
+        return [draft.to_event(draft_id) for draft_id, draft in self._drafts.items()]
+
+    def _evict(self, now: float) -> None:
+        while self._drafts:
+            draft_id = next(iter(self._drafts))
+            if now - self._drafts[draft_id].created_at < self.ttl:
+                return
+            del self._drafts[draft_id]
+
+    async def put(self, draft_id: int, author_id: int, target_id: int, operation: str, positives: str, improvements: str) -> None:
+        draft = Draft(author_id, target_id, time.time(), operation, positives, improvements)
+        await self._write(draft.to_event(draft_id))
+
+    def get(self, draft_id: int) -> Optional[Draft]:
+        self._evict(time.time())
+        return self._drafts.get(draft_id)
+
+    async def drop(self, draft_id: int) -> None:
+        if draft_id in self._drafts:
+            await self._write({"type": "drop", "draft_id": draft_id})
+
+    async def _write(self, event: dict) -> None:
+        self._evict(time.time())
+        if self._log_length > 2 * len(self._drafts) + 100:
+            await self._compact()
+        await self._writer.write((event,))
+
+    async def _compact(self) -> None:
+        # Under the write lock every written event is already applied, so the live drafts are the whole truth.
+        async with self._writer.lock:
+            if self._log_length <= 2 * len(self._drafts) + 100:
+                return  # Another write compacted while this one waited.
+            events = self._live_events()
+            await run_blocking(self._log.rewrite, events)
+            self._log_length = len(events)
+
+    def __len__(self) -> int:
+        return len(self._drafts)
+
+    async def close(self) -> None:
+        await self._writer.close()
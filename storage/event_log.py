@@ -0,0 +1,103 @@
+import json
+import os
+import logging
+from typing import Iterable, Iterator
+
+
+class EventLog:
+    """Append-only JSON-lines file, fsync'd on every append, with a torn last line dropped on replay."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def replay(self) -> Iterator[dict]:
+        """Yield every complete event in the log, in write order."""
+        for _, event in self.entries():
+            yield event
+
+    def entries(self) -> Iterator[tuple[int, dict]]:
+        """Yield ``(offset, event)`` for every complete event in the log, in write order."""
+        if not self.exists():
+            return
+
+        good_offset = 0
+        with open(self.path, "rb") as f:
+            for raw_line in f:
+                # Only a last line without its newline is a torn write, it is truncated away below
+                if not raw_line.endswith(b"\n"):
+                    logging.warning(f"Discarding torn trailing write in {self.path}")
+                    break
+                try:
+                    event = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    # A complete line that does not parse is skipped, the records after it are kept
+                    logging.warning(f"Skipping corrupt line in {self.path} at offset {good_offset}")
+                    good_offset += len(raw_line)
+                    continue
+                yield good_offset, event
+                good_offset += len(raw_line)
+
+        if good_offset != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
+
+    def append(self, event: dict) -> int:
+        """Durably append a single event and return its offset. Blocking, run it off the event loop."""
+        return self.append_many((event,))[0]
+
+    def append_many(self, events: Iterable[dict]) -> list[int]:
+        """Durably append several events with a single fsync and return their offsets. Blocking."""
+        lines = [json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n" for event in events]
+        if not lines:
+            return []
+
+        f = self._open()
+        offset = f.seek(0, os.SEEK_END)
+        offsets = []
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line)
+        f.write(b"".join(lines))
+        f.flush()
+        os.fsync(f.fileno())
+        return offsets
+
+    def read_at(self, offsets: Iterable[int]) -> list[dict]:
+        """Read the events starting at each of ``offsets``. Blocking."""
+        events = []
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                events.append(json.loads(f.readline()))
+        return events
+
+    def rewrite(self, events: Iterable[dict]) -> None:
+        """Atomically replace the whole log with ``events``, used to compact it. Blocking."""
+        self.close()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+        return self._file
@@ -0,0 +1,76 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, TypeVar
+from storage.event_log import EventLog
+
+STORAGE_THREADS = 2  # Disk work never competes with the default executor discord.py uses.
+FLUSH_DELAY = 0.005  # Seconds a write waits for others to share its fsync.
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=STORAGE_THREADS, thread_name_prefix="storage")
+
+
+async def run_blocking(func: Callable[..., T], *args) -> T:
+    """Run blocking storage work (loads, appends, compactions, reads) on the storage threads."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, functools.partial(func, *args))
+
+
+class LogWriter:
+    """Debounced writes to one EventLog, coalesced into one append and fsync and applied once durable."""
+
+    def __init__(self, log: EventLog, apply: Optional[Callable[[dict], None]] = None, delay: float = FLUSH_DELAY) -> None:
+        self.log = log
+        self.lock = asyncio.Lock()  # Held for every flush, hold it for compactions and snapshots too.
+        self._apply = apply
+        self._delay = delay
+        self._events: list[dict] = []
+        self._waiters: list[tuple[asyncio.Future, int, int]] = []  # (future, start, end) into _events.
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def write(self, events: Iterable[dict]) -> list[int]:
+        """Durably append events and return their offsets in the log."""
+        events = list(events)
+        if not events:
+            return []
+        waiter = asyncio.get_running_loop().create_future()
+        start = len(self._events)
+        self._events.extend(events)
+        self._waiters.append((waiter, start, len(self._events)))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await waiter
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self._delay)
+        async with self.lock:
+            events, waiters = self._events, self._waiters
+            self._events, self._waiters = [], []
+            self._flush_task = None
+            try:
+                offsets = await run_blocking(self.log.append_many, events)
+            except Exception as e:
+                logging.exception(f"Could not write {len(events)} events to {self.log.path}: {e}")
+                for waiter, _, _ in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                return
+
+            if self._apply is not None:
+                for event in events:
+                    self._apply(event)
+            for waiter, start, end in waiters:
+                if not waiter.done():
+                    waiter.set_result(offsets[start:end])
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far is on disk."""
+        if self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+
+    async def close(self) -> None:
+        await self.flush()
+        async with self.lock:
+            self.log.close()
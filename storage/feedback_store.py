@@ -0,0 +1,93 @@
+import re
+import logging
+from typing import Iterable, Optional
+from storage.event_log import EventLog
+from storage.executor import LogWriter
+from utils.autocomplete import PrefixIndex
+
+FEEDBACK_LOG_PATH = "Data/zit_feedback.jsonl"
+OPERATION_DATE = re.compile(r"[\s,(\-]*\d{1,2}[/.\-]\d{1,2}(?:[/.\-]\d{2,4})?\)?")  # The modal asks for "Operation Name & Date (DD/MM/YY)".
+
+
+class FeedbackArchive:
+    """Every ZiT feedback submission, indexed by target, author and operation."""
+
+    def __init__(self, path: str = FEEDBACK_LOG_PATH) -> None:
+        self._log = EventLog(path)
+        self._writer = LogWriter(self._log, self._apply)
+        self._ids: set[int] = set()
+        self._by_target: dict[int, list[dict]] = {}
+        self._by_author: dict[int, list[dict]] = {}
+        self._by_operation: dict[str, list[dict]] = {}
+        self._tallies: dict[int, dict[str, int]] = {}
+        self.operations = PrefixIndex()
+        self.zeuses = PrefixIndex()
+        self.import_before: Optional[int] = None  # Channel messages older than this predate the archive.
+        self.imported = False
+
+    def load(self) -> None:
+        """Rebuild the indexes from the archive. Blocking."""
+        for event in self._log.replay():
+            self._apply(event)
+        logging.info(f"Loaded {len(self._ids)} ZiT feedback submissions")
+
+    def _apply(self, event: dict) -> None:
+        if event.get("type") == "import_before":
+            self.import_before = event["message_id"]
+            return
+        if event.get("type") == "imported":
+            self.imported = True
+            return
+        if event["id"] in self._ids:
+            return
+        self._ids.add(event["id"])
+        self._by_target.setdefault(event["target_id"], []).append(event)
+        self._by_author.setdefault(event["author_id"], []).append(event)
+        self._by_operation.setdefault(event["operation"].strip().lower(), []).append(event)
+        tally = self._tallies.setdefault(event["target_id"], {"Yes": 0, "No": 0})
+        tally[event["recommendation"]] = tally.get(event["recommendation"], 0) + 1
+        self.operations.add(OPERATION_DATE.sub("", event["operation"]))
+        for name in (event.get("author_name"), event.get("target_name")):  # Only known for submissions since names were recorded.
+            if name:
+                self.zeuses.add(name)
+
+    # ===============
+    # Writes. // Jack
+    # ===============
+    async def add_many(self, submissions: Iterable[dict]) -> None:
+        """Archive submissions, skipping IDs already archived."""
+        events = [submission for submission in submissions if submission["id"] not in self._ids]
+        if not events:
+            return
+        events.sort(key=lambda e: e["date"])
+        await self._writer.write(events)
+
+    async def add(self, submission: dict) -> None:
+        await self.add_many((submission,))
+
+    async def start_import(self, before: int) -> int:
+        """Fix the history import cut-off on the first attempt and return the one in force."""
+        if self.import_before is None:
+            await self._writer.write(({"type": "import_before", "message_id": before},))
+        return self.import_before
+
+    async def mark_imported(self) -> None:
+        await self._writer.write(({"type": "imported"},))
+
+    # ==============
+    # Reads. // Jack
+    # ==============
+    def for_target(self, target_id: int) -> list[dict]:
+        return self._by_target.get(target_id, [])
+
+    def by_author(self, author_id: int) -> list[dict]:
+        return self._by_author.get(author_id, [])
+
+    def for_operation(self, operation: str) -> list[dict]:
+        return self._by_operation.get(operation.strip().lower(), [])
+
+    def tally(self, target_id: int) -> dict[str, int]:
+        return dict(self._tallies.get(target_id, {"Yes": 0, "No": 0}))
+
+    async def close(self) -> None:
+        await self._writer.close()
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, TypeVar
+from storage.event_log import EventLog
+from storage.executor import LogWriter, run_blocking
+
+JOURNAL_WAL_PATH = "Data/journal.wal"
+JOURNAL_SNAPSHOT_PATH = "Data/journal.snapshot.json"
+JOURNAL_ARCHIVE_PATH = "Data/journal_archive.jsonl"
+SNAPSHOT_EVERY = 1000  # WAL events between snapshots.
+ABANDON_AFTER = 7 * 86400  # Seconds before recovery gives up on an unfinished action.
+
+T = TypeVar("T")
+
+
+class JournalEntry:
+    __slots__ = ("action_id", "action", "payload", "pending", "started_at")
+
+    def __init__(self, action_id: int, action: str, payload: dict, pending: Iterable[str], started_at: float) -> None:
+        self.action_id = action_id
+        self.action = action
+        self.payload = payload
+        self.pending = set(pending)
+        self.started_at = started_at
+
+    def to_dict(self) -> dict:
+        return {
+            "action_id": self.action_id,
+            "action": self.action,
+            "payload": self.payload,
+            "pending": sorted(self.pending),
+            "started_at": self.started_at
+        }
+
+
+class ActionJournal:
+    """Write-ahead journal of multi-step side effects, finished by their cog's handler after a restart."""
+
+    def __init__(
+        self,
+        wal_path: str = JOURNAL_WAL_PATH,
+        snapshot_path: str = JOURNAL_SNAPSHOT_PATH,
+        archive_path: str = JOURNAL_ARCHIVE_PATH
+    ) -> None:
+        self._wal = EventLog(wal_path)
+        self._writer = LogWriter(self._wal, self._apply_written)
+        self._archive = EventLog(archive_path)
+        self._snapshot_path = snapshot_path
+        self._open: dict[int, JournalEntry] = {}
+        self._closed: list[dict] = []  # Finished since the last snapshot, waiting to be archived.
+        self._handlers: dict[str, Callable[[JournalEntry], Awaitable[None]]] = {}
+        self._seq = 0  # Last sequence number handed out.
+        self._applied_seq = 0  # Last sequence number on disk, what a snapshot covers.
+        self._wal_events = 0
+
+    # ================
+    # Startup. // Jack
+    # ================
+    def load(self) -> None:
+        """Restore the latest snapshot and replay the WAL after it. Blocking."""
+        snapshot_seq = 0
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            snapshot_seq = self._seq = self._applied_seq = snapshot["seq"]
+            for data in snapshot["open"]:
+                self._open[data["action_id"]] = JournalEntry(**data)
+
+        for event in self._wal.replay():
+            self._wal_events += 1
+            if event["seq"] > snapshot_seq:
+                self._apply(event)
+        logging.info(f"Journal loaded with {len(self._open)} unfinished actions")
+
+    def _apply(self, event: dict) -> None:
+        self._seq = max(self._seq, event["seq"])
+        self._applied_seq = max(self._applied_seq, event["seq"])
+        if event["type"] == "begin":
+            self._open[event["seq"]] = JournalEntry(event["seq"], event["action"], event["payload"], event["steps"], event["at"])
+            return
+
+        entry = self._open.get(event["action_id"])
+        if entry is None:
+            return
+        if event["type"] == "step":
+            entry.pending.discard(event["step"])
+        if event["type"] == "abandon" or not entry.pending:
+            del self._open[entry.action_id]
+            record = entry.to_dict()
+            record.update(finished_at=event["at"], outcome="abandoned" if event["type"] == "abandon" else "completed")
+            self._closed.append(record)
+
+    # ==================
+    # Recording. // Jack
+    # ==================
+    async def begin(self, action: str, payload: dict, steps: Iterable[str]) -> JournalEntry:
+        """Durably record an action and its steps before any of them are carried out."""
+        self._seq += 1
+        event = {"seq": self._seq, "type": "begin", "action": action, "payload": payload, "steps": list(steps), "at": time.time()}
+        await self._write(event)
+        return self._open[event["seq"]]
+
+    async def complete(self, entry: JournalEntry, *steps: str) -> None:
+        """Mark steps of an action as done. The action closes once none are left."""
+        await asyncio.gather(*(
+            self._write({"seq": self._next_seq(), "type": "step", "action_id": entry.action_id, "step": step, "at": time.time()})
+            for step in steps if step in entry.pending
+        ))
+
+    def track(self, entry: JournalEntry, step: str, future: asyncio.Future) -> None:
+        """Mark a step done once a queued send succeeds, a failed one is retried by recovery."""
+        def on_done(done: asyncio.Future) -> None:
+            if not done.cancelled() and done.exception() is None:
+                asyncio.create_task(self.complete(entry, step))
+        future.add_done_callback(on_done)
+
+    async def attempt(self, entry: JournalEntry, carry_out: Awaitable[T]) -> T:
+        """Await a command carrying out ``entry`` itself. If it raises, the action is abandoned instead of replayed on the next start."""
+        try:
+            return await carry_out
+        except Exception as e:
+            # The invoker was told it failed, redoing it days later would surprise everyone
+            logging.warning(f"Abandoning journaled {entry.action} #{entry.action_id} after it failed, pending steps: {sorted(entry.pending)}")
+            await self.abandon(entry, f"failed while carried out: {e}")
+            raise
+
+    async def abandon(self, entry: JournalEntry, reason: str) -> None:
+        await self._write({"seq": self._next_seq(), "type": "abandon", "action_id": entry.action_id, "reason": reason, "at": time.time()})
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    async def _write(self, event: dict) -> None:
+        await self._writer.write((event,))
+        if self._wal_events >= SNAPSHOT_EVERY:
+            await self._snapshot()
+
+    def _apply_written(self, event: dict) -> None:
+        self._wal_events += 1
+        self._apply(event)
+
+    async def _snapshot(self) -> None:
+        """Archive finished actions, snapshot unfinished ones and start a fresh WAL."""
+        async with self._writer.lock:
+            if self._wal_events < SNAPSHOT_EVERY:
+                return  # Another write took the snapshot while this one waited.
+            closed, self._closed = self._closed, []
+            state = {"seq": self._applied_seq, "open": [entry.to_dict() for entry in self._open.values()]}
+            try:
+                await run_blocking(self._write_snapshot, closed, state)
+            except Exception as e:
+                # The WAL still holds everything, the next write tries again.
+                logging.exception(f"Could not snapshot the journal: {e}")
+                self._closed = closed + self._closed
+                return
+            self._wal_events = 0
+
+    def _write_snapshot(self, closed: list[dict], state: dict) -> None:
+        self._archive.append_many(closed)
+
+        temp_path = f"{self._snapshot_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._snapshot_path)
+
+        self._wal.rewrite(())
+
+    # =================
+    # Recovery. // Jack
+    # =================
+    def register(self, action: str, handler: Callable[[JournalEntry], Awaitable[None]]) -> None:
+        """Register the coroutine that finishes an unfinished ``action`` after a restart."""
+        self._handlers[action] = handler
+
+    async def recover(self, owned: Callable[[JournalEntry], bool] = lambda entry: True) -> None:
+        """Finish every unfinished action left over from before the last shutdown, skipping those ``owned`` rejects."""
+        now = time.time()
+        for entry in list(self._open.values()):
+            handler = self._handlers.get(entry.action)
+            if handler is None or not owned(entry):
+                continue
+            if now - entry.started_at > ABANDON_AFTER:
+                logging.warning(f"Abandoning journaled {entry.action} #{entry.action_id}, pending steps: {sorted(entry.pending)}")
+                await self.abandon(entry, "too old to recover")
+                continue
+            try:
+                logging.info(f"Recovering journaled {entry.action} #{entry.action_id}, pending steps: {sorted(entry.pending)}")
+                await handler(entry)
+            except Exception as e:
+                logging.exception(f"Could not recover journaled {entry.action} #{entry.action_id}: {e}")
+
+    def unfinished(self) -> list[JournalEntry]:
+        return list(self._open.values())
+
+    async def close(self) -> None:
+        await self._writer.close()
+        self._archive.close()
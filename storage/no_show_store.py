@@ -0,0 +1,135 @@
+import json
+import os
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from storage.event_log import EventLog
+from storage.executor import LogWriter
+from utils.autocomplete import PrefixIndex
+from utils.member_profiles import ProfileBook
+from utils.rankings import RankedCounter, RollingWindow
+
+NO_SHOW_LOG_PATH = "Data/no_show_log.jsonl"
+LEGACY_NO_SHOW_PATH = "Data/no_show_data.json"
+LEADERBOARD_WINDOWS = (30, 90)  # Days.
+
+
+class NoShowStore:
+    """No-show records in an append-only log, with per-member records and ranked leaderboards in memory."""
+
+    def __init__(self, path: str = NO_SHOW_LOG_PATH, legacy_path: str = LEGACY_NO_SHOW_PATH, profiles: Optional[ProfileBook] = None) -> None:
+        self._log = EventLog(path)
+        self._legacy_path = legacy_path
+        self._profiles = profiles
+        self._writer = LogWriter(self._log, self._apply)
+        self._records: dict[int, list[dict]] = {}
+        self._all_time = RankedCounter()
+        self._windows = {days: RollingWindow(days * 86400) for days in LEADERBOARD_WINDOWS}
+        self.operations = PrefixIndex()
+        self.zeuses = PrefixIndex()
+        self._actions: set[int] = set()  # Journal actions already recorded, a redone step writes nothing.
+
+    # ================
+    # Startup. // Jack
+    # ================
+    def load(self) -> None:
+        """Migrate the legacy JSON file if needed and rebuild the index. Blocking."""
+        if not self._log.exists() and os.path.exists(self._legacy_path):
+            self._migrate_legacy()
+
+        for event in self._log.replay():
+            self._apply(event)
+        logging.info(f"Loaded {sum(len(r) for r in self._records.values())} no-show records for {len(self._records)} members")
+
+    def _migrate_legacy(self) -> None:
+        with open(self._legacy_path, "r") as f:
+            legacy_data = json.load(f)
+
+        events = []
+        for user_id, data in legacy_data.items():
+            for record in data.get("records", []):
+                events.append({
+                    "user_id": int(user_id),
+                    "operation_name": record["operation_name"],
+                    "date": record["date"],
+                    "zeus": record["zeus"]
+                })
+        events.sort(key=lambda e: e["date"])
+
+        # The log only appears once complete, and the source is moved aside after, so a crash at any point redoes the migration
+        self._log.rewrite(events)
+        os.replace(self._legacy_path, f"{self._legacy_path}.migrated")
+        logging.info(f"Migrated {len(events)} no-show records from {self._legacy_path}")
+
+    def _apply(self, event: dict) -> None:
+        user_id = event["user_id"]
+        if "action_id" in event:
+            self._actions.add(event["action_id"])
+        self._records.setdefault(user_id, []).append(event)
+        self._all_time.adjust(user_id, 1)
+        self.operations.add(event["operation_name"])
+        self.zeuses.add(event["zeus"])
+        if self._profiles is not None:
+            self._profiles.no_show(user_id, len(self._records[user_id]), event["operation_name"], event["date"])
+
+        timestamp = datetime.fromisoformat(event["date"]).timestamp()
+        now = time.time()
+        for window in self._windows.values():
+            window.add(user_id, timestamp, now)
+
+    # ===============
+    # Writes. // Jack
+    # ===============
+    async def add(self, user_id: int, operation_name: str, zeus: str, reported_by: int) -> int:
+        """Record a no-show and return the member's new no-show count."""
+        counts = await self.add_many((user_id,), operation_name, zeus, reported_by)
+        return counts[user_id]
+
+    async def add_many(
+        self, user_ids: Iterable[int], operation_name: str, zeus: str, reported_by: int, action_id: Optional[int] = None
+    ) -> dict[int, int]:
+        """Record one operation's no-shows in one write, once per journal ``action_id``, and return each member's count."""
+        user_ids = list(dict.fromkeys(user_ids))
+        if action_id is None or action_id not in self._actions:
+            date = datetime.now(timezone.utc).isoformat()
+            events = [
+                {
+                    "user_id": user_id,
+                    "operation_name": operation_name,
+                    "date": date,
+                    "zeus": zeus,
+                    "reported_by": reported_by
+                }
+                for user_id in user_ids
+            ]
+            if action_id is not None:
+                for event in events:
+                    event["action_id"] = action_id
+            await self._writer.write(events)
+        return {user_id: self.count(user_id) for user_id in user_ids}
+
+    # ==============
+    # Reads. // Jack
+    # ==============
+    def count(self, user_id: int) -> int:
+        return len(self._records.get(user_id, ()))
+
+    def records(self, user_id: int, days: Optional[int] = None) -> list[dict]:
+        """A member's records, oldest first, optionally only those from the last ``days`` days."""
+        records = self._records.get(user_id, ())
+        if days is None:
+            return list(records)
+        cutoff = time.time() - days * 86400
+        return [record for record in records if datetime.fromisoformat(record["date"]).timestamp() >= cutoff]
+
+    def leaderboard(self, days: Optional[int] = None) -> RankedCounter:
+        """Ranked no-show counts for all time, or for one of the LEADERBOARD_WINDOWS."""
+        if days is None:
+            return self._all_time
+        window = self._windows[days]
+        window.expire(time.time())
+        return window
+
+    async def close(self) -> None:
+        await self._writer.close()
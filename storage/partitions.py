@@ -0,0 +1,79 @@
+import os
+import asyncio
+import inspect
+import logging
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+import config
+from storage.executor import run_blocking
+
+GUILD_DATA_DIRECTORY = "Data/guilds"
+PROCESS_DATA_DIRECTORY = "Data/shards"
+
+S = TypeVar("S")
+
+
+def guild_path(guild_id: int, path: str) -> str:
+    """Where one guild's copy of a store file lives, e.g. Data/guilds/<guild_id>/no_show_log.jsonl."""
+    return os.path.join(GUILD_DATA_DIRECTORY, str(guild_id), os.path.basename(path))
+
+
+def process_path(shard_ids: Optional[Iterable[int]], path: str) -> str:
+    """Where a process keeps a file of its own, Data/shards/<shard ids>/<name> once shards are spread over processes."""
+    if shard_ids is None:
+        return path
+    return os.path.join(PROCESS_DATA_DIRECTORY, "-".join(str(shard_id) for shard_id in sorted(shard_ids)), os.path.basename(path))
+
+
+class GuildPartitions(Generic[S]):
+    """One instance of a store per guild, each with its own files under Data/guilds/<guild_id>/."""
+
+    def __init__(self, factory: Callable[[int], S], adopt: Iterable[str] = ()) -> None:
+        self._factory = factory
+        self._adopt = tuple(adopt)
+        self._stores: dict[int, S] = {}
+        self._loading: dict[int, asyncio.Future] = {}
+
+    async def load(self, guild_ids: Iterable[int]) -> None:
+        await asyncio.gather(*(self.open(guild_id) for guild_id in guild_ids))
+
+    async def open(self, guild_id: int) -> S:
+        """A guild's store, loading it first if needed. Concurrent callers share one load."""
+        store = self._stores.get(guild_id)
+        if store is not None:
+            return store
+        loading = self._loading.get(guild_id)
+        if loading is None:
+            loading = self._loading[guild_id] = asyncio.ensure_future(run_blocking(self._load, guild_id))
+            loading.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+        store = await asyncio.shield(loading)
+        self._stores.setdefault(guild_id, store)
+        return self._stores[guild_id]
+
+    def _load(self, guild_id: int) -> S:
+        if guild_id == config.GUILD_ID:
+            for path in self._adopt:
+                target = guild_path(guild_id, path)
+                if os.path.exists(path) and not os.path.exists(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(path, target)
+                    logging.info(f"Moved {path} to {target}")
+        store = self._factory(guild_id)
+        store.load()
+        return store
+
+    def __getitem__(self, guild_id: int) -> S:
+        """A loaded guild's store. Guilds in the config table are loaded with the cog."""
+        return self._stores[guild_id]
+
+    def get(self, guild_id: Optional[int]) -> Optional[S]:
+        return self._stores.get(guild_id)
+
+    def items(self) -> Iterator[tuple[int, S]]:
+        return iter(list(self._stores.items()))
+
+    async def close(self) -> None:
+        for store in self._stores.values():
+            close = getattr(store, "close", None)
+            if close is not None and inspect.iscoroutinefunction(close):
+                await close()
+        self._stores.clear()
@@ -0,0 +1,119 @@
+import os
+import json
+import bisect
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+import discord
+from storage.event_log import EventLog
+from storage.executor import LogWriter, run_blocking
+
+REPORT_LOG_PATH = "Data/reports.jsonl"
+LEGACY_REPORTS_DIR = "Reports"
+
+
+class ReportStore:
+    """All reports in one append-only file, with only their offsets indexed in memory."""
+
+    def __init__(self, path: str = REPORT_LOG_PATH, legacy_dir: str = LEGACY_REPORTS_DIR) -> None:
+        self._log = EventLog(path)
+        self._legacy_dir = legacy_dir
+        self._writer = LogWriter(self._log)
+        self._timeline: list[tuple[float, int]] = []  # (created_at, offset), oldest first.
+        self._by_author: dict[int, list[tuple[float, int]]] = {}
+        self._by_target: dict[int, list[tuple[float, int]]] = {}
+
+    # ================
+    # Startup. // Jack
+    # ================
+    def load(self) -> None:
+        """Migrate the per-file reports if needed and rebuild the indexes. Blocking."""
+        if not self._log.exists() and os.path.isdir(self._legacy_dir):
+            self._migrate_legacy()
+
+        for offset, report in self._log.entries():
+            self._index(report, offset)
+        logging.info(f"Loaded {len(self._timeline)} reports")
+
+    def _migrate_legacy(self) -> None:
+        reports = []
+        for file_name in os.listdir(self._legacy_dir):
+            if not file_name.endswith(".json"):
+                continue
+            # Files are named <author id>_<unix timestamp>.json
+            author_id, _, timestamp = file_name[:-5].partition("_")
+            with open(os.path.join(self._legacy_dir, file_name), "r") as f:
+                data = json.load(f)
+            created_at = float(timestamp)
+            reports.append({
+                "id": discord.utils.time_snowflake(datetime.fromtimestamp(created_at, timezone.utc)),
+                "author_id": int(author_id),
+                "author_name": data.get("author"),
+                "target_id": None,
+                "summary": data.get("summary", ""),
+                "fields": data.get("fields", []),
+                "created_at": created_at
+            })
+        reports.sort(key=lambda report: report["created_at"])
+        # The log only appears once complete, and the source is moved aside after, so a crash at any point redoes the migration
+        self._log.rewrite(reports)
+        os.replace(self._legacy_dir, f"{self._legacy_dir}.migrated")
+        logging.info(f"Migrated {len(reports)} reports from {self._legacy_dir}/")
+
+    def _index(self, report: dict, offset: int) -> None:
+        entry = (report["created_at"], offset)
+        bisect.insort(self._timeline, entry)
+        bisect.insort(self._by_author.setdefault(report["author_id"], []), entry)
+        if report.get("target_id") is not None:
+            bisect.insort(self._by_target.setdefault(report["target_id"], []), entry)
+
+    # ===============
+    # Writes. // Jack
+    # ===============
+    async def add(self, report_id: int, author_id: int, author_name: str, target_id: Optional[int], summary: str, fields: list[dict]) -> dict:
+        report = {
+            "id": report_id,
+            "author_id": author_id,
+            "author_name": author_name,
+            "target_id": target_id,
+            "summary": summary,
+            "fields": fields,
+            "created_at": datetime.now(timezone.utc).timestamp()
+        }
+        offset, = await self._writer.write((report,))
+        self._index(report, offset)
+        return report
+
+    # ==============
+    # Reads. // Jack
+    # ==============
+    def search(
+        self,
+        author_id: Optional[int] = None,
+        target_id: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> list[int]:
+        """Offsets of matching reports, newest first. Read them with ``read``."""
+        if author_id is not None and target_id is not None:
+            by_target = {offset for _, offset in self._by_target.get(target_id, ())}
+            entries = [entry for entry in self._by_author.get(author_id, ()) if entry[1] in by_target]
+        elif author_id is not None:
+            entries = self._by_author.get(author_id, [])
+        elif target_id is not None:
+            entries = self._by_target.get(target_id, [])
+        else:
+            entries = self._timeline
+
+        start = bisect.bisect_left(entries, (since, -1)) if since is not None else 0
+        end = bisect.bisect_right(entries, (until, float("inf"))) if until is not None else len(entries)
+        return [offset for _, offset in reversed(entries[start:end])]
+
+    async def read(self, offsets: list[int]) -> list[dict]:
+        return await run_blocking(self._log.read_at, offsets)
+
+    def __len__(self) -> int:
+        return len(self._timeline)
+
+    async def close(self) -> None:
+        await self._writer.close()
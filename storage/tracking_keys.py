@@ -0,0 +1,84 @@
+import time
+import logging
+from storage.event_log import EventLog
+from storage.executor import LogWriter, run_blocking
+
+TRACKING_KEY_LOG_PATH = "Data/tracking_keys.jsonl"
+TRACKING_KEY_TTL = 2 * 24 * 3600  # Seconds a key is remembered. Keys carry their date, so two days covers any timezone edge.
+
+
+class TrackingKeyStore:
+    """Expiring set of idempotency keys for candidate tracking, backed by a log."""
+
+    def __init__(self, path: str = TRACKING_KEY_LOG_PATH, ttl: float = TRACKING_KEY_TTL) -> None:
+        self._log = EventLog(path)
+        self._writer = LogWriter(self._log, self._apply)
+        self.ttl = ttl
+        self._keys: dict[str, float] = {}  # Key to claim time. Insertion order is claim order, oldest first.
+        self._log_length = 0
+
+    def load(self) -> None:
+        """Rebuild the live keys and compact the log. Blocking."""
+        for event in self._log.replay():
+            self._apply(event)
+        self._evict(time.time())
+        self._log.rewrite(self._live_events())
+        self._log_length = len(self._keys)
+        logging.info(f"Loaded {len(self._keys)} candidate tracking keys")
+
+    def _apply(self, event: dict) -> None:
+        if event["type"] == "claim":
+            self._keys[event["key"]] = event["claimed_at"]
+        else:
+            self._keys.pop(event["key"], None)
+        self._log_length += 1
+
+    def _live_events(self) -> list[dict]:
+        return [{"type": "claim", "key": key, "claimed_at": claimed_at} for key, claimed_at in self._keys.items()]
+
+    def _evict(self, now: float) -> None:
+        while self._keys:
+            key = next(iter(self._keys))
+            if now - self._keys[key] < self.ttl:
+                return
+            del self._keys[key]
+
+    async def claim(self, key: str) -> bool:
+        """Claim ``key``, returning False if it is already claimed and unexpired."""
+        now = time.time()
+        self._evict(now)
+        if key in self._keys:
+            return False
+        self._keys[key] = now  # Taken before the write awaits, so a concurrent claim sees it.
+        try:
+            await self._write({"type": "claim", "key": key, "claimed_at": now})
+        except Exception:
+            self._keys.pop(key, None)
+            raise
+        return True
+
+    async def release(self, key: str) -> None:
+        """Give a key back, for when the action it guarded did not happen."""
+        if self._keys.pop(key, None) is not None:
+            await self._write({"type": "release", "key": key})
+
+    def __contains__(self, key: str) -> bool:
+        self._evict(time.time())
+        return key in self._keys
+
+    async def _write(self, event: dict) -> None:
+        if self._log_length > 2 * len(self._keys) + 100:
+            await self._compact()
+        await self._writer.write((event,))
+
+    async def _compact(self) -> None:
+        # Under the write lock every written event is already applied, so the live keys are the whole truth.
+        async with self._writer.lock:
+            if self._log_length <= 2 * len(self._keys) + 100:
+                return  # Another write compacted while this one waited.
+            events = self._live_events()
+            await run_blocking(self._log.rewrite, events)
+            self._log_length = len(events)
+
+    async def close(self) -> None:
+        await self._writer.close()
@@ -0,0 +1,20 @@
+from storage.event_log import EventLog
+
+
+def test_corrupt_line_in_the_middle_keeps_the_records_after_it(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(b'{"n":1}\n{"n":\n{"n":3}\n{"n":4}\n')
+
+    assert [event["n"] for event in EventLog(str(path)).replay()] == [1, 3, 4]
+    assert [event["n"] for event in EventLog(str(path)).replay()] == [1, 3, 4]
+
+
+def test_torn_last_line_is_truncated_away(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(b'{"n":1}\n{"n":2}\n{"n"')
+
+    log = EventLog(str(path))
+    assert [event["n"] for event in log.replay()] == [1, 2]
+    log.append({"n": 3})
+    log.close()
+    assert path.read_bytes() == b'{"n":1}\n{"n":2}\n{"n":3}\n'
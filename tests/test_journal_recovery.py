@@ -0,0 +1,102 @@
+import asyncio
+from storage.ban_ledger import BanLedger
+from storage.journal import ActionJournal
+from storage.no_show_store import NoShowStore
+
+
+def open_journal(tmp_path) -> ActionJournal:
+    journal = ActionJournal(str(tmp_path / "journal.wal"), str(tmp_path / "journal.snapshot.json"), str(tmp_path / "journal_archive.jsonl"))
+    journal.load()
+    return journal
+
+
+def test_no_show_store_step_redone_after_crash_is_not_recorded_twice(tmp_path):
+    store_path, legacy_path = str(tmp_path / "no_show_log.jsonl"), str(tmp_path / "no_show_data.json")
+
+    async def crash():
+        # The records land, then the process dies before the journal hears about it
+        journal, store = open_journal(tmp_path), NoShowStore(store_path, legacy_path)
+        store.load()
+        entry = await journal.begin("no_show", {"user_ids": [1, 2]}, ("store", "dms"))
+        await store.add_many([1, 2], "Operation Thunder", "Zeus", 3, entry.action_id)
+        await journal.close()
+        await store.close()
+
+    async def recover():
+        journal, store = open_journal(tmp_path), NoShowStore(store_path, legacy_path)
+        store.load()
+        [entry] = journal.unfinished()
+        assert "store" in entry.pending
+        counts = await store.add_many([1, 2], "Operation Thunder", "Zeus", 3, entry.action_id)
+        await journal.complete(entry, "store")
+        await journal.close()
+        await store.close()
+        return counts
+
+    asyncio.run(crash())
+    assert asyncio.run(recover()) == {1: 1, 2: 1}
+
+    store = NoShowStore(store_path, legacy_path)
+    store.load()
+    assert store.count(1) == 1 and store.count(2) == 1
+
+
+def test_ban_ledger_step_redone_after_crash_is_not_recorded_twice(tmp_path):
+    ledger_path = str(tmp_path / "ban_ledger.jsonl")
+
+    async def crash():
+        journal, ledger = open_journal(tmp_path), BanLedger(ledger_path)
+        ledger.load()
+        entry = await journal.begin("ban", {"guild_id": 1, "user_id": 2}, ("ledger", "log"))
+        ban = await ledger.record_ban(1, 2, 3, "Teamkilling", 7, True, entry.action_id)
+        await journal.close()
+        await ledger.close()
+        return ban
+
+    async def recover():
+        journal, ledger = open_journal(tmp_path), BanLedger(ledger_path)
+        ledger.load()
+        [entry] = journal.unfinished()
+        assert "ledger" in entry.pending
+        ban = await ledger.record_ban(1, 2, 3, "Teamkilling", 7, True, entry.action_id)
+        await journal.complete(entry, "ledger")
+        await journal.close()
+        await ledger.close()
+        return ban
+
+    first = asyncio.run(crash())
+    assert asyncio.run(recover())["banned_at"] == first["banned_at"]
+    assert sum(1 for _ in open(ledger_path)) == 1
+
+
+def test_separate_actions_are_both_recorded(tmp_path):
+    async def report_twice():
+        journal = open_journal(tmp_path)
+        store = NoShowStore(str(tmp_path / "no_show_log.jsonl"), str(tmp_path / "no_show_data.json"))
+        store.load()
+        for _ in range(2):
+            entry = await journal.begin("no_show", {"user_ids": [1]}, ("store",))
+            await store.add_many([1], "Operation Thunder", "Zeus", 3, entry.action_id)
+            await journal.complete(entry, "store")
+        await journal.close()
+        await store.close()
+        return store.count(1)
+
+    assert asyncio.run(report_twice()) == 2
+
+
+def test_action_that_fails_while_carried_out_is_not_replayed(tmp_path):
+    async def fail():
+        journal = open_journal(tmp_path)
+        entry = await journal.begin("ban", {"guild_id": 1, "user_id": 2}, ("dm", "ban"))
+
+        async def carry_out():
+            raise RuntimeError("Discord said no")
+        try:
+            await journal.attempt(entry, carry_out())
+        except RuntimeError:
+            pass
+        await journal.close()
+
+    asyncio.run(fail())
+    assert open_journal(tmp_path).unfinished() == []
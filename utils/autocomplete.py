@@ -0,0 +1,59 @@
+import bisect
+from collections import Counter
+from utils.rankings import RankedCounter
+
+AUTOCOMPLETE_LIMIT = 25  # Most choices Discord shows.
+PREFIX_SCAN_LIMIT = 2000  # Most index entries one lookup reads, keeps a one-letter prefix cheap.
+
+
+def name_key(text: str) -> str:
+    """Free text names are compared without case or extra spaces, so "Op  Thunder" is "op thunder"."""
+    return " ".join(text.lower().split())
+
+
+class PrefixIndex:
+    """Free text names, found by the start of any of their words and ranked by use."""
+
+    def __init__(self) -> None:
+        self._names: dict[str, str] = {}  # Key to the spelling it was first given with.
+        self._uses = RankedCounter()
+        self._suffixes: list[tuple[str, str]] = []  # (text from one word on, key), sorted.
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        key = name_key(name)
+        if not key:
+            return
+        if key not in self._names:
+            self._names[key] = " ".join(name.split())
+            for start in [0] + [i + 1 for i, char in enumerate(key) if char == " "]:
+                bisect.insort(self._suffixes, (key[start:], key))
+        self._uses.adjust(key, 1)
+
+    def complete(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[tuple[str, int]]:
+        """Names with a word starting with ``prefix``, most used first, with their use counts."""
+        prefix = name_key(prefix)
+        if not prefix:
+            return [(self._names[key], uses) for key, uses in self._uses.page(0, limit)]
+
+        matches = set()
+        start = bisect.bisect_left(self._suffixes, (prefix,))
+        for suffix, key in self._suffixes[start:start + PREFIX_SCAN_LIMIT]:
+            if not suffix.startswith(prefix):
+                break
+            matches.add(key)
+        ranked = sorted(matches, key=lambda key: (-self._uses.get(key), key))[:limit]
+        return [(self._names[key], self._uses.get(key)) for key in ranked]
+
+
+def suggest(prefix: str, *indexes: PrefixIndex, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+    """Completions from several indexes, with the uses of a name shared between them added up."""
+    names, uses = {}, Counter()
+    for index in indexes:
+        for name, count in index.complete(prefix, limit):
+            key = name_key(name)
+            names.setdefault(key, name)
+            uses[key] += count
+    return [names[key] for key, _ in uses.most_common(limit)]
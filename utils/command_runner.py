@@ -0,0 +1,63 @@
+import time
+import logging
+from typing import Any, Awaitable
+import discord
+
+
+class CommandRun:
+    """Execution wrapper shared by every slash command: defers, times each step and reports errors."""
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        *,
+        ephemeral: bool = False,
+        thinking: bool = True,
+        error_message: str = "An unexpected error occurred. Please try again later."
+    ) -> None:
+        self.interaction = interaction
+        self.name = name
+        self.ephemeral = ephemeral
+        self.thinking = thinking
+        self.error_message = error_message
+        self.timings: dict[str, float] = {}
+        self._started = 0.0
+        self._metrics = getattr(interaction.client, "metrics", None)
+        self._metrics_token = None
+
+    async def __aenter__(self) -> "CommandRun":
+        self._started = time.perf_counter()
+        if self._metrics is not None:
+            self._metrics_token = self._metrics.begin()
+        if not self.interaction.response.is_done():
+            await self.step("ack", self.interaction.response.defer(ephemeral=self.ephemeral, thinking=self.thinking))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self.timings["total"] = time.perf_counter() - self._started
+        logging.info(f"/{self.name} timings: " + ", ".join(f"{step} {seconds * 1000:.0f}ms" for step, seconds in self.timings.items()))
+        if self._metrics is not None:
+            self._metrics.end(self._metrics_token, self.interaction, self.name, self.timings, failed=exc is not None)
+
+        if exc is None or not isinstance(exc, Exception):
+            return False
+
+        logging.error(f"Error in {self.name} command: {exc}", exc_info=exc)
+        try:
+            await self.interaction.followup.send(self.error_message, ephemeral=True)
+        except discord.HTTPException:
+            logging.warning(f"Could not report the error in {self.name} command back to the user.")
+        return True
+
+    async def step(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Await one side effect and record how long it took."""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    async def send(self, *args: Any, **kwargs: Any) -> discord.WebhookMessage:
+        """Send a followup message. The first followup replaces the thinking indicator."""
+        return await self.interaction.followup.send(*args, wait=True, **kwargs)
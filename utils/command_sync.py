@@ -0,0 +1,54 @@
+import os
+import json
+import hashlib
+import logging
+import discord
+from discord import app_commands
+from storage.executor import run_blocking
+
+COMMAND_FINGERPRINTS_PATH = "Data/command_fingerprints.json"
+
+
+class CommandSyncer:
+    """Syncs a guild's slash commands only when their definitions have changed."""
+
+    def __init__(self, tree: app_commands.CommandTree, path: str = COMMAND_FINGERPRINTS_PATH) -> None:
+        self.tree = tree
+        self.path = path
+
+    def fingerprint(self, guild: discord.abc.Snowflake) -> str:
+        payload = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)),
+            key=lambda command: (command.get("type", 1), command["name"])
+        )
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def sync(self, guild: discord.abc.Snowflake) -> bool:
+        """Sync ``guild``'s commands if they changed since the last sync. Returns whether it synced."""
+        key = f"{self.tree.client.application_id}:{guild.id}"
+        fingerprint = self.fingerprint(guild)
+        fingerprints = await run_blocking(self._read)
+        if fingerprints.get(key) == fingerprint:
+            logging.info(f"Slash commands for guild {guild.id} unchanged, skipping sync")
+            return False
+
+        synced = await self.tree.sync(guild=guild)
+        fingerprints[key] = fingerprint
+        await run_blocking(self._write, fingerprints)
+        logging.info(f"Synced {len(synced)} slash commands to guild {guild.id}")
+        return True
+
+    def _read(self) -> dict[str, str]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def _write(self, fingerprints: dict[str, str]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(fingerprints, f, indent=4)
+        os.replace(temp_path, self.path)
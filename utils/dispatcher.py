@@ -0,0 +1,231 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Optional
+import aiohttp
+import discord
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS = 6000  # Combined across every embed in one message.
+DM_BUCKETS = 1000  # DM recipients whose pacing is remembered once their queue is empty.
+
+
+class TokenBucket:
+    """Allows ``capacity`` sends at once, refilling at ``capacity / per`` sends a second."""
+
+    def __init__(self, capacity: int, per: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / per
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class OutboundMessage:
+    __slots__ = ("content", "embeds", "options", "future", "queued_at")
+
+    def __init__(self, content: Optional[str], embeds: list[discord.Embed], options: dict[str, Any]) -> None:
+        self.content = content
+        self.embeds = embeds
+        self.options = options
+        self.future = asyncio.get_running_loop().create_future()
+        self.queued_at = time.perf_counter()
+
+
+class OutboundDispatcher:
+    """Paced, retried queues for every DM and channel post, one per destination."""
+
+    def __init__(
+        self,
+        *,
+        channel_rate: tuple[int, float] = (5, 5.0),
+        dm_rate: tuple[int, float] = (1, 1.0),
+        dm_concurrency: int = 5,
+        max_attempts: int = 4,
+        base_backoff: float = 1.0
+    ) -> None:
+        self.channel_rate = channel_rate
+        self.dm_rate = dm_rate
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self._dm_slots = asyncio.Semaphore(dm_concurrency)
+        self._queues: dict[tuple[str, int], deque[OutboundMessage]] = {}
+        self._buckets: dict[tuple[str, int], TokenBucket] = {}
+        self._dm_buckets: OrderedDict[tuple[str, int], TokenBucket] = OrderedDict()  # Least recently used first.
+        self._workers: dict[tuple[str, int], asyncio.Task] = {}
+
+        # Metrics
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.coalesced = 0
+        self._latencies: deque[float] = deque(maxlen=500)
+
+    # ===================
+    # Public API. // Jack
+    # ===================
+    def enqueue(
+        self,
+        destination: discord.abc.Messageable,
+        content: Optional[str] = None,
+        *,
+        embed: Optional[discord.Embed] = None,
+        embeds: Optional[list[discord.Embed]] = None,
+        **options: Any
+    ) -> asyncio.Future:
+        """Queue a message for ``destination`` and return a future for the sent message."""
+        key = self._route(destination)
+        message = OutboundMessage(content, list(embeds or ()) + ([embed] if embed else []), options)
+        message.future.add_done_callback(lambda future: self._report_failure(destination, future))
+        self._queues.setdefault(key, deque()).append(message)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain_route(key, destination))
+        return message.future
+
+    async def send(self, destination: discord.abc.Messageable, content: Optional[str] = None, **kwargs: Any) -> discord.Message:
+        """Queue a message and wait until it has been sent."""
+        return await self.enqueue(destination, content, **kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "busiest_queue": max((len(queue) for queue in self._queues.values()), default=0),
+            "active_routes": len(self._workers),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "latency_p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            "latency_max_ms": latencies[-1] * 1000 if latencies else 0.0
+        }
+
+    async def drain(self, timeout: float = 10.0) -> None:
+        """Wait for everything queued to go out, used on shutdown."""
+        if self._workers:
+            await asyncio.wait(list(self._workers.values()), timeout=timeout)
+
+    def discard(self) -> int:
+        """Stop every worker and cancel whatever is still queued, returning how many messages were dropped."""
+        dropped = 0
+        for queue in self._queues.values():
+            for message in queue:
+                message.future.cancel()
+            dropped += len(queue)
+        for worker in list(self._workers.values()):
+            worker.cancel()
+        self._queues.clear()
+        return dropped
+
+    # ================
+    # Workers. // Jack
+    # ================
+    @staticmethod
+    def _route(destination: discord.abc.Messageable) -> tuple[str, int]:
+        if isinstance(destination, discord.abc.User):
+            return ("dm", destination.id)
+        return ("channel", destination.id)
+
+    async def _drain_route(self, key: tuple[str, int], destination: discord.abc.Messageable) -> None:
+        queue = self._queues[key]
+        is_dm = key[0] == "dm"
+        buckets = self._dm_buckets if is_dm else self._buckets
+        bucket = buckets.get(key) or TokenBucket(*(self.dm_rate if is_dm else self.channel_rate))
+        buckets[key] = bucket
+        if is_dm:
+            self._dm_buckets.move_to_end(key)
+            while len(self._dm_buckets) > DM_BUCKETS:
+                self._dm_buckets.popitem(last=False)
+
+        try:
+            while queue:
+                batch = self._take_batch(queue)
+                await bucket.acquire()
+                if is_dm:
+                    async with self._dm_slots:
+                        await self._deliver(destination, batch)
+                else:
+                    await self._deliver(destination, batch)
+        finally:
+            self._workers.pop(key, None)
+            # discard() may have dropped the queue already, or a new one replaced it
+            if not queue and self._queues.get(key) is queue:
+                self._queues.pop(key)
+
+    def _take_batch(self, queue: deque[OutboundMessage]) -> list[OutboundMessage]:
+        """Take the next message plus any embed-only messages behind it that fit alongside."""
+        first = queue.popleft()
+        batch = [first]
+        if first.options:
+            return batch
+
+        embed_count = len(first.embeds)
+        embed_characters = sum(len(embed) for embed in first.embeds)
+        while queue:
+            following = queue[0]
+            following_characters = sum(len(embed) for embed in following.embeds)
+            if (
+                following.content or following.options or not following.embeds
+                or embed_count + len(following.embeds) > MAX_EMBEDS_PER_MESSAGE
+                or embed_characters + following_characters > MAX_EMBED_CHARACTERS
+            ):
+                break
+            batch.append(queue.popleft())
+            embed_count += len(following.embeds)
+            embed_characters += following_characters
+
+        self.coalesced += len(batch) - 1
+        return batch
+
+    async def _deliver(self, destination: discord.abc.Messageable, batch: list[OutboundMessage]) -> None:
+        content = batch[0].content
+        embeds = [embed for message in batch for embed in message.embeds] or None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                sent = await destination.send(content=content, embeds=embeds, **batch[0].options)
+                break
+            except Exception as e:
+                if attempt == self.max_attempts or not self._is_transient(e):
+                    self.failed += len(batch)
+                    for message in batch:
+                        if not message.future.done():
+                            message.future.set_exception(e)
+                    return
+                self.retries += 1
+                delay = self.base_backoff * 2 ** (attempt - 1)
+                logging.warning(f"Send to {destination} failed ({e}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+
+        now = time.perf_counter()
+        self.sent += len(batch)
+        for message in batch:
+            self._latencies.append(now - message.queued_at)
+            if not message.future.done():
+                message.future.set_result(sent)
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, discord.HTTPException):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+
+    @staticmethod
+    def _report_failure(destination: discord.abc.Messageable, future: asyncio.Future) -> None:
+        # Retrieving the exception here also stops asyncio warning about unawaited failures.
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        if isinstance(error, discord.Forbidden):
+            logging.warning(f"Not allowed to message {destination}: {error}")
+        else:
+            logging.error(f"Could not deliver message to {destination}: {error}")
@@ -0,0 +1,82 @@
+import logging
+from typing import Any, Iterator, Optional
+import discord
+from discord import app_commands
+import config
+
+# Settings a guild can override, by their config.py names. Everything else is process wide.
+GUILD_SETTING_SUFFIXES = ("_CHANNEL_ID", "_ROLE_ID")
+GUILD_SETTINGS = ("OPERATION_KEYWORD", "TOTAL_OPERATIONS")
+
+
+def guild_setting_names() -> list[str]:
+    return [
+        name for name, value in vars(config).items()
+        if (name.endswith(GUILD_SETTING_SUFFIXES) and isinstance(value, int)) or name in GUILD_SETTINGS
+    ]
+
+
+class GuildConfig:
+    """One guild's channel and role IDs and unit settings, read with the same names as config.py."""
+    __slots__ = ("guild_id", "_values")
+
+    def __init__(self, guild_id: int, values: dict[str, Any]) -> None:
+        self.guild_id = guild_id
+        self._values = values
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"{name} is not a per-guild setting") from None
+
+    def ids(self, suffix: str) -> list[int]:
+        """Every configured ID whose setting name ends with ``suffix``, e.g. "_CHANNEL_ID"."""
+        return [value for name, value in self._values.items() if name.endswith(suffix)]
+
+
+class GuildConfigTable:
+    """Per-guild configuration for every unit the bot serves, built once from config.GUILDS."""
+
+    def __init__(self) -> None:
+        self._configs: dict[int, GuildConfig] = {}
+        self.load()
+
+    def load(self) -> None:
+        names = guild_setting_names()
+        defaults = {name: getattr(config, name) for name in names}
+        configs = {}
+        for guild_id, overrides in config.GUILDS.items():
+            unknown = set(overrides) - set(names)
+            if unknown:
+                raise ValueError(f"Unknown settings for guild {guild_id}: {', '.join(sorted(unknown))}")
+            configs[guild_id] = GuildConfig(guild_id, {**defaults, **overrides})
+        self._configs = configs
+        logging.info(f"Configured {len(configs)} guilds")
+
+    def get(self, guild_id: Optional[int]) -> Optional[GuildConfig]:
+        return self._configs.get(guild_id)
+
+    def __getitem__(self, guild_id: int) -> GuildConfig:
+        return self._configs[guild_id]
+
+    def __iter__(self) -> Iterator[GuildConfig]:
+        return iter(self._configs.values())
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    @property
+    def guild_ids(self) -> list[int]:
+        return list(self._configs)
+
+
+def has_any_guild_role(*setting_names: str):
+    """Like app_commands.checks.has_any_role, with the role IDs read from the invoking guild's config."""
+    async def predicate(interaction: discord.Interaction) -> bool:
+        settings = interaction.client.guild_configs.get(interaction.guild_id)
+        role_ids = [getattr(settings, name) for name in setting_names] if settings else []
+        if isinstance(interaction.user, discord.Member) and any(interaction.user.get_role(role_id) for role_id in role_ids):
+            return True
+        raise app_commands.MissingAnyRole(role_ids)
+    return app_commands.check(predicate)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Iterable, Optional, Union
+import discord
+from discord.ext import commands
+
+GuildChannel = Union[discord.abc.GuildChannel, discord.Thread]
+QUERY_BATCH_SIZE = 100  # Most user IDs one query_members request accepts.
+
+
+class HandleCache:
+    """Channel and role handles for every configured guild's IDs, served from memory."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._channels: dict[int, GuildChannel] = {}
+        self._roles: dict[int, discord.Role] = {}
+        self._pending_channels: dict[int, asyncio.Future] = {}
+        self._pending_roles: dict[int, asyncio.Future] = {}  # By guild ID.
+
+        bot.add_listener(self.warm, "on_ready")
+        bot.add_listener(self.on_guild_channel_delete)
+        bot.add_listener(self.on_guild_channel_update)
+        bot.add_listener(self.on_guild_role_delete)
+        bot.add_listener(self.on_guild_role_update)
+
+    # ================
+    # Warm-up. // Jack
+    # ================
+    async def warm(self) -> None:
+        # Only the guilds this process's shards serve, the others are warmed by their own process.
+        settings = [guild for guild in self.bot.guild_configs if self.bot.get_guild(guild.guild_id) is not None]
+        channels = await asyncio.gather(*(self.channel(channel_id) for guild in settings for channel_id in guild.ids("_CHANNEL_ID")))
+        roles = await asyncio.gather(*(
+            self.role(role_id, self.bot.get_guild(guild.guild_id)) for guild in settings for role_id in guild.ids("_ROLE_ID")
+        ))
+        logging.info(
+            f"Handle cache warmed: {sum(c is not None for c in channels)}/{len(channels)} channels, "
+            f"{sum(r is not None for r in roles)}/{len(roles)} roles"
+        )
+
+    # ================
+    # Lookups. // Jack
+    # ================
+    async def channel(self, channel_id: int) -> Optional[GuildChannel]:
+        """Return a channel by ID, fetching it once if it is not cached."""
+        channel = self._channels.get(channel_id)
+        if channel is not None:
+            return channel
+
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None:
+            self._channels[channel_id] = channel
+            return channel
+
+        pending = self._pending_channels.get(channel_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_channel(channel_id))
+            self._pending_channels[channel_id] = pending
+            pending.add_done_callback(lambda _: self._pending_channels.pop(channel_id, None))
+        return await asyncio.shield(pending)
+
+    async def role(self, role_id: int, guild: Optional[discord.Guild]) -> Optional[discord.Role]:
+        """Return one of ``guild``'s roles by ID, refreshing the guild's roles once if it is not cached."""
+        role = self._roles.get(role_id)
+        if role is not None:
+            return role
+
+        if guild is None:
+            return None
+
+        role = guild.get_role(role_id)
+        if role is None:
+            pending = self._pending_roles.get(guild.id)
+            if pending is None:
+                pending = self._pending_roles[guild.id] = asyncio.ensure_future(self._fetch_roles(guild))
+                pending.add_done_callback(lambda _: self._pending_roles.pop(guild.id, None))
+            roles = await asyncio.shield(pending)
+            role = roles.get(role_id)
+
+        if role is not None:
+            self._roles[role_id] = role
+        return role
+
+    async def members(self, guild: discord.Guild, user_ids: Iterable[int]) -> dict[int, discord.Member]:
+        """Members by ID, from the member cache or one gateway query per 100 uncached IDs."""
+        found, missing = {}, []
+        for user_id in dict.fromkeys(user_ids):
+            member = guild.get_member(user_id)
+            if member is not None:
+                found[user_id] = member
+            else:
+                missing.append(user_id)
+
+        for start in range(0, len(missing), QUERY_BATCH_SIZE):
+            batch = missing[start:start + QUERY_BATCH_SIZE]
+            try:
+                found.update((member.id, member) for member in await guild.query_members(user_ids=batch, limit=len(batch)))
+            except (discord.HTTPException, discord.ClientException, asyncio.TimeoutError) as e:
+                logging.warning(f"Could not query {len(batch)} members in guild {guild.id}: {e}")
+        return found
+
+    async def member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        return (await self.members(guild, (user_id,))).get(user_id)
+
+    async def _fetch_channel(self, channel_id: int) -> Optional[GuildChannel]:
+        try:
+            channel = await self.bot.fetch_channel(channel_id)
+        except discord.HTTPException as e:
+            logging.warning(f"Could not fetch channel {channel_id}: {e}")
+            return None
+        self._channels[channel_id] = channel
+        return channel
+
+    async def _fetch_roles(self, guild: discord.Guild) -> dict[int, discord.Role]:
+        try:
+            return {role.id: role for role in await guild.fetch_roles()}
+        except discord.HTTPException as e:
+            logging.warning(f"Could not fetch roles for guild {guild.id}: {e}")
+            return {}
+
+    # =====================
+    # Invalidation. // Jack
+    # =====================
+    def clear(self) -> None:
+        """Forget every handle, used when config.py is reloaded with different IDs."""
+        self._channels.clear()
+        self._roles.clear()
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self._channels.pop(channel.id, None)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        if after.id in self._channels:
+            self._channels[after.id] = after
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        self._roles.pop(role.id, None)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        if after.id in self._roles:
+            self._roles[after.id] = after
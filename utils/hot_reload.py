@@ -0,0 +1,152 @@
+import os
+import asyncio
+import inspect
+import logging
+import importlib
+from typing import Any, Iterable, Optional
+from discord.ext import commands
+import config
+from storage.executor import run_blocking
+
+WATCH_INTERVAL = 2.0  # Seconds between checks for changed files.
+SETTLE_DELAY = 1.0  # Seconds to let an editor or deploy finish writing before reloading.
+WATCHED_DIRECTORY = "cogs"
+CONFIG_FILE = "config.py"
+
+
+class HotReloader:
+    """Reloads changed cogs and config.py in place, without touching the gateway connection."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._lock = asyncio.Lock()
+        self._reloading = False
+        self._carried: dict[str, dict[str, Any]] = {}
+        self._mtimes: dict[str, float] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    # ========================
+    # State Hand-over. // Jack
+    # ========================
+    def carry_over(self, cog: commands.Cog, **state: Any) -> bool:
+        """Keep ``state`` for the reloaded cog. Returns False outside a reload, when the cog should clean up."""
+        if not self._reloading:
+            return False
+        self._carried[cog.qualified_name] = state
+        return True
+
+    def take_over(self, cog: commands.Cog) -> Optional[dict[str, Any]]:
+        """State the previous instance of ``cog`` carried over, or None on a normal load."""
+        return self._carried.pop(cog.qualified_name, None)
+
+    # ==================
+    # Reloading. // Jack
+    # ==================
+    @staticmethod
+    def cog_extensions(bot: commands.Bot) -> list[str]:
+        return [name for name in bot.extensions if name.startswith(f"{WATCHED_DIRECTORY}.")]
+
+    async def reload(self, extensions: Iterable[str] = (), *, reload_config: bool = False) -> dict[str, Optional[str]]:
+        """Reload config.py and/or cog extensions. Returns each extension's error, or None if it reloaded."""
+        async with self._lock:
+            results: dict[str, Optional[str]] = {}
+            if reload_config:
+                try:
+                    importlib.reload(config)
+                except Exception as e:
+                    logging.exception(f"Could not reload {CONFIG_FILE}: {e}")
+                    return {CONFIG_FILE: str(e)}
+                try:
+                    self.bot.guild_configs.load()
+                except ValueError as e:
+                    logging.error(f"Invalid guild table in {CONFIG_FILE}: {e}")
+                    return {CONFIG_FILE: str(e)}
+                results[CONFIG_FILE] = None
+                self.bot.handles.clear()
+                extensions = self.cog_extensions(self.bot)
+
+            self._reloading = True
+            try:
+                for extension in dict.fromkeys(extensions):
+                    try:
+                        if extension in self.bot.extensions:
+                            await self.bot.reload_extension(extension)
+                        else:
+                            await self.bot.load_extension(extension)
+                        results[extension] = None
+                        logging.info(f"Reloaded {extension}")
+                    except commands.ExtensionError as e:
+                        # discord.py puts the previous version back when a reload fails.
+                        logging.error(f"Could not reload {extension}", exc_info=e)
+                        results[extension] = str(e.__cause__ or e)
+            finally:
+                self._reloading = False
+                await self._close_unclaimed()
+
+            if reload_config:
+                asyncio.create_task(self.bot.handles.warm())
+            if any(error is None for name, error in results.items() if name != CONFIG_FILE):
+                await self.bot.sync_commands()
+            return results
+
+    async def _close_unclaimed(self) -> None:
+        # State nobody took over (a cog removed or renamed in the new code) still has files open.
+        for name, state in self._carried.items():
+            logging.warning(f"Closing state left behind by {name}, its reloaded version did not take it over")
+            for value in state.values():
+                close = getattr(value, "close", None)
+                if close is not None and inspect.iscoroutinefunction(close):
+                    await close()
+        self._carried.clear()
+
+    # =====================
+    # File Watcher. // Jack
+    # =====================
+    def start_watching(self) -> None:
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    def stop_watching(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+    def _scan(self) -> dict[str, float]:
+        paths = [CONFIG_FILE] + [
+            os.path.join(WATCHED_DIRECTORY, file_name)
+            for file_name in os.listdir(WATCHED_DIRECTORY) if file_name.endswith(".py")
+        ]
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    async def _watch(self) -> None:
+        self._mtimes = await run_blocking(self._scan)
+        while True:
+            try:
+                await asyncio.sleep(WATCH_INTERVAL)
+                mtimes = await run_blocking(self._scan)
+                changed = [path for path, mtime in mtimes.items() if self._mtimes.get(path) != mtime]
+                if not changed:
+                    continue
+
+                await asyncio.sleep(SETTLE_DELAY)
+                self._mtimes = await run_blocking(self._scan)
+                reload_config = CONFIG_FILE in changed
+                extensions = [
+                    f"{WATCHED_DIRECTORY}.{os.path.basename(path)[:-3]}"
+                    for path in changed if path != CONFIG_FILE
+                ]
+                # New files are left for /reload, only cogs that are already running get reloaded.
+                extensions = [extension for extension in extensions if extension in self.bot.extensions]
+                if reload_config or extensions:
+                    logging.info(f"Detected changes in {', '.join(changed)}, reloading")
+                    await self.reload(extensions, reload_config=reload_config)
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logging.exception(f"Error while watching for changes: {e}")
@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Iterable, Optional
+import discord
+from discord.ext import commands
+
+MEMBER_NAMES_PATH = "Data/member_names.json"
+MEMBER_NAMES_CAPACITY = 10000
+QUERY_BATCH_SIZE = 100  # Most user IDs one query_members request accepts.
+MISS_RETRY_AFTER = 600  # Seconds before an ID nobody could find is queried again.
+
+
+class MemberName:
+    __slots__ = ("name", "avatar_url")
+
+    def __init__(self, name: str, avatar_url: Optional[str]) -> None:
+        self.name = name
+        self.avatar_url = avatar_url
+
+
+class MemberNameCache:
+    """Last known display name and avatar for every member the bot has rendered."""
+
+    def __init__(self, bot: commands.Bot, path: str = MEMBER_NAMES_PATH, capacity: int = MEMBER_NAMES_CAPACITY) -> None:
+        self.bot = bot
+        self.path = path
+        self.capacity = capacity
+        self._names: OrderedDict[int, MemberName] = OrderedDict()  # Least recently used first.
+        self._missing: dict[int, float] = {}  # ID -> when a lookup last found nothing.
+        self._pending: dict[int, asyncio.Future] = {}
+        self._dirty = False
+
+        bot.add_listener(self.on_member_join)
+        bot.add_listener(self.on_member_update)
+        bot.add_listener(self.on_member_remove)
+        bot.add_listener(self.on_user_update)
+
+    # ====================
+    # Persistence. // Jack
+    # ====================
+    def load(self) -> None:
+        """Read the names saved at the last shutdown. Blocking."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            for user_id, (name, avatar_url) in json.load(f).items():
+                self._names[int(user_id)] = MemberName(name, avatar_url)
+        logging.info(f"Loaded {len(self._names)} member names")
+
+    def save(self) -> None:
+        """Write the cache out if anything changed. Blocking."""
+        if not self._dirty:
+            return
+        data = {str(user_id): [entry.name, entry.avatar_url] for user_id, entry in self._names.items()}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+    # ================
+    # Lookups. // Jack
+    # ================
+    def remember(self, user: discord.abc.User) -> MemberName:
+        avatar_url = user.display_avatar.url
+        entry = self._names.get(user.id)
+        if entry is None or entry.name != user.display_name or entry.avatar_url != avatar_url:
+            entry = self._names[user.id] = MemberName(user.display_name, avatar_url)
+            self._dirty = True
+        self._names.move_to_end(user.id)
+        self._missing.pop(user.id, None)
+        while len(self._names) > self.capacity:
+            self._names.popitem(last=False)
+        return entry
+
+    def get(self, user_id: int, guild: Optional[discord.Guild] = None) -> Optional[MemberName]:
+        """Return a name without any network lookup."""
+        member = guild.get_member(user_id) if guild else None
+        if member is not None:
+            return self.remember(member)
+        entry = self._names.get(user_id)
+        if entry is not None:
+            self._names.move_to_end(user_id)
+        return entry
+
+    def display_name(self, user_id: int, guild: Optional[discord.Guild] = None) -> str:
+        entry = self.get(user_id, guild)
+        return entry.name if entry else f"Unknown User ({user_id})"
+
+    async def resolve(self, guild: discord.Guild, user_ids: Iterable[int]) -> dict[int, MemberName]:
+        """Names for ``user_ids``, querying the gateway once for the ones nobody knows yet."""
+        found, waiting, misses = {}, {}, []
+        now = time.time()
+        for user_id in dict.fromkeys(user_ids):
+            entry = self.get(user_id, guild)
+            if entry is not None:
+                found[user_id] = entry
+            elif user_id in self._pending:
+                waiting[user_id] = self._pending[user_id]
+            elif now - self._missing.get(user_id, 0) >= MISS_RETRY_AFTER:
+                misses.append(user_id)
+
+        for start in range(0, len(misses), QUERY_BATCH_SIZE):
+            batch = misses[start:start + QUERY_BATCH_SIZE]
+            pending = asyncio.ensure_future(self._query(guild, batch))
+            for user_id in batch:
+                self._pending[user_id] = waiting[user_id] = pending
+            pending.add_done_callback(lambda _, batch=batch: [self._pending.pop(user_id, None) for user_id in batch])
+
+        for user_id, pending in waiting.items():
+            entry = (await asyncio.shield(pending)).get(user_id)
+            if entry is not None:
+                found[user_id] = entry
+        return found
+
+    async def _query(self, guild: discord.Guild, user_ids: list[int]) -> dict[int, MemberName]:
+        try:
+            members = await guild.query_members(user_ids=user_ids, limit=len(user_ids))
+        except (discord.HTTPException, discord.ClientException, asyncio.TimeoutError) as e:
+            logging.warning(f"Could not query {len(user_ids)} members in guild {guild.id}: {e}")
+            return {}
+
+        entries = {member.id: self.remember(member) for member in members}
+        now = time.time()
+        for user_id in user_ids:
+            if user_id not in entries:
+                self._missing[user_id] = now
+        return entries
+
+    # ================
+    # Updates. // Jack
+    # ================
+    async def on_member_join(self, member: discord.Member) -> None:
+        if member.id in self._names:
+            self.remember(member)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if after.id in self._names:
+            self.remember(after)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        # Keep the name they left with, the member cache is about to forget them.
+        if member.id in self._names:
+            self.remember(member)
+
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        entry = self._names.get(after.id)
+        if entry is not None and entry.name == before.display_name:
+            self.remember(after)
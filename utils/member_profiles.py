@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime
+from typing import Optional
+
+
+class MemberProfile:
+    """Summary of one member in one guild: no-shows, commendations, attendance and bans."""
+    __slots__ = (
+        "no_shows", "last_no_show", "last_no_show_at",
+        "commendations", "commendations_given", "last_commended_at",
+        "operations", "last_operation_id",
+        "bans", "active_ban"
+    )
+
+    def __init__(self) -> None:
+        self.no_shows = 0
+        self.last_no_show: Optional[str] = None  # Operation name.
+        self.last_no_show_at = 0.0
+        self.commendations = 0
+        self.commendations_given = 0
+        self.last_commended_at = 0.0
+        self.operations = 0
+        self.last_operation_id: Optional[int] = None  # Attendance message, its snowflake is the time.
+        self.bans = 0
+        self.active_ban: Optional[dict] = None  # The ban ledger entry while a timed ban runs.
+
+
+class ProfileBook:
+    """The member profiles of one guild, with counts copied from the stores as they apply events."""
+
+    def __init__(self) -> None:
+        self._profiles: dict[int, MemberProfile] = {}
+        self._lock = threading.Lock()  # Stores load on several storage threads at once.
+
+    def get(self, member_id: int) -> Optional[MemberProfile]:
+        return self._profiles.get(member_id)
+
+    def _profile(self, member_id: int) -> MemberProfile:
+        profile = self._profiles.get(member_id)
+        if profile is None:
+            with self._lock:
+                profile = self._profiles.get(member_id)
+                if profile is None:
+                    profile = self._profiles[member_id] = MemberProfile()
+        return profile
+
+    # ================
+    # Updates. // Jack
+    # ================
+    # Counts are copied from the stores, never added up here, so replaying a log into a book that already has them changes nothing
+    def no_show(self, member_id: int, count: int, operation_name: str, date: str) -> None:
+        profile = self._profile(member_id)
+        profile.no_shows = count
+        at = datetime.fromisoformat(date).timestamp()
+        if at >= profile.last_no_show_at:
+            profile.last_no_show, profile.last_no_show_at = operation_name, at
+
+    def commendation(self, person_id: int, received: int, commender_id: int, given: int, at: float) -> None:
+        person = self._profile(person_id)
+        person.commendations = received
+        person.last_commended_at = max(person.last_commended_at, at)
+        self._profile(commender_id).commendations_given = given
+
+    def attendance(self, member_id: int, message_ids: set[int], changed: int) -> None:
+        """Copy a member's attendance messages after ``changed`` was credited to or taken from them."""
+        profile = self._profile(member_id)
+        profile.operations = len(message_ids)
+        if changed in message_ids:
+            profile.last_operation_id = max(profile.last_operation_id or 0, changed)
+        elif profile.last_operation_id == changed:
+            profile.last_operation_id = max(message_ids, default=None)
+
+    def ban(self, member_id: int, count: int, active: Optional[dict]) -> None:
+        profile = self._profile(member_id)
+        profile.bans = count
+        profile.active_ban = active
+
+
+class MemberProfiles:
+    """Every guild's ProfileBook, shared by the cogs as ``bot.profiles``."""
+
+    def __init__(self) -> None:
+        self._books: dict[int, ProfileBook] = {}
+        self._lock = threading.Lock()  # Stores load on several storage threads at once.
+
+    def book(self, guild_id: int) -> ProfileBook:
+        book = self._books.get(guild_id)
+        if book is None:
+            with self._lock:
+                book = self._books.get(guild_id)
+                if book is None:
+                    book = self._books[guild_id] = ProfileBook()
+        return book
+
+    def get(self, guild_id: int, member_id: int) -> Optional[MemberProfile]:
+        book = self._books.get(guild_id)
+        return book.get(member_id) if book else None
@@ -0,0 +1,231 @@
+import re
+import math
+import asyncio
+import logging
+import contextvars
+from bisect import bisect_left
+from collections import Counter
+from typing import Optional
+import aiohttp
+from aiohttp import web
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+GATEWAY_SAMPLE_INTERVAL = 15  # Seconds between gateway latency samples.
+SNOWFLAKE = re.compile(r"/\d{15,20}")
+
+
+class Histogram:
+    """Fixed-bucket histogram in milliseconds, cheap enough to observe on every command."""
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # The last bucket is +Inf.
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile, or None when empty."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + (math.inf,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class CommandStats:
+    __slots__ = ("latency", "errors", "rest_calls")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.errors = 0
+        self.rest_calls = 0
+
+
+class Invocation:
+    """REST calls made while one command runs, counted through a context variable."""
+    __slots__ = ("rest_calls",)
+
+    def __init__(self) -> None:
+        self.rest_calls = 0
+
+
+_invocation: contextvars.ContextVar[Optional[Invocation]] = contextvars.ContextVar("invocation", default=None)
+
+
+class Metrics:
+    """Counters and latency histograms for commands, REST calls and the gateway."""
+
+    def __init__(self) -> None:
+        self.commands: dict[str, CommandStats] = {}
+        self.steps: dict[tuple[str, str], Histogram] = {}
+        self.rest_requests: Counter[tuple[str, str]] = Counter()
+        self.rest_statuses: Counter[int] = Counter()
+        self.rate_limited = 0
+        self.gateway_latency = Histogram()
+        self.bot: Optional[commands.Bot] = None
+        self._sampler: Optional[asyncio.Task] = None
+        self._runner: Optional[web.AppRunner] = None
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_end.append(self._on_request_end)
+
+    def attach(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        bot.add_listener(self.on_app_command_completion)
+        default_on_error = bot.tree.on_error
+
+        async def on_error(interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+            self._record_command(interaction, failed=True)
+            await default_on_error(interaction, error)
+        bot.tree.on_error = on_error
+
+    # ==================
+    # Recording. // Jack
+    # ==================
+    async def _on_request_end(self, session: aiohttp.ClientSession, context, params: aiohttp.TraceRequestEndParams) -> None:
+        path = params.url.path
+        if "/api/" not in path:
+            return  # The gateway websocket handshake goes through the same session.
+        route = SNOWFLAKE.sub("/{id}", path.split("/api/v", 1)[-1].partition("/")[2])
+        self.rest_requests[(params.method, f"/{route}")] += 1
+        self.rest_statuses[params.response.status] += 1
+        if params.response.status == 429:
+            self.rate_limited += 1
+        invocation = _invocation.get()
+        if invocation is not None:
+            invocation.rest_calls += 1
+
+    def begin(self) -> contextvars.Token:
+        """Start counting REST calls for the command running in this task."""
+        return _invocation.set(Invocation())
+
+    def end(self, token: contextvars.Token, interaction: discord.Interaction, name: str, timings: dict[str, float], failed: bool) -> None:
+        invocation = _invocation.get()
+        _invocation.reset(token)
+        for step, seconds in timings.items():
+            if step != "total":
+                self.steps.setdefault((name, step), Histogram()).observe(seconds * 1000)
+        self._record_command(interaction, name, failed, invocation.rest_calls if invocation else 0)
+
+    def _record_command(self, interaction: discord.Interaction, name: Optional[str] = None, failed: bool = False, rest_calls: int = 0) -> None:
+        if interaction.extras.get("metrics_recorded"):
+            return
+        interaction.extras["metrics_recorded"] = True
+        name = name or (interaction.command.qualified_name if interaction.command else "unknown")
+        stats = self.commands.setdefault(name, CommandStats())
+        # From Discord creating the interaction, so time spent before the bot saw it counts too.
+        stats.latency.observe(max((discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000, 0))
+        stats.rest_calls += rest_calls
+        if failed:
+            stats.errors += 1
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command) -> None:
+        self._record_command(interaction, command.qualified_name)
+
+    async def _sample_gateway(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            latency = self.bot.latency
+            if math.isfinite(latency):
+                self.gateway_latency.observe(latency * 1000)
+            await asyncio.sleep(GATEWAY_SAMPLE_INTERVAL)
+
+    # ===============
+    # Export. // Jack
+    # ===============
+    def prometheus(self) -> str:
+        lines = []
+
+        def histogram(metric: str, labels: str, histogram: Histogram) -> None:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS_MS + (math.inf,), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else str(bound)
+                lines.append(f'{metric}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{suffix} {histogram.total:.3f}")
+            lines.append(f"{metric}_count{suffix} {histogram.count}")
+
+        lines.append("# TYPE jack_command_latency_ms histogram")
+        for name, stats in sorted(self.commands.items()):
+            histogram("jack_command_latency_ms", f'command="{name}"', stats.latency)
+        lines.append("# TYPE jack_command_errors_total counter")
+        lines += [f'jack_command_errors_total{{command="{name}"}} {stats.errors}' for name, stats in sorted(self.commands.items())]
+        lines.append("# TYPE jack_command_rest_calls_total counter")
+        lines += [f'jack_command_rest_calls_total{{command="{name}"}} {stats.rest_calls}' for name, stats in sorted(self.commands.items())]
+
+        lines.append("# TYPE jack_command_step_latency_ms histogram")
+        for (name, step), step_histogram in sorted(self.steps.items()):
+            histogram("jack_command_step_latency_ms", f'command="{name}",step="{step}"', step_histogram)
+
+        lines.append("# TYPE jack_rest_requests_total counter")
+        lines += [
+            f'jack_rest_requests_total{{method="{method}",route="{route}"}} {count}'
+            for (method, route), count in sorted(self.rest_requests.items())
+        ]
+        lines.append("# TYPE jack_rest_responses_total counter")
+        lines += [f'jack_rest_responses_total{{status="{status}"}} {count}' for status, count in sorted(self.rest_statuses.items())]
+        lines.append("# TYPE jack_rest_rate_limited_total counter")
+        lines.append(f"jack_rest_rate_limited_total {self.rate_limited}")
+
+        lines.append("# TYPE jack_gateway_latency_ms histogram")
+        histogram("jack_gateway_latency_ms", "", self.gateway_latency)
+        if self.bot is not None:
+            if math.isfinite(self.bot.latency):
+                lines.append("# TYPE jack_gateway_latency_current_ms gauge")
+                lines.append(f"jack_gateway_latency_current_ms {self.bot.latency * 1000:.1f}")
+            for key, value in self.bot.outbound.stats().items():
+                if isinstance(value, (int, float)):
+                    lines.append(f"jack_outbound_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+    async def start(self, host: Optional[str], port: Optional[int]) -> None:
+        """Start sampling the gateway, and serve /metrics on ``host:port`` unless port is None."""
+        if self._sampler is None:
+            self._sampler = asyncio.create_task(self._sample_gateway())
+        if port is None or self._runner is not None:
+            return
+
+        async def handle(request: web.Request) -> web.Response:
+            return web.Response(text=self.prometheus(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, host, port).start()
+            logging.info(f"Serving metrics on http://{host}:{port}/metrics")
+        except OSError as e:
+            logging.warning(f"Could not serve metrics on {host}:{port}: {e}")
+
+    async def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    # ==================
+    # Summaries. // Jack
+    # ==================
+    def slowest_commands(self, limit: int = 10) -> list[tuple[str, CommandStats]]:
+        return sorted(self.commands.items(), key=lambda item: item[1].latency.quantile(0.95) or 0, reverse=True)[:limit]
+
+    def slowest_step(self, name: str) -> Optional[tuple[str, Histogram]]:
+        """The step of a command with the highest mean time, where most of its latency goes."""
+        steps = [(step, histogram) for (command, step), histogram in self.steps.items() if command == name and step != "ack"]
+        return max(steps, key=lambda item: item[1].mean(), default=None)
@@ -0,0 +1,68 @@
+from typing import Awaitable, Callable, Union
+import discord
+from discord.ui import View, Button
+
+
+class PaginatorView(View):
+    """Previous/next buttons over a paged embed, rendering only the page shown."""
+
+    def __init__(
+        self,
+        author_id: int,
+        page_count: int,
+        render: Callable[[int], Union[discord.Embed, Awaitable[discord.Embed]]],
+        *,
+        timeout: float = 300
+    ) -> None:
+        super().__init__(timeout=timeout)
+        self.author_id = author_id
+        self.page_count = page_count
+        self.render = render
+        self.page = 0
+        self.message = None
+
+        self.previous_button = Button(label="Previous", style=discord.ButtonStyle.secondary)
+        self.next_button = Button(label="Next", style=discord.ButtonStyle.secondary)
+        self.previous_button.callback = self.previous_callback
+        self.next_button.callback = self.next_callback
+        self.add_item(self.previous_button)
+        self.add_item(self.next_button)
+        self._update_buttons()
+
+    async def first_page(self) -> discord.Embed:
+        return await self._render_current()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Only the member who ran this command can change pages.", ephemeral=True)
+            return False
+        return True
+
+    async def previous_callback(self, interaction: discord.Interaction) -> None:
+        self.page = max(self.page - 1, 0)
+        await self._show(interaction)
+
+    async def next_callback(self, interaction: discord.Interaction) -> None:
+        self.page = min(self.page + 1, self.page_count - 1)
+        await self._show(interaction)
+
+    async def on_timeout(self) -> None:
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    async def _show(self, interaction: discord.Interaction) -> None:
+        self._update_buttons()
+        await interaction.response.edit_message(embed=await self._render_current(), view=self)
+
+    async def _render_current(self) -> discord.Embed:
+        embed = await discord.utils.maybe_coroutine(self.render, self.page)
+        if self.page_count > 1:
+            embed.set_footer(text=f"Page {self.page + 1}/{self.page_count}")
+        return embed
+
+    def _update_buttons(self) -> None:
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.page_count - 1
@@ -0,0 +1,65 @@
+import bisect
+from collections import deque
+from typing import Hashable, Optional
+
+
+class RankedCounter:
+    """Per-key counters kept in ranked order as they change."""
+
+    def __init__(self) -> None:
+        self._counts: dict[Hashable, int] = {}
+        self._ranking: list[tuple[int, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def get(self, key: Hashable) -> int:
+        return self._counts.get(key, 0)
+
+    def adjust(self, key: Hashable, delta: int) -> int:
+        """Add ``delta`` to a key's count and return the new count. Keys at zero are dropped."""
+        old = self._counts.get(key, 0)
+        new = old + delta
+        if old:
+            del self._ranking[bisect.bisect_left(self._ranking, (-old, key))]
+        if new > 0:
+            self._counts[key] = new
+            bisect.insort(self._ranking, (-new, key))
+        else:
+            self._counts.pop(key, None)
+        return max(new, 0)
+
+    def page(self, offset: int, limit: int) -> list[tuple[Hashable, int]]:
+        """Return ``(key, count)`` pairs ranked ``offset`` to ``offset + limit``, highest first."""
+        return [(key, -negative_count) for negative_count, key in self._ranking[offset:offset + limit]]
+
+    def rank(self, key: Hashable) -> Optional[int]:
+        """Return a key's 1-based position, or None if it has no count."""
+        count = self._counts.get(key)
+        if not count:
+            return None
+        return bisect.bisect_left(self._ranking, (-count, key)) + 1
+
+
+class RollingWindow(RankedCounter):
+    """A RankedCounter that only counts events from the last ``seconds`` seconds."""
+
+    def __init__(self, seconds: float) -> None:
+        super().__init__()
+        self.seconds = seconds
+        self._events: deque[tuple[float, Hashable]] = deque()
+
+    def add(self, key: Hashable, timestamp: float, now: float) -> None:
+        if timestamp < now - self.seconds:
+            return
+        if self._events and timestamp < self._events[-1][0]:
+            bisect.insort(self._events, (timestamp, key))  # Rare, e.g. history imported after newer events.
+        else:
+            self._events.append((timestamp, key))
+        self.adjust(key, 1)
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.seconds
+        while self._events and self._events[0][0] < cutoff:
+            _, key = self._events.popleft()
+            self.adjust(key, -1)
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Hashable, Optional
+from storage.executor import run_blocking
+
+RATE_LIMITS_PATH = "Data/rate_limits.json"
+RATE_LIMIT_BUCKETS = 12  # Buckets per window. More is more precise, the cost per check stays constant.
+RATE_LIMIT_KEYS = 20000  # Most keys remembered per rule, least recently used are dropped first.
+SAVE_INTERVAL = 60  # Seconds between saves while anything changed.
+
+
+class Window:
+    """Hit counts for one key in a ring of buckets, plus their running total."""
+    __slots__ = ("bucket", "counts", "total")
+
+    def __init__(self, bucket: int, counts: list[int]) -> None:
+        self.bucket = bucket  # Index of the newest bucket, counted from the epoch.
+        self.counts = counts
+        self.total = sum(counts)
+
+    def advance(self, bucket: int) -> None:
+        """Clear the buckets that have slid out of the window since the last hit."""
+        size = len(self.counts)
+        if bucket - self.bucket >= size:
+            self.counts = [0] * size
+            self.total = 0
+        else:
+            for stale in range(self.bucket + 1, bucket + 1):
+                self.total -= self.counts[stale % size]
+                self.counts[stale % size] = 0
+        self.bucket = max(self.bucket, bucket)
+
+
+class Rule:
+    __slots__ = ("limit", "window", "buckets", "width", "keys")
+
+    def __init__(self, limit: int, window: float, buckets: int) -> None:
+        self.limit = limit
+        self.window = window
+        self.buckets = buckets
+        self.width = window / buckets
+        self.keys: OrderedDict[str, Window] = OrderedDict()  # Least recently used first.
+
+
+class RateLimiter:
+    """Sliding-window rate limits shared by every cog, each rule keyed by whatever it limits."""
+
+    def __init__(self, path: str = RATE_LIMITS_PATH, max_keys: int = RATE_LIMIT_KEYS) -> None:
+        self.path = path
+        self.max_keys = max_keys
+        self._rules: dict[str, Rule] = {}
+        self._saved: dict[str, dict] = {}  # Loaded state of rules no cog has added yet.
+        self._dirty = False
+        self._saver: Optional[asyncio.Task] = None
+
+    def add_rule(self, name: str, limit: int, window: float, buckets: int = RATE_LIMIT_BUCKETS) -> None:
+        """Define a rule, keeping its counts if it already exists with the same window and buckets."""
+        rule = self._rules.get(name)
+        if rule is not None and rule.window == window and rule.buckets == buckets:
+            rule.limit = limit
+            return
+
+        rule = self._rules[name] = Rule(limit, window, buckets)
+        saved = self._saved.pop(name, None)
+        if saved and saved["window"] == window and saved["buckets"] == buckets:
+            for key, (bucket, counts) in saved["keys"].items():
+                rule.keys[key] = Window(bucket, counts)
+
+    # ===============
+    # Checks. // Jack
+    # ===============
+    def hit(self, *checks: tuple[str, Hashable], now: Optional[float] = None) -> Optional[tuple[str, float]]:
+        """Count one use against every ``(rule, key)`` pair, or return the first exhausted rule and its retry delay."""
+        now = time.time() if now is None else now
+        windows = []
+        for name, key in checks:
+            rule = self._rules[name]
+            window = self._window(rule, str(key), now)
+            if window.total >= rule.limit:
+                return name, self._retry_after(rule, window, now)
+            windows.append(window)
+
+        for window in windows:
+            window.counts[window.bucket % len(window.counts)] += 1
+            window.total += 1
+        self._dirty = True
+        return None
+
+    def remaining(self, name: str, key: Hashable, now: Optional[float] = None) -> int:
+        rule = self._rules[name]
+        window = rule.keys.get(str(key))
+        if window is None:
+            return rule.limit
+        window.advance(int((time.time() if now is None else now) // rule.width))
+        return max(rule.limit - window.total, 0)
+
+    def _window(self, rule: Rule, key: str, now: float) -> Window:
+        bucket = int(now // rule.width)
+        window = rule.keys.get(key)
+        if window is None:
+            window = rule.keys[key] = Window(bucket, [0] * rule.buckets)
+            if len(rule.keys) > self.max_keys:
+                rule.keys.popitem(last=False)
+        else:
+            rule.keys.move_to_end(key)
+            window.advance(bucket)
+        return window
+
+    @staticmethod
+    def _retry_after(rule: Rule, window: Window, now: float) -> float:
+        """Seconds until enough of the oldest buckets slide out to drop below the limit."""
+        size = len(window.counts)
+        total = window.total
+        for age in range(size - 1, -1, -1):  # Oldest bucket first.
+            total -= window.counts[(window.bucket - age) % size]
+            if total < rule.limit:
+                return max((window.bucket - age + size) * rule.width - now, 0.0)
+        return rule.window
+
+    # ====================
+    # Persistence. // Jack
+    # ====================
+    def load(self) -> None:
+        """Read the counts saved last time. Blocking."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            self._saved = json.load(f)
+        logging.info(f"Loaded rate limit state for {len(self._saved)} rules")
+
+    async def save(self) -> None:
+        """Write the counts out if anything changed, dropping keys whose window has emptied."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        now = time.time()
+        data = dict(self._saved)
+        for name, rule in self._rules.items():
+            bucket = int(now // rule.width)
+            keys = {}
+            for key, window in list(rule.keys.items()):
+                window.advance(bucket)
+                if window.total:
+                    keys[key] = [window.bucket, list(window.counts)]
+                else:
+                    del rule.keys[key]
+            data[name] = {"window": rule.window, "buckets": rule.buckets, "keys": keys}
+        # Snapshotted on the event loop, only the file write happens on the storage threads.
+        await run_blocking(self._write, data)
+
+    def _write(self, data: dict) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def start(self) -> None:
+        if self._saver is None:
+            self._saver = asyncio.create_task(self._save_periodically())
+
+    async def stop(self) -> None:
+        if self._saver is not None:
+            self._saver.cancel()
+            self._saver = None
+        await self.save()
+
+    async def _save_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(SAVE_INTERVAL)
+            try:
+                await self.save()
+            except OSError as e:
+                logging.warning(f"Could not save rate limit state: {e}")